@@ -1,6 +1,16 @@
 // Authentication utilities for LeetGuard extension
 const API_BASE_URL = 'http://localhost:8000';
 
+// Random lowercase hex string of the given byte length
+function randomHex(bytes) {
+  return Array.from(crypto.getRandomValues(new Uint8Array(bytes)), (b) => b.toString(16).padStart(2, '0')).join('');
+}
+
+// W3C trace context header so server traces start at the extension's request
+function createTraceparent() {
+  return `00-${randomHex(16)}-${randomHex(8)}-01`;
+}
+
 class ExtensionAuth {
   constructor() {
     this.accessToken = null;
@@ -77,6 +87,7 @@ class ExtensionAuth {
     const headers = {
       'Authorization': `Bearer ${this.accessToken}`,
       'Content-Type': 'application/json',
+      'traceparent': createTraceparent(),
       ...options.headers
     };
 
@@ -0,0 +1,49 @@
+"""add per-user daily activity rollup
+
+Revision ID: add_activity_days_rollup
+Revises: add_goal_days_and_streaks
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "add_activity_days_rollup"
+down_revision: Union[str, Sequence[str], None] = "add_goal_days_and_streaks"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_days",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("solved", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+    # Initial backfill; app.jobs.backfill_activity_days can rerun this later.
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO activity_days (user_id, day, total, solved)
+            SELECT
+                user_id,
+                (completed_at AT TIME ZONE 'UTC')::date AS day,
+                count(*),
+                count(*) FILTER (WHERE status = 'solved')
+            FROM activities
+            WHERE completed_at IS NOT NULL
+            GROUP BY user_id, (completed_at AT TIME ZONE 'UTC')::date
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("activity_days")
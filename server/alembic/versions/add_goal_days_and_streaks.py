@@ -0,0 +1,39 @@
+"""add goal day history and streak fields
+
+Revision ID: add_goal_days_and_streaks
+Revises: add_default_blocklist_seeded
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "add_goal_days_and_streaks"
+down_revision: Union[str, Sequence[str], None] = "add_default_blocklist_seeded"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "goal_days",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("progress", sa.Integer(), nullable=False),
+        sa.Column("target", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+    op.add_column("users", sa.Column("current_streak", sa.Integer(), nullable=False, server_default=sa.text("0")))
+    op.add_column("users", sa.Column("longest_streak", sa.Integer(), nullable=False, server_default=sa.text("0")))
+    op.add_column("users", sa.Column("last_goal_met_date", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "last_goal_met_date")
+    op.drop_column("users", "longest_streak")
+    op.drop_column("users", "current_streak")
+    op.drop_table("goal_days")
@@ -0,0 +1,125 @@
+"""move problem metadata into a shared problems catalog
+
+Revision ID: add_problems_catalog
+Revises: convert_topic_tags_to_jsonb
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "add_problems_catalog"
+down_revision: Union[str, Sequence[str], None] = "convert_topic_tags_to_jsonb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# problem_url values are already canonical (see add_data_integrity_constraints),
+# so the LeetCode slug is the fifth path segment of https://leetcode.com/problems/<slug>/.
+SLUG_SQL = """
+    CASE
+        WHEN a.problem_url LIKE 'https://leetcode.com/problems/%'
+        THEN split_part(a.problem_url, '/', 5)
+        ELSE a.problem_url
+    END
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "problems",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("slug", sa.String(length=500), nullable=False),
+        sa.Column("url", sa.String(length=500), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("difficulty", sa.String(length=10), nullable=False),
+        sa.Column("topic_tags", postgresql.JSONB(), nullable=True),
+        sa.UniqueConstraint("slug", name="problems_slug_key"),
+    )
+    op.create_index(
+        "ix_problems_topic_tags",
+        "problems",
+        ["topic_tags"],
+        postgresql_using="gin",
+        postgresql_ops={"topic_tags": "jsonb_path_ops"},
+    )
+
+    # Keep the most recently completed copy of each problem's metadata
+    op.execute(
+        sa.text(
+            f"""
+            INSERT INTO problems (slug, url, name, difficulty, topic_tags)
+            SELECT DISTINCT ON (slug) slug, problem_url, problem_name, difficulty, topic_tags
+            FROM (
+                SELECT {SLUG_SQL} AS slug, a.*
+                FROM activities a
+            ) catalog
+            ORDER BY slug, (topic_tags IS NULL), completed_at DESC NULLS LAST, id DESC
+            """
+        )
+    )
+
+    op.add_column("activities", sa.Column("problem_id", sa.Integer(), nullable=True))
+    op.execute(
+        sa.text(
+            f"""
+            UPDATE activities a
+            SET problem_id = p.id
+            FROM problems p
+            WHERE p.slug = {SLUG_SQL}
+            """
+        )
+    )
+    op.alter_column("activities", "problem_id", nullable=False)
+    op.create_foreign_key("activities_problem_id_fkey", "activities", "problems", ["problem_id"], ["id"])
+
+    op.drop_constraint("uq_activities_user_problem_url", "activities", type_="unique")
+    op.create_unique_constraint("uq_activities_user_problem", "activities", ["user_id", "problem_id"])
+
+    op.drop_index("ix_activities_topic_tags", table_name="activities")
+    op.drop_column("activities", "topic_tags")
+    op.drop_column("activities", "difficulty")
+    op.drop_column("activities", "problem_url")
+    op.drop_column("activities", "problem_name")
+
+
+def downgrade() -> None:
+    op.add_column("activities", sa.Column("problem_name", sa.String(length=255), nullable=True))
+    op.add_column("activities", sa.Column("problem_url", sa.String(length=500), nullable=True))
+    op.add_column("activities", sa.Column("difficulty", sa.String(length=10), nullable=True))
+    op.add_column("activities", sa.Column("topic_tags", postgresql.JSONB(), nullable=True))
+    op.execute(
+        sa.text(
+            """
+            UPDATE activities a
+            SET problem_name = p.name,
+                problem_url = p.url,
+                difficulty = p.difficulty,
+                topic_tags = p.topic_tags
+            FROM problems p
+            WHERE p.id = a.problem_id
+            """
+        )
+    )
+    op.alter_column("activities", "problem_name", nullable=False)
+    op.alter_column("activities", "problem_url", nullable=False)
+    op.alter_column("activities", "difficulty", nullable=False)
+    op.create_index(
+        "ix_activities_topic_tags",
+        "activities",
+        ["topic_tags"],
+        postgresql_using="gin",
+        postgresql_ops={"topic_tags": "jsonb_path_ops"},
+    )
+
+    op.drop_constraint("uq_activities_user_problem", "activities", type_="unique")
+    op.create_unique_constraint("uq_activities_user_problem_url", "activities", ["user_id", "problem_url"])
+    op.drop_constraint("activities_problem_id_fkey", "activities", type_="foreignkey")
+    op.drop_column("activities", "problem_id")
+
+    op.drop_index("ix_problems_topic_tags", table_name="problems")
+    op.drop_table("problems")
@@ -0,0 +1,34 @@
+"""add shared rate limit buckets
+
+Revision ID: add_rate_limit_buckets
+Revises: add_tokens_valid_after
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "add_rate_limit_buckets"
+down_revision: Union[str, Sequence[str], None] = "add_tokens_valid_after"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index("ix_rate_limit_buckets_updated_at", "rate_limit_buckets", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_buckets_updated_at", table_name="rate_limit_buckets")
+    op.drop_table("rate_limit_buckets")
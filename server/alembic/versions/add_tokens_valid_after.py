@@ -0,0 +1,26 @@
+"""add access token revocation watermark
+
+Revision ID: add_tokens_valid_after
+Revises: add_refresh_tokens
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "add_tokens_valid_after"
+down_revision: Union[str, Sequence[str], None] = "add_refresh_tokens"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable with no default: a metadata-only change, no table rewrite
+    op.add_column("users", sa.Column("tokens_valid_after", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "tokens_valid_after")
@@ -0,0 +1,45 @@
+"""convert activity topic_tags to jsonb with a gin index
+
+Revision ID: convert_topic_tags_to_jsonb
+Revises: add_activity_days_rollup
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "convert_topic_tags_to_jsonb"
+down_revision: Union[str, Sequence[str], None] = "add_activity_days_rollup"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Empty strings and JSON null were both written for "no tags"; store them as SQL NULL.
+    op.execute(
+        sa.text(
+            """
+            ALTER TABLE activities
+            ALTER COLUMN topic_tags TYPE jsonb
+            USING CASE
+                WHEN topic_tags IS NULL OR btrim(topic_tags) IN ('', 'null') THEN NULL
+                ELSE topic_tags::jsonb
+            END
+            """
+        )
+    )
+    op.create_index(
+        "ix_activities_topic_tags",
+        "activities",
+        ["topic_tags"],
+        postgresql_using="gin",
+        postgresql_ops={"topic_tags": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_activities_topic_tags", table_name="activities")
+    op.execute(sa.text("ALTER TABLE activities ALTER COLUMN topic_tags TYPE text USING topic_tags::text"))
@@ -0,0 +1,70 @@
+"""move email verification codes off users
+
+Revision ID: move_verification_codes_to_table
+Revises: add_rate_limit_buckets
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "move_verification_codes_to_table"
+down_revision: Union[str, Sequence[str], None] = "add_rate_limit_buckets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "email_verifications",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("code", sa.String(length=6), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("resend_cooldown_seconds", sa.Integer(), server_default=sa.text("30"), nullable=False),
+        sa.Column("failed_attempts", sa.Integer(), server_default=sa.text("0"), nullable=False),
+        sa.Column("send_count", sa.Integer(), server_default=sa.text("1"), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.create_index("ix_email_verifications_expires_at", "email_verifications", ["expires_at"])
+
+    # Carry over codes that can still be used; expired ones would only be swept
+    op.execute(
+        """
+        INSERT INTO email_verifications (user_id, code, expires_at, sent_at, resend_cooldown_seconds)
+        SELECT id, verification_code, verification_code_expires,
+               COALESCE(last_code_sent_at, now()), COALESCE(resend_cooldown_seconds, 30)
+        FROM users
+        WHERE is_verified IS NOT TRUE
+          AND verification_code IS NOT NULL
+          AND verification_code_expires > now()
+        """
+    )
+
+    op.drop_column("users", "last_code_sent_at")
+    op.drop_column("users", "resend_cooldown_seconds")
+    op.drop_column("users", "verification_code_expires")
+    op.drop_column("users", "verification_code")
+
+
+def downgrade() -> None:
+    op.add_column("users", sa.Column("verification_code", sa.String(), nullable=True))
+    op.add_column("users", sa.Column("verification_code_expires", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("users", sa.Column("resend_cooldown_seconds", sa.Integer(), nullable=True))
+    op.add_column("users", sa.Column("last_code_sent_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        """
+        UPDATE users
+        SET verification_code = ev.code,
+            verification_code_expires = ev.expires_at,
+            resend_cooldown_seconds = ev.resend_cooldown_seconds,
+            last_code_sent_at = ev.sent_at
+        FROM email_verifications ev
+        WHERE ev.user_id = users.id
+        """
+    )
+    op.drop_index("ix_email_verifications_expires_at", table_name="email_verifications")
+    op.drop_table("email_verifications")
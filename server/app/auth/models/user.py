@@ -3,14 +3,18 @@ from sqlalchemy import (
     Column,
     Date,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
-    Text,
     UniqueConstraint,
+    Uuid,
     text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -25,10 +29,6 @@ class User(Base):
     hashed_password = Column(String, nullable=True)  # OAuth-only users may not have a password yet
     created_at = Column(DateTime(timezone=True), server_default=func.now())  # Timestamp of account creation
     is_verified = Column(Boolean, default=False)  # Whether the user's email is verified
-    verification_code = Column(String, nullable=True)  # 6-digit email verification code
-    verification_code_expires = Column(DateTime(timezone=True), nullable=True)  # Expiration time for the code
-    resend_cooldown_seconds = Column(Integer, default=30)  # Cooldown in seconds for resending code
-    last_code_sent_at = Column(DateTime(timezone=True), nullable=True)  # Last time a code was sent
     display_name = Column(String, nullable=True)  # User's display name
     default_blocklist_seeded = Column(
         Boolean,
@@ -42,9 +42,23 @@ class User(Base):
     progress_today = Column(Integer, default=0)  # Current day's progress
     progress_date = Column(Date, server_default=func.current_date())  # UTC date this progress applies to
 
+    # Streak fields, maintained incrementally when the daily goal is met
+    current_streak = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    longest_streak = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    last_goal_met_date = Column(Date, nullable=True)  # Most recent day the daily goal was reached
+
+    # Access tokens issued before this instant are rejected (password change, log out everywhere)
+    tokens_valid_after = Column(DateTime(timezone=True), nullable=True)
+
     # Relationships
     blocklist_items = relationship("BlocklistItem", back_populates="user", cascade="all, delete-orphan")
     activities = relationship("Activity", back_populates="user", cascade="all, delete-orphan")
+    goal_days = relationship("GoalDay", back_populates="user", cascade="all, delete-orphan")
+    activity_days = relationship("ActivityDay", back_populates="user", cascade="all, delete-orphan")
+    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
+    email_verification = relationship(
+        "EmailVerification", back_populates="user", uselist=False, cascade="all, delete-orphan"
+    )
 
 class BlocklistItem(Base):
     __tablename__ = "blocklist_items"
@@ -60,20 +74,111 @@ class BlocklistItem(Base):
     # Relationship
     user = relationship("User", back_populates="blocklist_items")
 
+# Shared catalog of problems, one row per LeetCode slug (or canonical URL for other sites).
+class Problem(Base):
+    __tablename__ = "problems"
+    __table_args__ = (
+        Index(
+            "ix_problems_topic_tags",
+            "topic_tags",
+            postgresql_using="gin",
+            postgresql_ops={"topic_tags": "jsonb_path_ops"},
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    slug = Column(String(500), unique=True, nullable=False)  # e.g., "two-sum"
+    url = Column(String(500), nullable=False)                 # e.g., "https://leetcode.com/problems/two-sum/"
+    name = Column(String(255), nullable=False)                # e.g., "Two Sum", "Add Two Numbers"
+    difficulty = Column(String(10), nullable=False)           # "Easy", "Medium", "Hard"
+    topic_tags = Column(JSONB(none_as_null=True), nullable=True)  # JSON array of tag names
+
 class Activity(Base):
     __tablename__ = "activities"
     __table_args__ = (
-        UniqueConstraint("user_id", "problem_url", name="uq_activities_user_problem_url"),
+        UniqueConstraint("user_id", "problem_id", name="uq_activities_user_problem"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    problem_name = Column(String(255), nullable=False)  # e.g., "Two Sum", "Add Two Numbers"
-    problem_url = Column(String(500), nullable=False)   # e.g., "https://leetcode.com/problems/two-sum/"
-    difficulty = Column(String(10), nullable=False)     # "Easy", "Medium", "Hard"
-    topic_tags = Column(Text, nullable=True)            # JSON string of tags
+    problem_id = Column(Integer, ForeignKey("problems.id"), nullable=False)
     status = Column(String(20), nullable=False)         # "solved", "attempted", "bookmarked"
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    # Relationship
+    # Relationships
     user = relationship("User", back_populates="activities")
+    problem = relationship("Problem", lazy="joined", innerjoin=True)
+
+    # Read-through accessors for the catalog fields
+    problem_name = association_proxy("problem", "name")
+    problem_url = association_proxy("problem", "url")
+    difficulty = association_proxy("problem", "difficulty")
+    topic_tags = association_proxy("problem", "topic_tags")
+
+# One row per user per past day, archived from progress_today when the daily goal rolls over.
+class GoalDay(Base):
+    __tablename__ = "goal_days"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    progress = Column(Integer, nullable=False)
+    target = Column(Integer, nullable=False)
+
+    # Relationship
+    user = relationship("User", back_populates="goal_days")
+
+# Per-user daily activity rollup, maintained on activity writes. Backs the heatmap/timeseries endpoint.
+class ActivityDay(Base):
+    __tablename__ = "activity_days"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC date of completed_at
+    total = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    solved = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
+    # Relationship
+    user = relationship("User", back_populates="activity_days")
+
+
+# One row per issued refresh token. Rotating marks the row replaced; presenting a replaced token
+# again revokes (deletes) its whole family. Expired rows are purged by app.jobs.purge_refresh_tokens.
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    jti = Column(Uuid, primary_key=True)
+    family_id = Column(Uuid, nullable=False, index=True)  # Shared by every token rotated from one login
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    replaced_at = Column(DateTime(timezone=True), nullable=True)  # Set when rotated; reuse after this is theft
+
+    # Relationship
+    user = relationship("User", back_populates="refresh_tokens")
+
+
+
+# Pending email verification code, at most one per user. Kept off `users` so sending and checking
+# codes never rewrites the user row. Deleted on successful verification; expired rows are swept
+# by app.jobs.purge_email_verifications.
+class EmailVerification(Base):
+    __tablename__ = "email_verifications"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    code = Column(String(6), nullable=False)  # 6-digit code
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    sent_at = Column(DateTime(timezone=True), nullable=False)  # Last time a code was sent
+    resend_cooldown_seconds = Column(Integer, nullable=False, default=30, server_default=text("30"))
+    failed_attempts = Column(Integer, nullable=False, default=0, server_default=text("0"))  # Wrong guesses at this code
+    send_count = Column(Integer, nullable=False, default=1, server_default=text("1"))  # Codes sent since the row was created
+
+    # Relationship
+    user = relationship("User", back_populates="email_verification")
+
+# Token buckets for the Postgres rate limit backend (RATE_LIMIT_BACKEND=postgres), shared by all
+# workers. UNLOGGED: losing buckets in a crash only resets the limits, and writes skip the WAL.
+class RateLimitBucket(Base):
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key = Column(String, primary_key=True)  # "<scope>:<ip|email>:<value>"
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, HttpUrl, model_validator
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime
 
 # Blocklist Schemas
 class BlocklistItemCreate(BaseModel):
@@ -26,12 +26,24 @@ class ActivityCreate(BaseModel):
     status: str
 
 class ActivityUpdate(BaseModel):
-    problem_name: Optional[str] = None
+    """Only the URL and status are editable; problem metadata lives on the shared catalog row."""
     problem_url: Optional[str] = None
-    difficulty: Optional[str] = None
-    topic_tags: Optional[List[str]] = None
     status: Optional[str] = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def reject_catalog_fields(cls, data):
+        if isinstance(data, dict):
+            fields = [field for field in ("problem_name", "difficulty", "topic_tags") if field in data]
+            if fields:
+                raise ValueError(
+                    f"{', '.join(fields)} can't be edited; they come from the shared problem catalog"
+                )
+        return data
+
+    class Config:
+        extra = "forbid"
+
 class ActivityResponse(BaseModel):
     id: int
     problem_name: str
@@ -46,3 +58,27 @@ class ActivityResponse(BaseModel):
 
 class ActivitiesResponse(BaseModel):
     activities: List[ActivityResponse]
+
+class ActivityTimeseriesPoint(BaseModel):
+    day: date  # Day, or the Monday starting the week for weekly buckets
+    total: int
+    solved: int
+
+class ActivityTimeseriesResponse(BaseModel):
+    bucket: str
+    start: date
+    end: date
+    points: List[ActivityTimeseriesPoint]
+
+class ActivityTagCount(BaseModel):
+    tag: str
+    count: int
+
+class ActivityTagsResponse(BaseModel):
+    tags: List[ActivityTagCount]
+
+class ActivityImportResponse(BaseModel):
+    imported: int
+    updated: int
+    skipped: int
+    errors: List[str]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, Union
 from datetime import date
 
@@ -54,8 +54,14 @@ class GoalResponse(BaseModel):
     progress_date: date
     is_goal_completed: bool
 
+class StreakResponse(BaseModel):
+    current_streak: int
+    longest_streak: int
+    last_goal_met_date: Optional[date] = None
+
 class GoalUpdate(BaseModel):
-    target_daily: int
+    # A goal of zero would count every day as met
+    target_daily: int = Field(ge=1)
 
 class ProgressIncrement(BaseModel):
     delta: int = 1
@@ -22,10 +22,8 @@ class Settings:
     if not REFRESH_SECRET_KEY:
         raise ValueError("REFRESH_SECRET_KEY environment variable is required")
 
-    # Email (Resend)
-    RESEND_API_KEY: str = os.getenv("RESEND_API_KEY")
-    if not RESEND_API_KEY:
-        raise ValueError("RESEND_API_KEY environment variable is required")
+    # Email (Resend); without a key every send fails and reports email_sent=false
+    RESEND_API_KEY: Optional[str] = os.getenv("RESEND_API_KEY") or None
 
     FROM_EMAIL: str = os.getenv("FROM_EMAIL", "noreply@leetguard.com")
 
@@ -38,23 +36,79 @@ class Settings:
     JWT_ISSUER: str = os.getenv("JWT_ISSUER", "leetguard-api")
     JWT_AUDIENCE: str = os.getenv("JWT_AUDIENCE", "leetguard-client")
 
+    # Asymmetric access token signing (Ed25519 or EC P-256 PEM); unset keeps HS256 with SECRET_KEY
+    JWT_PRIVATE_KEY_PATH: Optional[str] = os.getenv("JWT_PRIVATE_KEY_PATH") or None
+    # Extra public/private PEMs published in the JWKS and accepted for verification (comma-separated)
+    JWT_VERIFICATION_KEY_PATHS: tuple = tuple(
+        path.strip() for path in os.getenv("JWT_VERIFICATION_KEY_PATHS", "").split(",") if path.strip()
+    )
+    # Keep accepting HS256 access tokens while migrating to asymmetric keys
+    JWT_ACCEPT_HS256: bool = os.getenv("JWT_ACCEPT_HS256", "true").lower() == "true"
+
     # Email verification settings
     VERIFICATION_CODE_EXPIRE_MINUTES: int = int(os.getenv("VERIFICATION_CODE_EXPIRE_MINUTES", "10"))
+    # Wrong guesses before a code is burned and a new one must be requested
+    VERIFICATION_CODE_MAX_ATTEMPTS: int = int(os.getenv("VERIFICATION_CODE_MAX_ATTEMPTS", "5"))
     PASSWORD_RESET_TOKEN_EXPIRE_HOURS: int = int(os.getenv("PASSWORD_RESET_TOKEN_EXPIRE_HOURS", "1"))
 
     # Rate limiting settings
     INITIAL_RESEND_COOLDOWN_SECONDS: int = int(os.getenv("INITIAL_RESEND_COOLDOWN_SECONDS", "30"))
     MAX_RESEND_ATTEMPTS: int = int(os.getenv("MAX_RESEND_ATTEMPTS", "5"))
 
+    # Auth endpoint token buckets: "memory" (per worker), "postgres" (shared) or "none"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+    # Limits are "<requests>/<seconds>" per client IP and per email; empty disables one
+    RATE_LIMIT_LOGIN_IP: str = os.getenv("RATE_LIMIT_LOGIN_IP", "30/60")
+    RATE_LIMIT_LOGIN_EMAIL: str = os.getenv("RATE_LIMIT_LOGIN_EMAIL", "10/300")
+    RATE_LIMIT_SIGNUP_IP: str = os.getenv("RATE_LIMIT_SIGNUP_IP", "10/3600")
+    RATE_LIMIT_SIGNUP_EMAIL: str = os.getenv("RATE_LIMIT_SIGNUP_EMAIL", "5/3600")
+    RATE_LIMIT_VERIFY_IP: str = os.getenv("RATE_LIMIT_VERIFY_IP", "30/600")
+    RATE_LIMIT_VERIFY_EMAIL: str = os.getenv("RATE_LIMIT_VERIFY_EMAIL", "5/600")
+    RATE_LIMIT_RESEND_IP: str = os.getenv("RATE_LIMIT_RESEND_IP", "10/600")
+    RATE_LIMIT_RESEND_EMAIL: str = os.getenv("RATE_LIMIT_RESEND_EMAIL", "1/30")
+
     # OAuth Settings
     GOOGLE_CLIENT_ID: Optional[str] = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET: Optional[str] = os.getenv("GOOGLE_CLIENT_SECRET")
     GITHUB_CLIENT_ID: Optional[str] = os.getenv("GITHUB_CLIENT_ID")
     GITHUB_CLIENT_SECRET: Optional[str] = os.getenv("GITHUB_CLIENT_SECRET")
 
+    # Largest activity import upload accepted, in bytes
+    ACTIVITY_IMPORT_MAX_BYTES: int = int(os.getenv("ACTIVITY_IMPORT_MAX_BYTES", str(10 * 1024 * 1024)))
+
+    # Offline LeetCode problem metadata snapshot (JSON or CSV)
+    PROBLEM_METADATA_PATH: str = os.getenv(
+        "PROBLEM_METADATA_PATH",
+        os.path.join(os.path.dirname(__file__), "data", "leetcode_problems.json"),
+    )
+
+    # Response compression (brotli is used when the package is installed)
+    COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "500"))
+    GZIP_COMPRESSION_LEVEL: int = int(os.getenv("GZIP_COMPRESSION_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "4"))
+
+    # OpenTelemetry tracing: "none", "console" (works offline) or "otlp"
+    OTEL_TRACES_EXPORTER: str = os.getenv("OTEL_TRACES_EXPORTER", "none")
+    OTEL_SERVICE_NAME: str = os.getenv("OTEL_SERVICE_NAME", "leetguard-api")
+
+    # Admin-only sampling profiler (/admin/profile and the X-Profile request header)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    ADMIN_EMAILS: frozenset = frozenset(
+        email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()
+    )
+
     # Environment
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     DEBUG: bool = ENVIRONMENT == "development"
 
+    # Per-request SQL accounting is always on; the Server-Timing header and /debug/slow-queries
+    # expose query details and need an explicit opt-in, independent of ENVIRONMENT
+    QUERY_DEBUG_ENABLED: bool = os.getenv("QUERY_DEBUG_ENABLED", "false").lower() == "true"
+    QUERY_REPEAT_WARNING_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_WARNING_THRESHOLD", "10"))
+
+    # Slow statement log (negative threshold disables it); EXPLAIN ANALYZE runs off the request path
+    SLOW_QUERY_THRESHOLD_MS: float = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() == "true"
+
 # Create settings instance
 settings = Settings()
@@ -0,0 +1,196 @@
+"""
+Bulk activity import.
+
+Uploads are parsed as a stream and normalized in chunks, each chunk is
+loaded into a temporary table with Postgres COPY, and the whole batch is
+merged into problems/activities with set-based INSERT ... SELECT ...
+ON CONFLICT statements inside one transaction.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import IO, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.auth.models.user import Problem
+from app.crud.data import rebuild_activity_days
+from app.utils.normalization import normalize_activity_status, normalize_problem_url, problem_slug
+from app.utils.problem_metadata import UNKNOWN_DIFFICULTY, enrich_problem_fields
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 20
+
+_STAGING_COLUMNS = ("slug", "url", "name", "difficulty", "topic_tags", "status", "completed_at")
+# The staging table is text; rows that would not fit problems are rejected per row, not by the merge
+_COLUMN_LIMITS = (
+    ("slug", Problem.slug.type.length),
+    ("url", Problem.url.type.length),
+    ("name", Problem.name.type.length),
+    ("difficulty", Problem.difficulty.type.length),
+)
+
+
+def _iter_records(upload: IO[bytes], file_format: str) -> Iterator[Tuple[int, Union[dict, str]]]:
+    stream = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        # Header is line 1, so data rows start at line 2
+        for line_number, record in enumerate(csv.DictReader(stream), start=2):
+            yield line_number, record
+        return
+
+    # Lines are decoded per row so one malformed line only skips that row
+    for line_number, line in enumerate(stream, start=1):
+        if line.strip():
+            yield line_number, line
+
+
+def _parse_tags(value) -> Optional[List[str]]:
+    if isinstance(value, list):
+        tags = [str(tag).strip() for tag in value if str(tag).strip()]
+    else:
+        tags = [tag.strip() for tag in str(value or "").split("|") if tag.strip()]
+    return tags or None
+
+
+def _parse_completed_at(value) -> Optional[datetime]:
+    if not value:
+        return None
+    completed_at = datetime.fromisoformat(str(value).strip())
+    if completed_at.tzinfo is None:
+        completed_at = completed_at.replace(tzinfo=timezone.utc)
+    return completed_at
+
+
+def _normalize_record(record: dict) -> tuple:
+    problem_url = normalize_problem_url(record.get("problem_url"))
+    slug = problem_slug(problem_url)
+    name, difficulty, topic_tags = enrich_problem_fields(
+        slug,
+        (record.get("problem_name") or "").strip(),
+        (record.get("difficulty") or "").strip(),
+        _parse_tags(record.get("topic_tags")),
+    )
+    completed_at = _parse_completed_at(record.get("completed_at"))
+    row = {"slug": slug, "url": problem_url, "name": name or slug, "difficulty": difficulty or UNKNOWN_DIFFICULTY}
+    for column, limit in _COLUMN_LIMITS:
+        if len(row[column]) > limit:
+            raise ValueError(f"{column} is longer than {limit} characters")
+    return (
+        slug,
+        problem_url,
+        row["name"],
+        row["difficulty"],
+        json.dumps(topic_tags) if topic_tags else None,
+        normalize_activity_status(record.get("status")),
+        completed_at.isoformat() if completed_at else None,
+    )
+
+
+def _copy_chunk(cursor, rows: List[tuple]):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY activity_import ({', '.join(_STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+
+
+def import_activities(db: Session, user_id: int, upload: IO[bytes], file_format: str) -> dict:
+    """Load an NDJSON or CSV upload of activities for a user.
+
+    Invalid rows are skipped and reported; existing activities for the same
+    problem have their status updated, matching POST /api/activity.
+    """
+    db.execute(text(
+        """
+        CREATE TEMP TABLE activity_import (
+            slug text NOT NULL,
+            url text NOT NULL,
+            name text NOT NULL,
+            difficulty text NOT NULL,
+            topic_tags jsonb,
+            status text NOT NULL,
+            completed_at timestamptz
+        ) ON COMMIT DROP
+        """
+    ))
+    cursor = db.connection().connection.cursor()
+
+    errors = []
+    skipped = 0
+    chunk = []
+    try:
+        for line_number, record in _iter_records(upload, file_format):
+            try:
+                if isinstance(record, str):
+                    record = json.loads(record)
+                chunk.append(_normalize_record(record))
+            except (ValueError, TypeError, AttributeError) as exc:
+                skipped += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append(f"line {line_number}: {exc}")
+                continue
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                _copy_chunk(cursor, chunk)
+                chunk = []
+        if chunk:
+            _copy_chunk(cursor, chunk)
+    except (UnicodeDecodeError, csv.Error) as exc:
+        db.rollback()
+        raise ValueError(f"Could not parse upload as {file_format}: {exc}") from exc
+    finally:
+        cursor.close()
+
+    # Catalog first; imported metadata only fills gaps in existing rows, by the same
+    # rule as get_or_create_problem (a name that is just the slug counts as missing)
+    db.execute(text(
+        """
+        INSERT INTO problems (slug, url, name, difficulty, topic_tags)
+        SELECT DISTINCT ON (slug) slug, url, name, difficulty, topic_tags
+        FROM activity_import
+        ORDER BY slug, (name = slug), (difficulty = 'Unknown'), (topic_tags IS NULL)
+        ON CONFLICT (slug) DO UPDATE SET
+            name = CASE
+                WHEN problems.name IN ('', problems.slug) THEN EXCLUDED.name
+                ELSE problems.name
+            END,
+            difficulty = CASE
+                WHEN problems.difficulty = 'Unknown' THEN EXCLUDED.difficulty
+                ELSE problems.difficulty
+            END,
+            topic_tags = COALESCE(problems.topic_tags, EXCLUDED.topic_tags)
+        WHERE problems.name IN ('', problems.slug) OR problems.difficulty = 'Unknown' OR problems.topic_tags IS NULL
+        """
+    ))
+
+    # One row per problem (latest completion wins); xmax = 0 marks fresh inserts
+    result = db.execute(
+        text(
+            """
+            INSERT INTO activities (user_id, problem_id, status, completed_at)
+            SELECT DISTINCT ON (p.id) :user_id, p.id, i.status, COALESCE(i.completed_at, now())
+            FROM activity_import i
+            JOIN problems p ON p.slug = i.slug
+            ORDER BY p.id, i.completed_at DESC NULLS LAST
+            ON CONFLICT (user_id, problem_id) DO UPDATE SET status = EXCLUDED.status
+            RETURNING (xmax = 0) AS inserted
+            """
+        ),
+        {"user_id": user_id},
+    )
+    outcomes = [row.inserted for row in result]
+
+    rebuild_activity_days(db, user_id, commit=False)
+    db.commit()
+
+    imported = sum(1 for inserted in outcomes if inserted)
+    return {
+        "imported": imported,
+        "updated": len(outcomes) - imported,
+        "skipped": skipped,
+        "errors": errors,
+    }
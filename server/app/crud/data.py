@@ -1,13 +1,17 @@
-from sqlalchemy.orm import Session
-from app.auth.models.user import BlocklistItem, Activity
+from sqlalchemy import Date, cast, exists, func, select
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, contains_eager
+from app.auth.models.user import BlocklistItem, Activity, ActivityDay, Problem
 from app.auth.schemas.data import BlocklistItemCreate, ActivityCreate, ActivityUpdate
+from app.crud.problems import get_or_create_problem
 from app.utils.normalization import (
     normalize_activity_status,
-    normalize_problem_url,
     normalize_website,
+    problem_slug,
 )
-import json
-from typing import List, Optional
+from datetime import date, timezone
+from typing import Iterator, List, Optional
 
 # Blocklist CRUD operations
 def create_blocklist_item(db: Session, user_id: int, website: str) -> BlocklistItem:
@@ -18,9 +22,11 @@ def create_blocklist_item(db: Session, user_id: int, website: str) -> BlocklistI
     db.refresh(db_item)
     return db_item
 
-def get_user_blocklist(db: Session, user_id: int) -> List[BlocklistItem]:
-    """Get all blocklist items for a user"""
-    return db.query(BlocklistItem).filter(BlocklistItem.user_id == user_id).all()
+def get_user_blocklist_websites(db: Session, user_id: int) -> List[str]:
+    """Get just the blocked websites for a user, without loading ORM entities"""
+    return list(db.scalars(
+        select(BlocklistItem.website).where(BlocklistItem.user_id == user_id).order_by(BlocklistItem.id)
+    ))
 
 def get_blocklist_item(db: Session, item_id: int, user_id: int) -> Optional[BlocklistItem]:
     """Get a specific blocklist item by ID and user"""
@@ -54,40 +60,156 @@ def delete_blocklist_item_by_website(db: Session, user_id: int, website: str) ->
 def check_website_blocked(db: Session, user_id: int, website: str) -> bool:
     """Check if a website is in user's blocklist"""
     normalized_website = normalize_website(website)
-    item = db.query(BlocklistItem).filter(
+    return db.scalar(select(exists().where(
         BlocklistItem.user_id == user_id,
         BlocklistItem.website == normalized_website
-    ).first()
-    return item is not None
+    )))
+
+# Activity rollup maintenance
+def _utc_day(value) -> date:
+    return value.astimezone(timezone.utc).date()
+
+def _bump_activity_day(db: Session, user_id: int, day, total_delta: int, solved_delta: int):
+    """Apply a delta to the user's daily rollup row, creating it if needed"""
+    if not total_delta and not solved_delta:
+        return
+    db.execute(
+        insert(ActivityDay)
+        .values(user_id=user_id, day=day, total=total_delta, solved=solved_delta)
+        .on_conflict_do_update(
+            index_elements=[ActivityDay.user_id, ActivityDay.day],
+            set_={
+                "total": ActivityDay.total + total_delta,
+                "solved": ActivityDay.solved + solved_delta,
+            },
+        )
+    )
+
+def rebuild_activity_days(db: Session, user_id: Optional[int] = None, commit: bool = True):
+    """Recompute daily rollups from activities, for one user or everyone"""
+    day = cast(func.timezone("UTC", Activity.completed_at), Date)
+    aggregate = db.query(
+        Activity.user_id,
+        day,
+        func.count(),
+        func.count().filter(Activity.status == "solved"),
+    ).filter(Activity.completed_at.isnot(None)).group_by(Activity.user_id, day)
+
+    delete_query = db.query(ActivityDay)
+    if user_id is not None:
+        aggregate = aggregate.filter(Activity.user_id == user_id)
+        delete_query = delete_query.filter(ActivityDay.user_id == user_id)
+
+    delete_query.delete(synchronize_session=False)
+    db.execute(
+        insert(ActivityDay).from_select(
+            [ActivityDay.user_id, ActivityDay.day, ActivityDay.total, ActivityDay.solved],
+            aggregate,
+        )
+    )
+    if commit:
+        db.commit()
+
+def get_activity_timeseries(db: Session, user_id: int, bucket: str, start: date, end: date) -> List[dict]:
+    """Get solve counts per day or week from the rollup table (one indexed range scan)"""
+    if bucket == "week":
+        period = cast(func.date_trunc("week", ActivityDay.day), Date)
+    else:
+        period = ActivityDay.day
+
+    rows = db.query(
+        period.label("period"),
+        func.sum(ActivityDay.total).label("total"),
+        func.sum(ActivityDay.solved).label("solved"),
+    ).filter(
+        ActivityDay.user_id == user_id,
+        ActivityDay.day >= start,
+        ActivityDay.day <= end,
+    ).group_by(period).order_by(period).all()
+
+    return [
+        {"day": row.period, "total": int(row.total), "solved": int(row.solved)}
+        for row in rows
+    ]
 
 # Activity CRUD operations
+def _activity_query(db: Session):
+    """Activities joined to their catalog problem, so filters can use Problem columns"""
+    return db.query(Activity).join(Activity.problem).options(contains_eager(Activity.problem))
+
+def _activity_rows_select():
+    """Column projection matching ActivityResponse; rows skip ORM hydration and the identity map"""
+    return select(
+        Activity.id,
+        Problem.name.label("problem_name"),
+        Problem.url.label("problem_url"),
+        Problem.difficulty,
+        Problem.topic_tags,
+        Activity.status,
+        Activity.completed_at,
+    ).join(Activity.problem)
+
 def create_activity(db: Session, user_id: int, activity_data: ActivityCreate) -> Activity:
     """Create a new activity record"""
-    # Convert topic_tags list to JSON string
-    topic_tags_json = json.dumps(activity_data.topic_tags) if activity_data.topic_tags else None
-    
+    problem_id = get_or_create_problem(
+        db,
+        activity_data.problem_url,
+        activity_data.problem_name,
+        activity_data.difficulty,
+        activity_data.topic_tags,
+    )
     db_activity = Activity(
         user_id=user_id,
-        problem_name=activity_data.problem_name,
-        problem_url=normalize_problem_url(activity_data.problem_url),
-        difficulty=activity_data.difficulty,
-        topic_tags=topic_tags_json,
+        problem_id=problem_id,
         status=normalize_activity_status(activity_data.status)
     )
     db.add(db_activity)
+    # completed_at defaults to now(), which is the transaction timestamp
+    _bump_activity_day(
+        db,
+        user_id,
+        cast(func.timezone("UTC", func.now()), Date),
+        1,
+        1 if db_activity.status == "solved" else 0,
+    )
     db.commit()
     db.refresh(db_activity)
     return db_activity
 
-def get_user_activities(db: Session, user_id: int, limit: int = 100, offset: int = 0) -> List[Activity]:
-    """Get activities for a user with pagination"""
-    return db.query(Activity).filter(
+def get_user_activity_rows(
+    db: Session,
+    user_id: int,
+    limit: int = 100,
+    offset: int = 0,
+    tag: Optional[str] = None,
+) -> List[Row]:
+    """Get a page of a user's activities as named rows, optionally filtered by topic tag"""
+    statement = _activity_rows_select().where(Activity.user_id == user_id)
+    if tag:
+        # jsonb @> is served by the GIN index on problems.topic_tags
+        statement = statement.where(Problem.topic_tags.contains([tag]))
+    statement = statement.order_by(Activity.completed_at.desc()).limit(limit).offset(offset)
+    return db.execute(statement).all()
+
+def get_activity_row(db: Session, activity_id: int, user_id: int) -> Optional[Row]:
+    """Read-only variant of get_activity returning a named row"""
+    return db.execute(_activity_rows_select().where(
+        Activity.id == activity_id,
         Activity.user_id == user_id
-    ).order_by(Activity.completed_at.desc()).limit(limit).offset(offset).all()
+    )).first()
+
+def iter_activity_export_rows(db: Session, user_id: int, batch_size: int = 1000) -> Iterator:
+    """Stream a user's activities as lightweight rows from a server-side cursor"""
+    statement = _activity_rows_select().where(
+        Activity.user_id == user_id
+    ).order_by(Activity.completed_at.desc(), Activity.id.desc())
+
+    # yield_per implies stream_results, so only one batch is held in memory
+    yield from db.execute(statement.execution_options(yield_per=batch_size))
 
 def get_activity(db: Session, activity_id: int, user_id: int) -> Optional[Activity]:
     """Get a specific activity by ID and user"""
-    return db.query(Activity).filter(
+    return _activity_query(db).filter(
         Activity.id == activity_id,
         Activity.user_id == user_id
     ).first()
@@ -97,18 +219,18 @@ def update_activity(db: Session, activity_id: int, user_id: int, activity_data:
     activity = get_activity(db, activity_id, user_id)
     if not activity:
         return None
+    was_solved = activity.status == "solved"
     
-    # Update fields if provided
-    if activity_data.problem_name is not None:
-        activity.problem_name = activity_data.problem_name
+    # Name, difficulty and tags belong to the catalog row every user shares, so an edit
+    # never writes them; a new URL re-points the activity at that problem's row
     if activity_data.problem_url is not None:
-        activity.problem_url = normalize_problem_url(activity_data.problem_url)
-    if activity_data.difficulty is not None:
-        activity.difficulty = activity_data.difficulty
-    if activity_data.topic_tags is not None:
-        activity.topic_tags = json.dumps(activity_data.topic_tags)
+        activity.problem_id = get_or_create_problem(db, activity_data.problem_url)
     if activity_data.status is not None:
         activity.status = normalize_activity_status(activity_data.status)
+
+    is_solved = activity.status == "solved"
+    if activity.completed_at is not None and was_solved != is_solved:
+        _bump_activity_day(db, user_id, _utc_day(activity.completed_at), 0, 1 if is_solved else -1)
     
     db.commit()
     db.refresh(activity)
@@ -118,6 +240,14 @@ def delete_activity(db: Session, activity_id: int, user_id: int) -> bool:
     """Delete an activity record"""
     activity = get_activity(db, activity_id, user_id)
     if activity:
+        if activity.completed_at is not None:
+            _bump_activity_day(
+                db,
+                user_id,
+                _utc_day(activity.completed_at),
+                -1,
+                -1 if activity.status == "solved" else 0,
+            )
         db.delete(activity)
         db.commit()
         return True
@@ -125,10 +255,9 @@ def delete_activity(db: Session, activity_id: int, user_id: int) -> bool:
 
 def get_activity_by_problem_url(db: Session, user_id: int, problem_url: str) -> Optional[Activity]:
     """Get activity by problem URL (for checking duplicates)"""
-    normalized_url = normalize_problem_url(problem_url)
-    return db.query(Activity).filter(
+    return _activity_query(db).filter(
         Activity.user_id == user_id,
-        Activity.problem_url == normalized_url
+        Problem.slug == problem_slug(problem_url)
     ).first()
 
 def get_activity_stats(db: Session, user_id: int) -> dict:
@@ -148,3 +277,14 @@ def get_activity_stats(db: Session, user_id: int) -> dict:
         "solved": solved_count,
         "attempted": attempted_count
     }
+
+def get_activity_tag_counts(db: Session, user_id: int) -> List[dict]:
+    """Get solved counts per topic tag in a single aggregate"""
+    tag = func.jsonb_array_elements_text(Problem.topic_tags).column_valued("tag")
+    rows = db.query(tag, func.count()).select_from(Activity).join(Activity.problem).filter(
+        Activity.user_id == user_id,
+        Activity.status == "solved",
+        Problem.topic_tags.isnot(None),
+    ).group_by(tag).order_by(func.count().desc(), tag).all()
+
+    return [{"tag": name, "count": count} for name, count in rows]
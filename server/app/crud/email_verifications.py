@@ -0,0 +1,98 @@
+"""
+Pending email verification codes.
+
+Codes live in email_verifications, one row per unverified user, so sending
+and checking them never rewrites or locks the `users` row that every
+authenticated request reads. A code is burned after
+VERIFICATION_CODE_MAX_ATTEMPTS wrong guesses, after which only a resend
+helps. Expired rows are deleted in batches by
+app.jobs.purge_email_verifications.
+"""
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.auth.models.user import EmailVerification
+from app.config import settings
+
+PURGE_BATCH_SIZE = 10000
+
+
+def issue_verification_code(db: Session, user_id: int, commit: bool = True) -> str:
+    """Create or replace the user's pending code with a fresh expiry and no failed attempts"""
+    code = f"{secrets.randbelow(1000000):06d}"
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(minutes=settings.VERIFICATION_CODE_EXPIRE_MINUTES)
+    db.execute(
+        insert(EmailVerification)
+        .values(
+            user_id=user_id,
+            code=code,
+            expires_at=expires_at,
+            sent_at=now,
+            resend_cooldown_seconds=settings.INITIAL_RESEND_COOLDOWN_SECONDS,
+        )
+        .on_conflict_do_update(
+            index_elements=[EmailVerification.user_id],
+            set_={
+                "code": code,
+                "expires_at": expires_at,
+                "sent_at": now,
+                "failed_attempts": 0,
+                "send_count": EmailVerification.send_count + 1,
+            },
+        )
+    )
+    if commit:
+        db.commit()
+    return code
+
+
+def get_email_verification(db: Session, user_id: int):
+    return db.get(EmailVerification, user_id)
+
+
+def consume_verification_code(db: Session, user_id: int, code: str) -> bool:
+    """Delete the pending code if it matches and is still usable; a miss counts a failed attempt.
+
+    The caller commits either way, so failed attempts are recorded.
+    """
+    matched = db.execute(
+        delete(EmailVerification)
+        .where(
+            EmailVerification.user_id == user_id,
+            EmailVerification.code == code,
+            EmailVerification.expires_at > func.now(),
+            EmailVerification.failed_attempts < settings.VERIFICATION_CODE_MAX_ATTEMPTS,
+        )
+        .returning(EmailVerification.user_id)
+    ).scalar()
+    if matched is not None:
+        return True
+    db.execute(
+        update(EmailVerification)
+        .where(EmailVerification.user_id == user_id)
+        .values(failed_attempts=EmailVerification.failed_attempts + 1)
+    )
+    return False
+
+
+def purge_expired_email_verifications(db: Session, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Delete expired codes in short batches so the sweep never holds long locks"""
+    deleted = 0
+    while True:
+        expired = (
+            select(EmailVerification.user_id)
+            .where(EmailVerification.expires_at < func.now())
+            .limit(batch_size)
+        )
+        count = db.execute(
+            delete(EmailVerification).where(EmailVerification.user_id.in_(expired.scalar_subquery()))
+        ).rowcount
+        db.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
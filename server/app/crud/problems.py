@@ -0,0 +1,109 @@
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from typing import List, Optional
+
+from sqlalchemy import case, event, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.auth.models.user import Problem
+from app.utils.normalization import normalize_problem_url, problem_slug
+from app.utils.problem_metadata import UNKNOWN_DIFFICULTY, enrich_problem_fields
+
+ProblemRef = namedtuple("ProblemRef", ["id", "name", "difficulty", "topic_tags"])
+
+# In-process slug -> ProblemRef cache. Catalog rows are never deleted, so a cached
+# id stays valid; entries are only published after the inserting transaction commits.
+PROBLEM_CACHE_SIZE = 10000
+_problem_cache: "OrderedDict[str, ProblemRef]" = OrderedDict()
+_problem_cache_lock = Lock()
+_PENDING_KEY = "pending_problem_cache"
+
+
+def _cache_get(slug: str) -> Optional[ProblemRef]:
+    with _problem_cache_lock:
+        ref = _problem_cache.get(slug)
+        if ref is not None:
+            _problem_cache.move_to_end(slug)
+        return ref
+
+
+def _cache_put(slug: str, ref: ProblemRef):
+    with _problem_cache_lock:
+        _problem_cache[slug] = ref
+        _problem_cache.move_to_end(slug)
+        while len(_problem_cache) > PROBLEM_CACHE_SIZE:
+            _problem_cache.popitem(last=False)
+
+
+def clear_problem_cache():
+    with _problem_cache_lock:
+        _problem_cache.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_problems(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        for slug, ref in pending.items():
+            _cache_put(slug, ref)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_problems(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _fills_gaps(ref: ProblemRef, slug: str, name: Optional[str], difficulty: Optional[str], topic_tags) -> bool:
+    """Whether a submission has a value for any field the catalog row is still missing"""
+    if name and ref.name in ("", slug):
+        return True
+    if difficulty and difficulty != UNKNOWN_DIFFICULTY and ref.difficulty == UNKNOWN_DIFFICULTY:
+        return True
+    return bool(topic_tags) and not ref.topic_tags
+
+
+def get_or_create_problem(
+    db: Session,
+    problem_url: str,
+    name: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    topic_tags: Optional[List[str]] = None,
+) -> int:
+    """Return the catalog id for a problem, upserting it lazily.
+
+    Missing fields are filled from the offline metadata snapshot. The row is
+    shared by every user, so a submission only fills values the row is still
+    missing (a name that is just the slug, "Unknown" difficulty, no tags) and
+    never replaces known metadata. Cache hits with no gap to fill don't touch
+    the database.
+    """
+    slug = problem_slug(problem_url)
+    name, difficulty, topic_tags = enrich_problem_fields(slug, name, difficulty, topic_tags)
+    cached = _cache_get(slug)
+    if cached is not None and not _fills_gaps(cached, slug, name, difficulty, topic_tags):
+        return cached.id
+
+    values = {
+        "slug": slug,
+        "url": normalize_problem_url(problem_url),
+        "name": name or slug,
+        "difficulty": difficulty or UNKNOWN_DIFFICULTY,
+        "topic_tags": topic_tags or None,
+    }
+    statement = insert(Problem).values(**values)
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[Problem.slug],
+        set_={
+            "name": case((Problem.name.in_(["", Problem.slug]), excluded.name), else_=Problem.name),
+            "difficulty": case(
+                (Problem.difficulty == UNKNOWN_DIFFICULTY, excluded.difficulty), else_=Problem.difficulty
+            ),
+            "topic_tags": func.coalesce(Problem.topic_tags, excluded.topic_tags),
+        },
+    ).returning(Problem.id, Problem.name, Problem.difficulty, Problem.topic_tags)
+
+    row = db.execute(statement).one()
+    db.info.setdefault(_PENDING_KEY, {})[slug] = ProblemRef(*row)
+    return row.id
@@ -0,0 +1,163 @@
+"""
+Refresh token rotation with reuse detection.
+
+Every refresh token is recorded by `jti` along with its family (all tokens
+rotated from one login). Refreshing atomically marks the presented token
+replaced and issues its successor; presenting a replaced token again means
+it was copied, so the whole family is deleted and both the thief and the
+legitimate client have to log in again. Validation is a primary-key update.
+
+Revoked families are remembered in a bounded in-process cache, so replays
+from a revoked family are rejected before touching the database.
+"""
+import logging
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.auth.models.user import RefreshToken
+from app.config import settings
+from app.utils import jwt as jwt_utils
+
+logger = logging.getLogger(__name__)
+
+REVOKED_FAMILY_CACHE_SIZE = 10000
+PURGE_BATCH_SIZE = 10000
+
+_revoked_families: "OrderedDict[uuid.UUID, None]" = OrderedDict()
+_revoked_families_lock = Lock()
+
+
+def _remember_revoked(family_id: uuid.UUID):
+    with _revoked_families_lock:
+        _revoked_families[family_id] = None
+        _revoked_families.move_to_end(family_id)
+        while len(_revoked_families) > REVOKED_FAMILY_CACHE_SIZE:
+            _revoked_families.popitem(last=False)
+
+
+def _is_known_revoked(family_id: uuid.UUID) -> bool:
+    with _revoked_families_lock:
+        return family_id in _revoked_families
+
+
+def clear_revoked_family_cache():
+    with _revoked_families_lock:
+        _revoked_families.clear()
+
+
+def _parse_uuid(value) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def issue_refresh_token(db: Session, user_id: int, family_id: Optional[uuid.UUID] = None) -> str:
+    """Record and return a new refresh token, starting a new family unless one is given"""
+    jti = uuid.uuid4()
+    family_id = family_id or uuid.uuid4()
+    expires_delta = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    db.add(RefreshToken(
+        jti=jti,
+        family_id=family_id,
+        user_id=user_id,
+        expires_at=datetime.now(timezone.utc) + expires_delta,
+    ))
+    db.commit()
+    return jwt_utils.create_refresh_token(
+        data={"sub": str(user_id), "jti": str(jti), "fam": str(family_id)},
+        expires_delta=expires_delta,
+    )
+
+
+def revoke_refresh_family(db: Session, family_id: uuid.UUID):
+    db.execute(delete(RefreshToken).where(RefreshToken.family_id == family_id))
+    db.commit()
+    _remember_revoked(family_id)
+
+
+def revoke_user_refresh_tokens(db: Session, user_id: int, commit: bool = True):
+    """Log a user out everywhere by deleting all of their token families"""
+    family_ids = db.scalars(
+        delete(RefreshToken).where(RefreshToken.user_id == user_id).returning(RefreshToken.family_id)
+    ).all()
+    if commit:
+        db.commit()
+    for family_id in set(family_ids):
+        _remember_revoked(family_id)
+
+
+def _adopt_legacy_token(db: Session, jti: uuid.UUID, user_id: int, expires_at: datetime) -> Optional[uuid.UUID]:
+    """Record a token issued before rotation existed as already replaced; None if it was seen before"""
+    return db.execute(
+        insert(RefreshToken)
+        .values(jti=jti, family_id=uuid.uuid4(), user_id=user_id, expires_at=expires_at, replaced_at=func.now())
+        .on_conflict_do_nothing(index_elements=[RefreshToken.jti])
+        .returning(RefreshToken.family_id)
+    ).scalar()
+
+
+def _revoke_reused(db: Session, jti: uuid.UUID, user_id: int):
+    """A replaced token was presented again: delete the family it was rotated into"""
+    db.rollback()
+    reused_family = db.scalar(select(RefreshToken.family_id).where(RefreshToken.jti == jti))
+    if reused_family is not None:
+        logger.warning("Refresh token reuse detected for user %s; revoking token family %s", user_id, reused_family)
+        revoke_refresh_family(db, reused_family)
+
+
+def rotate_refresh_token(db: Session, payload: dict) -> Optional[str]:
+    """Exchange a decoded, valid refresh token for its successor; None if it is not usable"""
+    jti = _parse_uuid(payload.get("jti"))
+    user_id = int(payload["sub"])
+    if jti is None:
+        return None
+
+    family_id = _parse_uuid(payload.get("fam"))
+    if family_id is None:
+        # Issued before rotation: allow one exchange, then treat it like any replaced token
+        expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+        family_id = _adopt_legacy_token(db, jti, user_id, expires_at)
+        if family_id is None:
+            _revoke_reused(db, jti, user_id)
+            return None
+        return issue_refresh_token(db, user_id, family_id)
+
+    if _is_known_revoked(family_id):
+        return None
+
+    rotated = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jti,
+            RefreshToken.user_id == user_id,
+            RefreshToken.replaced_at.is_(None),
+            RefreshToken.expires_at > func.now(),
+        )
+        .values(replaced_at=func.now())
+        .returning(RefreshToken.family_id)
+    ).scalar()
+    if rotated is not None:
+        return issue_refresh_token(db, user_id, rotated)
+
+    _revoke_reused(db, jti, user_id)
+    return None
+
+
+def purge_expired_refresh_tokens(db: Session, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Delete expired rows in short batches so the purge never holds long locks"""
+    deleted = 0
+    while True:
+        expired = select(RefreshToken.jti).where(RefreshToken.expires_at < func.now()).limit(batch_size)
+        count = db.execute(delete(RefreshToken).where(RefreshToken.jti.in_(expired.scalar_subquery()))).rowcount
+        db.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
@@ -1,12 +1,14 @@
-import random
 from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 
 from passlib.context import CryptContext
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from app.auth.models.user import BlocklistItem, User
+from app.auth.models.user import BlocklistItem, GoalDay, User
 from app.auth.schemas.user import UserCreate, UserUpdate
+from app.crud.email_verifications import issue_verification_code
+from app.crud.refresh_tokens import revoke_user_refresh_tokens
 from app.defaults import DEFAULT_BLOCKLIST
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -45,19 +47,14 @@ def get_user_by_email(db: Session, email: str):
 # Creates a new user in the database with a hashed password. Used during user registration.
 def create_user(db: Session, user: UserCreate):
     hashed_password = pwd_context.hash(user.password)
-    verification_code = f"{random.randint(0, 999999):06d}"
-    verification_code_expires = datetime.now(timezone.utc) + timedelta(minutes=10)
-    now = datetime.now(timezone.utc)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
         is_verified=False,
-        verification_code=verification_code,
-        verification_code_expires=verification_code_expires,
-        last_code_sent_at=now,
     )
     db.add(db_user)
     db.flush()
+    issue_verification_code(db, db_user.id, commit=False)
     _seed_default_blocklist(db, db_user)
     db.commit()
     db.refresh(db_user)
@@ -65,14 +62,10 @@ def create_user(db: Session, user: UserCreate):
 
 # Creates a new OAuth user in the database without a password. Used during OAuth registration.
 def create_oauth_user(db: Session, email: str, display_name: str = None):
-    now = datetime.now(timezone.utc)
     db_user = User(
         email=email,
         hashed_password=None,  # OAuth users don't have passwords initially
         is_verified=True,  # OAuth users are pre-verified
-        verification_code=None,
-        verification_code_expires=None,
-        last_code_sent_at=None,
         display_name=display_name,
     )
     db.add(db_user)
@@ -106,6 +99,13 @@ def update_user_profile(db: Session, user_id: int, user_update: UserUpdate):
     db.refresh(db_user)
     return db_user
 
+# Invalidates every access token issued so far and deletes all refresh token families (log out everywhere).
+def revoke_user_tokens(db: Session, db_user: User, commit: bool = True):
+    db_user.tokens_valid_after = datetime.now(timezone.utc)
+    revoke_user_refresh_tokens(db, db_user.id, commit=False)
+    if commit:
+        db.commit()
+
 # Updates a user's password (for OAuth users adding password)
 def update_user_password(db: Session, user_id: int, password: str):
     db_user = get_user_by_id(db, user_id)
@@ -117,31 +117,61 @@ def update_user_password(db: Session, user_id: int, password: str):
     db_user.hashed_password = hashed_password
     
     # Generate verification code for the updated account
-    verification_code = f"{random.randint(0, 999999):06d}"
-    verification_code_expires = datetime.now(timezone.utc) + timedelta(minutes=10)
-    db_user.verification_code = verification_code
-    db_user.verification_code_expires = verification_code_expires
-    db_user.last_code_sent_at = datetime.now(timezone.utc)
+    issue_verification_code(db, db_user.id, commit=False)
     db_user.is_verified = False  # Require verification for password addition
+    revoke_user_tokens(db, db_user, commit=False)
     
     db.commit()
     db.refresh(db_user)
     return db_user
 
 def ensure_progress_for_today(db: Session, user_id: int):
-    """Lazy reset: ensure progress is for today's UTC date"""
+    """Lazy reset: ensure progress is for today's UTC date.
+
+    The previous day's progress is archived into goal_days in the same
+    transaction as the reset, so history survives the rollover.
+    """
     today_utc = date.today()
-    
-    # Update progress if it's not for today
-    result = db.query(User).filter(
+
+    # Lock the row so concurrent requests can't archive or reset twice
+    stale = db.query(User.progress_date, User.progress_today, User.target_daily).filter(
         User.id == user_id,
         User.progress_date != today_utc
-    ).update({
+    ).with_for_update().first()
+    if stale is None:
+        return False
+
+    db.execute(
+        insert(GoalDay)
+        .values(
+            user_id=user_id,
+            day=stale.progress_date,
+            progress=stale.progress_today or 0,
+            target=stale.target_daily or 0,
+        )
+        .on_conflict_do_update(
+            index_elements=[GoalDay.user_id, GoalDay.day],
+            set_={"progress": stale.progress_today or 0, "target": stale.target_daily or 0},
+        )
+    )
+    db.query(User).filter(User.id == user_id).update({
         User.progress_today: 0,
         User.progress_date: today_utc
     })
-    
-    return result > 0  # True if reset happened
+
+    return True  # Reset happened
+
+def _record_goal_met(user: User):
+    """Advance the user's streak in O(1) when today's goal is reached"""
+    day = user.progress_date
+    if user.last_goal_met_date == day:
+        return
+    if user.last_goal_met_date == day - timedelta(days=1):
+        user.current_streak = (user.current_streak or 0) + 1
+    else:
+        user.current_streak = 1
+    user.longest_streak = max(user.longest_streak or 0, user.current_streak)
+    user.last_goal_met_date = day
 
 def get_user_goal(db: Session, user_id: int):
     """Get user's goal info with lazy reset"""
@@ -157,12 +187,22 @@ def get_user_goal(db: Session, user_id: int):
         }
     return None
 
+def _lock_user(db: Session, user_id: int) -> Optional[User]:
+    """Load the user row FOR UPDATE, refreshing a copy already in the session"""
+    return db.query(User).filter(User.id == user_id).populate_existing().with_for_update().first()
+
 def update_user_goal(db: Session, user_id: int, target_daily: int):
-    """Update user's daily goal target"""
+    """Update user's daily goal target.
+
+    Lowering the target to today's progress or below meets today's goal and
+    counts toward the streak, like reaching it by solving.
+    """
     ensure_progress_for_today(db, user_id)
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _lock_user(db, user_id)
     if user:
         user.target_daily = target_daily
+        if user.progress_today >= user.target_daily:
+            _record_goal_met(user)
         db.commit()
         db.refresh(user)
         
@@ -178,9 +218,12 @@ def update_user_goal(db: Session, user_id: int, target_daily: int):
 def increment_progress(db: Session, user_id: int, delta: int = 1):
     """Increment user's daily progress with lazy reset"""
     ensure_progress_for_today(db, user_id)
-    user = db.query(User).filter(User.id == user_id).first()
+    # Locked so concurrent solves neither lose an increment nor both miss the goal
+    user = _lock_user(db, user_id)
     if user:
         user.progress_today += delta
+        if user.progress_today >= user.target_daily:
+            _record_goal_met(user)
         db.commit()
         db.refresh(user)
         
@@ -194,3 +237,21 @@ def increment_progress(db: Session, user_id: int, delta: int = 1):
             "is_goal_completed": is_goal_completed
         }
     return None
+
+def get_user_streak(db: Session, user_id: int):
+    """Get user's current and longest streak without scanning history"""
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        return None
+
+    # A streak survives until a full day passes without reaching the goal
+    today_utc = date.today()
+    current_streak = user.current_streak or 0
+    if not user.last_goal_met_date or user.last_goal_met_date < today_utc - timedelta(days=1):
+        current_streak = 0
+
+    return {
+        "current_streak": current_streak,
+        "longest_streak": user.longest_streak or 0,
+        "last_goal_met_date": user.last_goal_met_date,
+    }
@@ -0,0 +1,73 @@
+"""
+Per-request SQL statement accounting.
+
+Cursor-execute events on every Engine add each statement's count and
+duration to the QueryStats bound to the current context. Sync handlers and
+dependencies run in a threadpool with a copy of the request's context, so
+they share the same QueryStats object as the middleware that created it.
+"""
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        # Parameterized SQL text -> executions; repeats point at N+1 loops
+        self.statements: Counter = Counter()
+
+    def most_repeated(self):
+        """(statement, executions) for the most repeated statement, or None"""
+        top = self.statements.most_common(1)
+        return top[0] if top else None
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Count statements executed in this context (and threads copied from it)"""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+def statement_elapsed(context) -> Optional[float]:
+    """Seconds since the statement on this execution context started, if timed"""
+    started_at = getattr(context, "_query_started_at", None)
+    return None if started_at is None else time.perf_counter() - started_at
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    elapsed = statement_elapsed(context)
+    if elapsed is None:
+        return
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+        stats.statements[statement] += 1
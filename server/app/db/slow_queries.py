@@ -0,0 +1,180 @@
+"""
+Slow statement log.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are logged with their
+normalized SQL, the shape of their bind parameters and the app.crud function
+that issued them, and aggregated per normalized statement for a top-N
+report. With SLOW_QUERY_EXPLAIN enabled, the first slow execution of each
+SELECT is re-run under EXPLAIN (ANALYZE, BUFFERS) on a background thread,
+so plan capture never adds latency to the request that was slow. Locking
+reads (FOR UPDATE / FOR SHARE) are never re-run, and the EXPLAIN itself runs
+in a read-only transaction with short lock and statement timeouts.
+"""
+import logging
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.db.query_stats import statement_elapsed
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE)
+
+# Plan capture gives up rather than queue behind row locks or run away
+EXPLAIN_LOCK_TIMEOUT_MS = 100
+EXPLAIN_STATEMENT_TIMEOUT_MS = 5000
+
+_threshold_seconds: Optional[float] = None
+_explain_enabled = False
+_records: Dict[str, "SlowQueryRecord"] = {}
+_records_lock = threading.Lock()
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+
+
+class SlowQueryRecord:
+    __slots__ = ("sql", "calls", "total_seconds", "max_seconds", "caller", "bind_shape", "plan")
+
+    def __init__(self, sql: str, caller: str, bind_shape):
+        self.sql = sql
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.caller = caller
+        self.bind_shape = bind_shape
+        self.plan: Optional[str] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "sql": self.sql,
+            "calls": self.calls,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "mean_ms": round(self.total_seconds * 1000 / self.calls, 2),
+            "caller": self.caller,
+            "bind_shape": self.bind_shape,
+            "plan": self.plan,
+        }
+
+
+def configure_slow_query_log(threshold_ms: float, explain: bool = False):
+    """Set the threshold (negative disables, 0 captures everything) and EXPLAIN capture"""
+    global _threshold_seconds, _explain_enabled
+    _threshold_seconds = None if threshold_ms < 0 else threshold_ms / 1000
+    _explain_enabled = explain
+
+
+def reset_slow_query_log():
+    with _records_lock:
+        _records.clear()
+
+
+def normalize_sql(statement: str) -> str:
+    """Replace literals and bind placeholders with ? so executions group together"""
+    sql = _PLACEHOLDER.sub("?", statement)
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _VALUE_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def bind_shape(parameters, executemany: bool = False):
+    """Parameter names and types without values (never log user data)"""
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return {"rows": len(parameters), "each": bind_shape(parameters[0])}
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def _calling_function() -> str:
+    """The innermost app.crud function on the stack, else the innermost app frame"""
+    frame = sys._getframe(1)
+    fallback = "unknown"
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.crud"):
+            return f"{module}.{frame.f_code.co_name}"
+        if fallback == "unknown" and module.startswith("app.") and not module.startswith("app.db"):
+            fallback = f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return fallback
+
+
+def is_explainable(statement: str) -> bool:
+    """Plain SELECTs only: re-running a locking read would take its row locks again"""
+    return statement.lstrip().upper().startswith("SELECT") and not _LOCKING_CLAUSE.search(statement)
+
+
+def _capture_plan(engine: Engine, statement: str, parameters, record: SlowQueryRecord):
+    try:
+        with engine.connect() as connection:
+            # Must be the transaction's first statement; a SELECT that writes
+            # (e.g. through a volatile function) then fails instead of running
+            connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+            connection.exec_driver_sql(f"SET LOCAL lock_timeout = {EXPLAIN_LOCK_TIMEOUT_MS}")
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {EXPLAIN_STATEMENT_TIMEOUT_MS}")
+            explain = f"EXPLAIN (ANALYZE, BUFFERS) {statement}"
+            result = connection.exec_driver_sql(explain, parameters) if parameters else connection.exec_driver_sql(explain)
+            rows = result.all()
+            # ANALYZE executes the statement; never keep its effects
+            connection.rollback()
+        plan = "\n".join(row[0] for row in rows)
+    except Exception as exc:
+        plan = f"EXPLAIN failed: {exc}"
+    with _records_lock:
+        record.plan = plan
+    logger.warning("Plan for slow query from %s:\n%s", record.caller, plan)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _log_slow_statement(conn, cursor, statement, parameters, context, executemany):
+    if _threshold_seconds is None:
+        return
+    elapsed = statement_elapsed(context)
+    if elapsed is None or elapsed < _threshold_seconds or statement.lstrip().upper().startswith("EXPLAIN"):
+        return
+
+    sql = normalize_sql(statement)
+    caller = _calling_function()
+    shape = bind_shape(parameters, executemany)
+    logger.warning("Slow query (%.1f ms) from %s: %s | binds=%s", elapsed * 1000, caller, sql, shape)
+
+    # Only plain SELECTs are safe to re-run under ANALYZE
+    explainable = _explain_enabled and not executemany and is_explainable(statement)
+    with _records_lock:
+        record = _records.get(sql)
+        if record is None:
+            record = _records[sql] = SlowQueryRecord(sql, caller, shape)
+        record.calls += 1
+        record.total_seconds += elapsed
+        record.max_seconds = max(record.max_seconds, elapsed)
+        capture_plan = explainable and record.plan is None
+        if capture_plan:
+            record.plan = "pending"
+
+    if capture_plan:
+        _explain_executor.submit(_capture_plan, conn.engine, statement, parameters, record)
+
+
+def slow_query_report(limit: int = 20) -> List[dict]:
+    """Slow statements ordered by total time spent, worst first"""
+    with _records_lock:
+        records = sorted(_records.values(), key=lambda record: record.total_seconds, reverse=True)
+        return [record.as_dict() for record in records[:limit]]
+
+
+configure_slow_query_log(settings.SLOW_QUERY_THRESHOLD_MS, settings.SLOW_QUERY_EXPLAIN)
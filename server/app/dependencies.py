@@ -3,10 +3,25 @@ from sqlalchemy.orm import Session
 from app.db.session import get_db
 from fastapi.security import OAuth2PasswordBearer
 from app.crud.user import get_user_by_id
-from app.utils.jwt import decode_access_token
+from app.utils.jwt import decode_access_token, timestamp_ms
+from app.config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+def is_token_revoked(user, payload: dict) -> bool:
+    """True when the token predates the user's revocation watermark.
+
+    The user row is loaded for every authenticated request anyway, so this
+    costs no extra query. Tokens are compared by their millisecond `iat_ms`
+    claim; one from the revocation's own millisecond can't be shown to come
+    after it and is revoked. Tokens minted before the claim existed only
+    carry whole-second `iat` and count from the start of that second.
+    """
+    if user.tokens_valid_after is None:
+        return False
+    issued_ms = payload.get("iat_ms", payload.get("iat", 0) * 1000)
+    return issued_ms <= timestamp_ms(user.tokens_valid_after)
+
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     payload = decode_access_token(token)
     if payload is None:
@@ -20,6 +35,17 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
     if user is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if is_token_revoked(user, payload):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
     if not user.is_verified:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Email not verified")
     return user
+
+
+def is_admin(user) -> bool:
+    return user.email.lower() in settings.ADMIN_EMAILS
+
+def get_admin_user(current_user = Depends(get_current_user)):
+    if not is_admin(current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
@@ -0,0 +1,30 @@
+"""
+Backfill the activity_days rollup from existing activity rows.
+
+Run once after deploying the rollup table, or any time the rollup is
+suspected to have drifted:
+
+    python -m app.jobs.backfill_activity_days [--user-id ID]
+"""
+import argparse
+
+from app.crud.data import rebuild_activity_days
+from app.db.session import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the per-user daily activity rollup.")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's rows")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuild_activity_days(db, args.user_id)
+    finally:
+        db.close()
+    scope = f"user {args.user_id}" if args.user_id is not None else "all users"
+    print(f"Rebuilt activity_days for {scope}")
+
+
+if __name__ == "__main__":
+    main()
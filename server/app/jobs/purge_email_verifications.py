@@ -0,0 +1,30 @@
+"""
+Delete expired email verification codes.
+
+Expired codes are rejected whether or not their rows exist, so this only
+keeps the email_verifications table small. Schedule it hourly (cron,
+Kubernetes CronJob):
+
+    python -m app.jobs.purge_email_verifications [--batch-size N]
+"""
+import argparse
+
+from app.crud.email_verifications import PURGE_BATCH_SIZE, purge_expired_email_verifications
+from app.db.session import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete expired email verification codes.")
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE, help="Rows deleted per transaction")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        deleted = purge_expired_email_verifications(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"Deleted {deleted} expired email verification codes")
+
+
+if __name__ == "__main__":
+    main()
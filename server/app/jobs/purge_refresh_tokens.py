@@ -0,0 +1,29 @@
+"""
+Delete expired rows from the refresh token rotation store.
+
+Expired tokens are rejected whether or not their rows exist, so this only
+keeps the table small. Schedule it daily (cron, Kubernetes CronJob):
+
+    python -m app.jobs.purge_refresh_tokens [--batch-size N]
+"""
+import argparse
+
+from app.crud.refresh_tokens import PURGE_BATCH_SIZE, purge_expired_refresh_tokens
+from app.db.session import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete expired refresh token rows.")
+    parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE, help="Rows deleted per transaction")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        deleted = purge_expired_refresh_tokens(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"Deleted {deleted} expired refresh tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Refresh the offline LeetCode problem metadata snapshot.
+
+Fetches every problem from LeetCode's public GraphQL API (or imports a
+JSON/CSV export with --from-file), rewrites the snapshot at
+PROBLEM_METADATA_PATH, and optionally backfills catalog rows whose
+difficulty or tags are missing:
+
+    python -m app.jobs.refresh_problem_metadata [--from-file PATH] [--update-catalog]
+
+This is the only place that talks to LeetCode; request handlers only read
+the snapshot. Running workers reload the rewritten file within
+RELOAD_CHECK_SECONDS, so no restart is needed.
+"""
+import argparse
+import json
+from typing import List
+
+import httpx
+from sqlalchemy import text
+
+from app.config import settings
+from app.db.session import SessionLocal
+from app.utils.problem_metadata import read_snapshot, write_snapshot
+
+LEETCODE_GRAPHQL_URL = "https://leetcode.com/graphql"
+PAGE_SIZE = 100
+
+PROBLEM_LIST_QUERY = """
+query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
+  problemsetQuestionList: questionList(categorySlug: $categorySlug, limit: $limit, skip: $skip, filters: $filters) {
+    total: totalNum
+    questions: data {
+      title
+      titleSlug
+      difficulty
+      topicTags { name }
+    }
+  }
+}
+"""
+
+
+def fetch_problems() -> List[dict]:
+    records = []
+    skip = 0
+    with httpx.Client(timeout=30, headers={"Referer": "https://leetcode.com/problemset/"}) as client:
+        while True:
+            response = client.post(
+                LEETCODE_GRAPHQL_URL,
+                json={
+                    "query": PROBLEM_LIST_QUERY,
+                    "variables": {"categorySlug": "", "limit": PAGE_SIZE, "skip": skip, "filters": {}},
+                },
+            )
+            response.raise_for_status()
+            page = response.json()["data"]["problemsetQuestionList"]
+            for question in page["questions"]:
+                records.append({
+                    "slug": question["titleSlug"],
+                    "name": question["title"],
+                    "difficulty": question["difficulty"],
+                    "topic_tags": [tag["name"] for tag in question.get("topicTags") or []],
+                })
+            skip += PAGE_SIZE
+            if not page["questions"] or skip >= page["total"]:
+                return records
+
+
+def update_catalog(records: List[dict]) -> int:
+    """Fill slug-only names, unknown difficulties and missing tags on catalog rows in one statement"""
+    statement = text(
+        """
+        UPDATE problems p
+        SET name = CASE WHEN p.name IN ('', p.slug) AND s.name <> '' THEN s.name ELSE p.name END,
+            difficulty = CASE WHEN p.difficulty = 'Unknown' THEN s.difficulty ELSE p.difficulty END,
+            topic_tags = COALESCE(p.topic_tags, s.topic_tags)
+        FROM jsonb_to_recordset(CAST(:records AS jsonb)) AS s(slug text, name text, difficulty text, topic_tags jsonb)
+        WHERE p.slug = s.slug
+          AND (p.name IN ('', p.slug) OR p.difficulty = 'Unknown' OR p.topic_tags IS NULL)
+        """
+    )
+
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            statement,
+            {"records": json.dumps([
+                {
+                    "slug": record["slug"],
+                    "name": (record.get("name") or "")[:255],
+                    "difficulty": record["difficulty"] or "Unknown",
+                    "topic_tags": record["topic_tags"] or None,
+                }
+                for record in records
+            ])},
+        )
+        db.commit()
+        return result.rowcount
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the offline LeetCode problem metadata snapshot.")
+    parser.add_argument("--from-file", help="Import a JSON or CSV export instead of fetching from LeetCode")
+    parser.add_argument("--output", default=settings.PROBLEM_METADATA_PATH, help="Snapshot path to write")
+    parser.add_argument("--update-catalog", action="store_true", help="Backfill catalog rows missing metadata")
+    args = parser.parse_args()
+
+    records = read_snapshot(args.from_file) if args.from_file else fetch_problems()
+    write_snapshot(args.output, records)
+    print(f"Wrote {len(records)} problems to {args.output}")
+
+    if args.update_catalog:
+        updated = update_catalog(records)
+        print(f"Updated {updated} catalog rows")
+
+
+if __name__ == "__main__":
+    main()
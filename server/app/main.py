@@ -1,10 +1,11 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import APIRouter, FastAPI, Depends, File, HTTPException, Query, Request, UploadFile, status
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from app.db.session import get_db
-from app.auth.schemas.user import UserCreate, UserOut, UserUpdate, EmailVerificationInput, EmailResendInput, SignupResponse, LoginVerificationResponse, GoalResponse, GoalUpdate, ProgressIncrement
+from app.auth.schemas.user import UserCreate, UserOut, UserUpdate, EmailVerificationInput, EmailResendInput, SignupResponse, LoginVerificationResponse, GoalResponse, GoalUpdate, ProgressIncrement, StreakResponse
 from app.auth.schemas.token import Token, RefreshTokenRequest
 from app.crud.user import (
     create_user,
@@ -12,51 +13,95 @@ from app.crud.user import (
     get_user_by_email,
     get_user_by_id,
     get_user_goal,
+    get_user_streak,
     increment_progress,
+    revoke_user_tokens,
     update_user_goal,
     update_user_profile,
     verify_password,
 )
 from app.utils import jwt as jwt_utils
-from app.dependencies import get_current_user
+from app.dependencies import get_admin_user, get_current_user
 from app.utils.email import send_verification_email, send_welcome_email
-from app.utils.oauth import (
-    exchange_google_code, exchange_github_code,
-    get_google_user_info, get_github_user_info
-)
 from app.auth.schemas.oauth import OAuthLoginRequest, OAuthUserInfo
-from app.auth.schemas.data import BlocklistItemCreate, BlocklistResponse, ActivityCreate, ActivityUpdate, ActivityResponse, ActivitiesResponse
+from app.auth.schemas.data import BlocklistItemCreate, BlocklistResponse, ActivityCreate, ActivityUpdate, ActivityResponse, ActivitiesResponse, ActivityTimeseriesResponse, ActivityTagsResponse, ActivityImportResponse
 from app.crud.data import (
-    create_blocklist_item, get_user_blocklist, delete_blocklist_item_by_website, check_website_blocked,
-    create_activity, get_user_activities, get_activity, update_activity, delete_activity, get_activity_stats,
-    get_activity_by_problem_url
+    create_blocklist_item, get_user_blocklist_websites, delete_blocklist_item_by_website, check_website_blocked,
+    create_activity, get_user_activity_rows, get_activity_row, update_activity, delete_activity, get_activity_stats,
+    get_activity_by_problem_url, get_activity_timeseries, get_activity_tag_counts,
+    iter_activity_export_rows
 )
+from app.crud.activity_import import import_activities
+from app.crud.refresh_tokens import issue_refresh_token, rotate_refresh_token
+from app.crud.email_verifications import consume_verification_code, get_email_verification, issue_verification_code
+from app.utils.export import csv_chunks, ndjson_chunks
+from app.utils.responses import ORJSONResponse, model_response
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.utils.metrics import render_metrics
+from app.db.slow_queries import slow_query_report
+from app.utils.tracing import configure_tracing
+from app.utils.key_ring import get_key_ring
+from app.utils.rate_limit import enforce_rate_limit, get_rate_limiter
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils.profiler import MAX_PROFILE_SECONDS, ProfilerBusy, profile_process
 from app.utils.normalization import normalize_activity_status, normalize_problem_url, normalize_website
-from datetime import datetime, timedelta, timezone
-import random
+from datetime import date, datetime, timedelta, timezone
 from app.config import settings
-from typing import Union
-import json
-
-app = FastAPI()
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "https://leetguard.com"],  # Frontend URLs
-    allow_credentials=True,
-    allow_methods=["*"],  # Allow all methods
-    allow_headers=["*"],  # Allow all headers
-)
+from typing import Literal, Optional, Union
+
+router = APIRouter()
 
 # Health check endpoint. Anyone can access this to check if the server and database are running.
-@app.get("/health")
+@router.get("/health")
 def health_check(db: Session = Depends(get_db)):
     return {"status": "ok"}
 
+# Prometheus scrape endpoint. Not in the OpenAPI schema; restrict access at the proxy.
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+# Public keys for verifying access tokens (RFC 7517). Empty while tokens are HS256.
+@router.get("/.well-known/jwks.json", include_in_schema=False)
+def jwks():
+    return Response(
+        content=get_key_ring().jwks_json,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=300"},
+    )
+
+# Top-N slow statement report. Only available with QUERY_DEBUG_ENABLED.
+@router.get("/debug/slow-queries", include_in_schema=False)
+def slow_queries(limit: int = Query(20, ge=1, le=200)):
+    if not settings.QUERY_DEBUG_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {"threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS, "queries": slow_query_report(limit)}
+
+# Sample this worker for N seconds and return a speedscope profile or collapsed stacks. Admin only.
+@router.post("/admin/profile", include_in_schema=False)
+def profile_worker(
+    seconds: float = Query(10, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5, ge=1, le=100),
+    format: Literal["speedscope", "collapsed"] = "speedscope",
+    admin = Depends(get_admin_user),
+):
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    try:
+        profiler = profile_process(seconds, interval_ms / 1000)
+    except ProfilerBusy as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    if format == "collapsed":
+        return Response(content=profiler.collapsed(), media_type="text/plain")
+    return profiler.speedscope()
+
 # User registration endpoint. Allows anyone to sign up with an email and password.
-@app.post("/auth/signup", response_model=SignupResponse)
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+@router.post("/auth/signup", response_model=SignupResponse)
+def signup(user: UserCreate, request: Request, db: Session = Depends(get_db)):
+    enforce_rate_limit(request, "signup", user.email)
     db_user = get_user_by_email(db, user.email)
     
     if db_user:
@@ -67,7 +112,7 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
             update_user_password(db, db_user.id, user.password)
             
             # Send verification email for the updated account
-            email_sent = send_verification_email(db_user.email, db_user.verification_code)
+            email_sent = send_verification_email(db_user.email, db_user.email_verification.code)
             
             if email_sent:
                 message = "Password added successfully! Please check your email for verification code."
@@ -90,7 +135,7 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     new_user = create_user(db, user)
     
     # Send verification email
-    email_sent = send_verification_email(new_user.email, new_user.verification_code)
+    email_sent = send_verification_email(new_user.email, new_user.email_verification.code)
     
     if email_sent:
         message = "Account created successfully! Please check your email for verification code."
@@ -106,21 +151,16 @@ def signup(user: UserCreate, db: Session = Depends(get_db)):
     )
 
 # User login endpoint. Allows registered users to log in and receive access and refresh tokens.
-@app.post("/auth/login", response_model=Union[Token, LoginVerificationResponse])
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+@router.post("/auth/login", response_model=Union[Token, LoginVerificationResponse])
+def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    # Before the user lookup and bcrypt, so guessing costs the attacker a 429 and us nothing
+    enforce_rate_limit(request, "login", form_data.username)
     user = get_user_by_email(db, form_data.username)
     if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     if not user.is_verified:
         # Generate new verification code and send email
-        now = datetime.now(timezone.utc)
-        new_code = f"{random.randint(0, 999999):06d}"
-        new_expiration = now + timedelta(minutes=10)
-        user.verification_code = new_code
-        user.verification_code_expires = new_expiration
-        user.last_code_sent_at = now
-        user.resend_cooldown_seconds = 30
-        db.commit()
+        new_code = issue_verification_code(db, user.id)
         
         # Send verification email
         email_sent = send_verification_email(user.email, new_code)
@@ -140,12 +180,12 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
         )
     
     access_token = jwt_utils.create_access_token(data={"sub": str(user.id)})
-    refresh_token = jwt_utils.create_refresh_token(data={"sub": str(user.id)})
+    refresh_token = issue_refresh_token(db, user.id)
 
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 # Token refresh endpoint. Allows users to get new access and refresh tokens using a valid refresh token.
-@app.post("/auth/refresh", response_model=Token)
+@router.post("/auth/refresh", response_model=Token)
 def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_db)):
     payload = jwt_utils.decode_refresh_token(request.refresh_token)
     if payload is None:
@@ -161,18 +201,27 @@ def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_db)):
     if user is None or not user.is_verified:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
     
+    # Single-use: the presented token is retired, and presenting it again revokes its family
+    new_refresh_token = rotate_refresh_token(db, payload)
+    if new_refresh_token is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
     access_token = jwt_utils.create_access_token(data={"sub": str(user.id)})
-    new_refresh_token = jwt_utils.create_refresh_token(data={"sub": str(user.id)})
 
     return {"access_token": access_token, "refresh_token": new_refresh_token, "token_type": "bearer"}
 
+# Log out everywhere. Revokes every access token issued so far and all refresh tokens for the current user.
+@router.post("/auth/logout-all")
+def logout_all(current_user: UserOut = Depends(get_current_user), db: Session = Depends(get_db)):
+    revoke_user_tokens(db, current_user)
+    return {"message": "Logged out of all sessions"}
+
 # Protected endpoint. Returns the current user's information. Requires a valid access token (user must be logged in).
-@app.get("/me", response_model=UserOut)
+@router.get("/me", response_model=UserOut)
 def read_current_user(current_user: UserOut = Depends(get_current_user)):
     return current_user
 
 # Update user profile endpoint. Allows users to update their display name.
-@app.put("/me", response_model=UserOut)
+@router.put("/me", response_model=UserOut)
 def update_profile(
     user_update: UserUpdate,
     current_user: UserOut = Depends(get_current_user),
@@ -189,24 +238,18 @@ def update_profile(
     )
 
 # Email verification endpoint. Allows users to verify their email with a 6-digit code.
-@app.post("/auth/verify-email-code")
-def verify_email_code(data: EmailVerificationInput, db: Session = Depends(get_db)):
+@router.post("/auth/verify-email-code")
+def verify_email_code(data: EmailVerificationInput, request: Request, db: Session = Depends(get_db)):
+    enforce_rate_limit(request, "verify", data.email)
     user = get_user_by_email(db, data.email)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     if user.is_verified:
         return {"message": "Email already verified."}
-    if (
-        user.verification_code != data.code or
-        not user.verification_code_expires or
-        user.verification_code_expires < datetime.now(timezone.utc)
-    ):
+    if not consume_verification_code(db, user.id, data.code):
+        db.commit()  # Record the failed attempt
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired verification code.")
     user.is_verified = True
-    user.verification_code = None
-    user.verification_code_expires = None
-    user.resend_cooldown_seconds = 30
-    user.last_code_sent_at = None
     db.commit()
     
     # Send welcome email (don't fail verification if email fails)
@@ -217,29 +260,22 @@ def verify_email_code(data: EmailVerificationInput, db: Session = Depends(get_db
     return {"message": "Email verified successfully! Welcome to LeetGuard!"}
 
 # Resend verification code endpoint. Allows users to request a new code if not yet verified.
-@app.post("/auth/resend-verification-code")
-def resend_verification_code(data: EmailResendInput, db: Session = Depends(get_db)):
+@router.post("/auth/resend-verification-code")
+def resend_verification_code(data: EmailResendInput, request: Request, db: Session = Depends(get_db)):
+    enforce_rate_limit(request, "resend", data.email)
     user = get_user_by_email(db, data.email)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     if user.is_verified:
         return {"message": "Email already verified."}
-    now = datetime.now(timezone.utc)
-    # Cooldown logic - fixed 30 seconds
-    if user.last_code_sent_at:
-        elapsed = (now - user.last_code_sent_at).total_seconds()
-        if elapsed < 30:  # Fixed 30-second cooldown
-            wait_time = int(30 - elapsed)
+    # Cooldown since the last code was sent
+    pending = get_email_verification(db, user.id)
+    if pending:
+        elapsed = (datetime.now(timezone.utc) - pending.sent_at).total_seconds()
+        if elapsed < pending.resend_cooldown_seconds:
+            wait_time = int(pending.resend_cooldown_seconds - elapsed)
             raise HTTPException(status_code=429, detail=f"You can request a new code in {wait_time} seconds.")
-    # Generate new code and expiration
-    new_code = f"{random.randint(0, 999999):06d}"
-    new_expiration = now + timedelta(minutes=10)
-    user.verification_code = new_code
-    user.verification_code_expires = new_expiration
-    user.last_code_sent_at = now
-    # Set fixed 30-second cooldown
-    user.resend_cooldown_seconds = 30
-    db.commit()
+    new_code = issue_verification_code(db, user.id)
     
     # Send verification email
     email_sent = send_verification_email(user.email, new_code)
@@ -252,9 +288,11 @@ def resend_verification_code(data: EmailResendInput, db: Session = Depends(get_d
     return {"message": "Verification code resent successfully. Please check your email."}
 
 # OAuth endpoints
-@app.post("/auth/oauth/google")
+@router.post("/auth/oauth/google")
 async def google_oauth_login(oauth_data: OAuthLoginRequest, db: Session = Depends(get_db)):
     """Handle Google OAuth login"""
+    # OAuth provider clients (httpx) load on the first OAuth login, not at worker boot
+    from app.utils.oauth import exchange_google_code, get_google_user_info
     print(f"Received OAuth data: {oauth_data}")
     # Exchange code for access token
     access_token = await exchange_google_code(oauth_data.code, oauth_data.redirect_uri)
@@ -279,7 +317,7 @@ async def google_oauth_login(oauth_data: OAuthLoginRequest, db: Session = Depend
     
     # Generate JWT tokens
     jwt_access_token = jwt_utils.create_access_token(data={"sub": str(db_user.id)})
-    jwt_refresh_token = jwt_utils.create_refresh_token(data={"sub": str(db_user.id)})
+    jwt_refresh_token = issue_refresh_token(db, db_user.id)
     
     return {
         "access_token": jwt_access_token,
@@ -294,7 +332,7 @@ async def google_oauth_login(oauth_data: OAuthLoginRequest, db: Session = Depend
     }
 
 # Blocklist endpoints
-@app.post("/api/blocklist/add")
+@router.post("/api/blocklist/add")
 def add_blocklist_item(
     blocklist_data: BlocklistItemCreate,
     current_user: UserOut = Depends(get_current_user),
@@ -319,7 +357,7 @@ def add_blocklist_item(
     
     return {"message": "Website added to blocklist", "website": website}
 
-@app.delete("/api/blocklist/remove")
+@router.delete("/api/blocklist/remove")
 def remove_blocklist_item(
     blocklist_data: BlocklistItemCreate,
     current_user: UserOut = Depends(get_current_user),
@@ -337,22 +375,21 @@ def remove_blocklist_item(
     
     return {"message": "Website removed from blocklist", "website": website}
 
-@app.get("/api/blocklist", response_model=BlocklistResponse)
+@router.get("/api/blocklist", response_model=BlocklistResponse)
 def get_blocklist(
     current_user: UserOut = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get user's blocklist"""
     ensure_default_blocklist_seeded(db, current_user.id)
-    items = get_user_blocklist(db, current_user.id)
-    return BlocklistResponse(websites=[item.website for item in items])
+    return {"websites": get_user_blocklist_websites(db, current_user.id)}
 
 def _check_blocklist_response(db: Session, user_id: int, website: str):
     normalized_website = normalize_website(website)
     is_blocked = check_website_blocked(db, user_id, normalized_website)
     return {"website": normalized_website, "is_blocked": is_blocked}
 
-@app.get("/api/blocklist/check")
+@router.get("/api/blocklist/check")
 def check_blocklist_query(
     website: str,
     current_user: UserOut = Depends(get_current_user),
@@ -364,7 +401,7 @@ def check_blocklist_query(
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-@app.get("/api/blocklist/check/{website}")
+@router.get("/api/blocklist/check/{website}")
 def check_blocklist_path(
     website: str,
     current_user: UserOut = Depends(get_current_user),
@@ -377,7 +414,7 @@ def check_blocklist_path(
         raise HTTPException(status_code=400, detail=str(exc))
 
 # Activity endpoints
-@app.post("/api/activity")
+@router.post("/api/activity")
 def add_activity(
     activity_data: ActivityCreate,
     current_user: UserOut = Depends(get_current_user),
@@ -414,33 +451,19 @@ def add_activity(
             return {"message": "Activity updated", "activity_id": updated_activity.id}
         return {"message": "Activity created", "activity_id": new_activity.id}
 
-@app.get("/api/activity", response_model=ActivitiesResponse)
+@router.get("/api/activity", response_model=ActivitiesResponse)
 def get_activities(
     limit: int = 100,
     offset: int = 0,
+    tag: Optional[str] = None,
     current_user: UserOut = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get user's activities with pagination"""
-    activities = get_user_activities(db, current_user.id, limit, offset)
-    
-    # Convert topic_tags from JSON string back to list
-    activity_responses = []
-    for activity in activities:
-        topic_tags = json.loads(activity.topic_tags) if activity.topic_tags else None
-        activity_responses.append(ActivityResponse(
-            id=activity.id,
-            problem_name=activity.problem_name,
-            problem_url=activity.problem_url,
-            difficulty=activity.difficulty,
-            topic_tags=topic_tags,
-            status=activity.status,
-            completed_at=activity.completed_at
-        ))
-    
-    return ActivitiesResponse(activities=activity_responses)
-
-@app.get("/api/activity/stats")
+    """Get user's activities with pagination, optionally filtered by topic tag"""
+    activities = get_user_activity_rows(db, current_user.id, limit, offset, tag)
+    return model_response(ActivitiesResponse, {"activities": activities})
+
+@router.get("/api/activity/stats")
 def get_activity_statistics(
     current_user: UserOut = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -449,30 +472,85 @@ def get_activity_statistics(
     stats = get_activity_stats(db, current_user.id)
     return stats
 
-@app.get("/api/activity/{activity_id}", response_model=ActivityResponse)
+@router.get("/api/activity/timeseries", response_model=ActivityTimeseriesResponse)
+def get_activity_timeseries_endpoint(
+    bucket: Literal["day", "week"] = "day",
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    current_user: UserOut = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get user's activity counts per day or week, defaulting to the last year"""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=364)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+    points = get_activity_timeseries(db, current_user.id, bucket, start, end)
+    return {"bucket": bucket, "start": start, "end": end, "points": points}
+
+@router.get("/api/activity/tags", response_model=ActivityTagsResponse)
+def get_activity_tags(
+    current_user: UserOut = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get user's solved counts per topic tag"""
+    return {"tags": get_activity_tag_counts(db, current_user.id)}
+
+@router.get("/api/activity/export")
+def export_activities(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: UserOut = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream all of the user's activities as NDJSON or CSV"""
+    rows = iter_activity_export_rows(db, current_user.id)
+    if format == "csv":
+        body, media_type = csv_chunks(rows), "text/csv"
+    else:
+        body, media_type = ndjson_chunks(rows), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="leetguard-activities.{format}"'},
+    )
+
+@router.post("/api/activity/import", response_model=ActivityImportResponse)
+def import_activities_endpoint(
+    file: UploadFile = File(...),
+    format: Optional[Literal["ndjson", "csv"]] = None,
+    current_user: UserOut = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Bulk import activities from an NDJSON or CSV upload (same columns as the export)"""
+    if file.size is not None and file.size > settings.ACTIVITY_IMPORT_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload is larger than {settings.ACTIVITY_IMPORT_MAX_BYTES} bytes",
+        )
+    if format is None:
+        format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+    try:
+        return import_activities(db, current_user.id, file.file, format)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.get("/api/activity/{activity_id}", response_model=ActivityResponse)
 def get_activity_by_id(
     activity_id: int,
     current_user: UserOut = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get a specific activity by ID"""
-    activity = get_activity(db, activity_id, current_user.id)
+    activity = get_activity_row(db, activity_id, current_user.id)
     
     if not activity:
         raise HTTPException(status_code=404, detail="Activity not found")
     
-    topic_tags = json.loads(activity.topic_tags) if activity.topic_tags else None
-    return ActivityResponse(
-        id=activity.id,
-        problem_name=activity.problem_name,
-        problem_url=activity.problem_url,
-        difficulty=activity.difficulty,
-        topic_tags=topic_tags,
-        status=activity.status,
-        completed_at=activity.completed_at
-    )
+    return model_response(ActivityResponse, activity)
 
-@app.put("/api/activity/{activity_id}", response_model=ActivityResponse)
+@router.put("/api/activity/{activity_id}", response_model=ActivityResponse)
 def update_activity_by_id(
     activity_id: int,
     activity_data: ActivityUpdate,
@@ -488,18 +566,9 @@ def update_activity_by_id(
     if not updated_activity:
         raise HTTPException(status_code=404, detail="Activity not found")
     
-    topic_tags = json.loads(updated_activity.topic_tags) if updated_activity.topic_tags else None
-    return ActivityResponse(
-        id=updated_activity.id,
-        problem_name=updated_activity.problem_name,
-        problem_url=updated_activity.problem_url,
-        difficulty=updated_activity.difficulty,
-        topic_tags=topic_tags,
-        status=updated_activity.status,
-        completed_at=updated_activity.completed_at
-    )
+    return model_response(ActivityResponse, updated_activity)
 
-@app.delete("/api/activity/{activity_id}")
+@router.delete("/api/activity/{activity_id}")
 def delete_activity_by_id(
     activity_id: int,
     current_user: UserOut = Depends(get_current_user),
@@ -514,7 +583,7 @@ def delete_activity_by_id(
     return {"message": "Activity deleted successfully"}
 
 # Goal-related endpoints
-@app.get("/api/me/goal", response_model=GoalResponse)
+@router.get("/api/me/goal", response_model=GoalResponse)
 def get_user_goal_endpoint(
     current_user: UserOut = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -525,7 +594,7 @@ def get_user_goal_endpoint(
         raise HTTPException(status_code=404, detail="User not found")
     return goal_data
 
-@app.patch("/api/me/goal", response_model=GoalResponse)
+@router.patch("/api/me/goal", response_model=GoalResponse)
 def update_user_goal_endpoint(
     goal_update: GoalUpdate,
     current_user: UserOut = Depends(get_current_user),
@@ -537,7 +606,7 @@ def update_user_goal_endpoint(
         raise HTTPException(status_code=404, detail="User not found")
     return goal_data
 
-@app.post("/api/me/goal/progress", response_model=GoalResponse)
+@router.post("/api/me/goal/progress", response_model=GoalResponse)
 def increment_progress_endpoint(
     progress_data: ProgressIncrement,
     current_user: UserOut = Depends(get_current_user),
@@ -549,9 +618,21 @@ def increment_progress_endpoint(
         raise HTTPException(status_code=404, detail="User not found")
     return goal_data
 
-@app.post("/auth/oauth/github")
+@router.get("/api/me/streak", response_model=StreakResponse)
+def get_user_streak_endpoint(
+    current_user: UserOut = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get user's current and longest daily goal streak"""
+    streak_data = get_user_streak(db, current_user.id)
+    if not streak_data:
+        raise HTTPException(status_code=404, detail="User not found")
+    return streak_data
+
+@router.post("/auth/oauth/github")
 async def github_oauth_login(oauth_data: OAuthLoginRequest, db: Session = Depends(get_db)):
     """Handle GitHub OAuth login"""
+    from app.utils.oauth import exchange_github_code, get_github_user_info
     # Exchange code for access token
     access_token = await exchange_github_code(oauth_data.code, oauth_data.redirect_uri)
     if not access_token:
@@ -575,7 +656,7 @@ async def github_oauth_login(oauth_data: OAuthLoginRequest, db: Session = Depend
     
     # Generate JWT tokens
     jwt_access_token = jwt_utils.create_access_token(data={"sub": str(db_user.id)})
-    jwt_refresh_token = jwt_utils.create_refresh_token(data={"sub": str(db_user.id)})
+    jwt_refresh_token = issue_refresh_token(db, db_user.id)
     
     return {
         "access_token": jwt_access_token,
@@ -588,3 +669,58 @@ async def github_oauth_login(oauth_data: OAuthLoginRequest, db: Session = Depend
             picture=user_info.get("avatar_url")
         )
     }
+
+
+def create_app() -> FastAPI:
+    """Build the API: middleware, startup checks and every route.
+
+    Email (Resend) and OAuth (httpx) support is imported on first use rather
+    than here, so workers boot without loading provider SDKs they may never need.
+    """
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000", "https://leetguard.com"],  # Frontend URLs
+        allow_credentials=True,
+        allow_methods=["*"],  # Allow all methods
+        allow_headers=["*"],  # Allow all headers
+    )
+
+    # Compress JSON/NDJSON/CSV responses, including streamed exports
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.GZIP_COMPRESSION_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+    )
+
+    # SQL statement count and DB time per request (Server-Timing header with QUERY_DEBUG_ENABLED)
+    app.add_middleware(
+        QueryStatsMiddleware,
+        server_timing=settings.QUERY_DEBUG_ENABLED,
+        repeat_warning_threshold=settings.QUERY_REPEAT_WARNING_THRESHOLD,
+    )
+
+    # Per-route request counts and latency, exposed at /metrics
+    app.add_middleware(MetricsMiddleware)
+
+    # FastAPI's native telemetry emits request spans (continuing the extension's traceparent)
+    # to the global provider; nothing is exported unless OTEL_TRACES_EXPORTER is set
+    configure_tracing(settings.OTEL_TRACES_EXPORTER, settings.OTEL_SERVICE_NAME)
+
+    # Parse signing keys now so a bad JWT_PRIVATE_KEY_PATH fails at startup, not on first login
+    get_key_ring()
+    # Likewise for malformed RATE_LIMIT_* settings
+    get_rate_limiter()
+
+    # Admin-only X-Profile request profiling; not installed at all unless enabled
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+
+    app.include_router(router)
+    return app
+
+
+app = create_app()
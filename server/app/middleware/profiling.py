@@ -0,0 +1,73 @@
+"""
+Profile a single request flagged with `X-Profile: speedscope|collapsed`.
+
+Only installed when PROFILING_ENABLED is set, and the header is ignored
+unless the bearer token belongs to an admin (ADMIN_EMAILS). The handler
+runs normally, but the response body is replaced by the profile; the
+handler's own status code is returned in `X-Profiled-Status`. Samples cover
+the whole worker for the request's duration, so profile on a quiet worker.
+"""
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.crud.user import get_user_by_id
+from app.db.session import SessionLocal
+from app.dependencies import is_admin, is_token_revoked
+from app.utils.jwt import decode_access_token
+from app.utils.profiler import ProfilerBusy, SamplingProfiler
+
+PROFILE_HEADER = "x-profile"
+
+
+def _is_admin_token(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    payload = decode_access_token(token)
+    if not payload or not str(payload.get("sub", "")).isdigit():
+        return False
+    db = SessionLocal()
+    try:
+        user = get_user_by_id(db, int(payload["sub"]))
+        return user is not None and user.is_verified and not is_token_revoked(user, payload) and is_admin(user)
+    finally:
+        db.close()
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, interval: float = 0.001):
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        output = headers.get(PROFILE_HEADER)
+        if not output or not await run_in_threadpool(_is_admin_token, headers.get("authorization", "")):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def discard_body(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        try:
+            with SamplingProfiler(self.interval) as profiler:
+                await self.app(scope, receive, discard_body)
+        except ProfilerBusy as exc:
+            await JSONResponse({"detail": str(exc)}, status_code=409)(scope, receive, send)
+            return
+
+        profiled = {"X-Profiled-Status": str(status_code)}
+        if output.lower() == "collapsed":
+            response = PlainTextResponse(profiler.collapsed(), headers=profiled)
+        else:
+            response = JSONResponse(profiler.speedscope(name=f"{scope['method']} {scope['path']}"), headers=profiled)
+        await response(scope, receive, send)
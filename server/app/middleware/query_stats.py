@@ -0,0 +1,50 @@
+"""
+Attributes SQL statement counts and DB time to each request.
+
+In debug mode the totals are sent as a `Server-Timing` header (visible in
+browser devtools and used by the query-budget test helper); in every mode
+they feed per-route Prometheus histograms, and a statement repeated more
+than QUERY_REPEAT_WARNING_THRESHOLD times in one request is logged as a
+likely N+1.
+"""
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.query_stats import track_queries
+from app.middleware.metrics import route_template
+from app.utils.metrics import REQUEST_DB_DURATION, REQUEST_DB_QUERIES
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp, server_timing: bool = False, repeat_warning_threshold: int = 10):
+        self.app = app
+        self.server_timing = server_timing
+        self.repeat_warning_threshold = repeat_warning_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_wrapper(message: Message):
+                if message["type"] == "http.response.start" and self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                REQUEST_DB_QUERIES.labels(route=route).observe(stats.count)
+                REQUEST_DB_DURATION.labels(route=route).observe(stats.duration)
+                repeated = stats.most_repeated()
+                if repeated and repeated[1] > self.repeat_warning_threshold:
+                    logger.warning(
+                        "Possible N+1 on %s %s: statement ran %d times: %s",
+                        scope["method"], route, repeated[1], " ".join(repeated[0].split())[:300],
+                    )
@@ -1,16 +1,32 @@
 import logging
 from typing import Optional
-import resend
-from resend.exceptions import ResendError
 from fastapi import HTTPException, status
 from app.config import settings
+from app.utils.metrics import track_email
+from app.utils.tracing import client_span
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Initialize Resend client
-resend.api_key = settings.RESEND_API_KEY
-
+# Resend client, imported and configured on the first send (the SDK pulls in requests and httpx)
+resend = None
+
+def _resend_client():
+    global resend
+    if resend is None:
+        if not settings.RESEND_API_KEY:
+            raise RuntimeError("RESEND_API_KEY is not set; emails are disabled")
+        import resend as resend_sdk
+        resend_sdk.api_key = settings.RESEND_API_KEY
+        resend = resend_sdk
+    return resend
+
+def _send_email(kind: str, payload: dict):
+    """Send through Resend inside a client span so provider latency shows up in traces"""
+    with client_span("resend.emails.send", **{"email.kind": kind}):
+        return _resend_client().Emails.send(payload)
+
+@track_email("verification")
 def send_verification_email(recipient_email: str, code: str) -> bool:
     """
     Send verification email using Resend.
@@ -84,7 +100,7 @@ def send_verification_email(recipient_email: str, code: str) -> bool:
         """
 
         # Send email via Resend
-        response = resend.Emails.send({
+        response = _send_email("verification", {
             "from": settings.FROM_EMAIL,
             "to": [recipient_email],
             "subject": "Verify Your Email - LeetGuard",
@@ -95,17 +111,14 @@ def send_verification_email(recipient_email: str, code: str) -> bool:
         logger.info(f"Verification email sent successfully to {recipient_email}")
         return True
 
-    except ResendError as e:
-        logger.error(f"Resend API error sending verification email to {recipient_email}: {str(e)}")
-        logger.error(f"Error type: {type(e)}")
-        logger.error(f"Error details: {e}")
-        return False
     except Exception as e:
-        logger.error(f"Unexpected error sending verification email to {recipient_email}: {str(e)}")
+        # ResendError included; the logged type tells API errors apart from anything else
+        logger.error(f"Error sending verification email to {recipient_email}: {str(e)}")
         logger.error(f"Error type: {type(e)}")
         logger.error(f"Error details: {e}")
         return False
 
+@track_email("password_reset")
 def send_password_reset_email(recipient_email: str, reset_token: str, reset_url: str) -> bool:
     """
     Send password reset email using Resend.
@@ -176,7 +189,7 @@ def send_password_reset_email(recipient_email: str, reset_token: str, reset_url:
         """
 
         # Send email via Resend
-        response = resend.Emails.send({
+        response = _send_email("password_reset", {
             "from": settings.FROM_EMAIL,
             "to": [recipient_email],
             "subject": "Reset Your Password - LeetGuard",
@@ -191,6 +204,7 @@ def send_password_reset_email(recipient_email: str, reset_token: str, reset_url:
         logger.error(f"Failed to send password reset email to {recipient_email}: {str(e)}")
         return False
 
+@track_email("welcome")
 def send_welcome_email(recipient_email: str, username: str) -> bool:
     """
     Send welcome email to newly verified users.
@@ -272,7 +286,7 @@ def send_welcome_email(recipient_email: str, username: str) -> bool:
         """
 
         # Send email via Resend
-        response = resend.Emails.send({
+        response = _send_email("welcome", {
             "from": settings.FROM_EMAIL,
             "to": [recipient_email],
             "subject": "Welcome to LeetGuard!",
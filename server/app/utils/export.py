@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+EXPORT_FIELDS = (
+    "id",
+    "problem_name",
+    "problem_url",
+    "difficulty",
+    "topic_tags",
+    "status",
+    "completed_at",
+)
+
+# Rows are buffered into chunks so each socket write carries many rows
+ROWS_PER_CHUNK = 500
+
+
+def _row_values(row) -> dict:
+    values = dict(zip(EXPORT_FIELDS, (getattr(row, field) for field in EXPORT_FIELDS)))
+    completed_at = values["completed_at"]
+    values["completed_at"] = completed_at.isoformat() if completed_at else None
+    return values
+
+
+def ndjson_chunks(rows: Iterable) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON, one object per line"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(_row_values(row), ensure_ascii=False))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def csv_chunks(rows: Iterable) -> Iterator[bytes]:
+    """Encode rows as CSV with a header line; tags are joined with '|'"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    count = 0
+    for row in rows:
+        values = _row_values(row)
+        values["topic_tags"] = "|".join(values["topic_tags"] or [])
+        writer.writerow(values[field] for field in EXPORT_FIELDS)
+        count += 1
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -3,13 +3,19 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import uuid4
 from app.config import settings
+from app.utils.key_ring import get_key_ring
 
+# Refresh tokens are only ever verified by this API, so they stay symmetric
 ALGORITHM = "HS256"
 
 ACCESS_TOKEN_USE = "access"
 REFRESH_TOKEN_USE = "refresh"
 
-def _create_token(data: dict, token_use: str, secret_key: str, expires_delta: timedelta):
+# Epoch milliseconds; `iat` only has whole seconds, too coarse to order a token against a revocation
+def timestamp_ms(moment: datetime) -> int:
+    return int(moment.timestamp()) * 1000 + moment.microsecond // 1000
+
+def _claims(data: dict, token_use: str, expires_delta: timedelta):
     now = datetime.now(timezone.utc)
     to_encode = data.copy()
     to_encode.update({
@@ -17,27 +23,30 @@ def _create_token(data: dict, token_use: str, secret_key: str, expires_delta: ti
         "iss": settings.JWT_ISSUER,
         "aud": settings.JWT_AUDIENCE,
         "iat": now,
+        "iat_ms": timestamp_ms(now),
         "exp": now + expires_delta,
-        "jti": str(uuid4()),
     })
-    return jwt.encode(to_encode, secret_key, algorithm=ALGORITHM)
+    # Callers that track tokens server-side choose the jti themselves
+    to_encode.setdefault("jti", str(uuid4()))
+    return to_encode
 
 # Creates a JWT access token for a user. Used after successful login to authenticate future requests.
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    return _create_token(
+    claims = _claims(
         data=data,
         token_use=ACCESS_TOKEN_USE,
-        secret_key=settings.SECRET_KEY,
         expires_delta=expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
     )
+    return get_key_ring().sign(claims)
 
 # Decodes and verifies a JWT access token. Returns the payload if valid, otherwise None.
 def decode_access_token(token: str):
     try:
+        key, algorithm = get_key_ring().verification_key(token)
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[ALGORITHM],
+            key,
+            algorithms=[algorithm],
             audience=settings.JWT_AUDIENCE,
             issuer=settings.JWT_ISSUER,
         )
@@ -49,12 +58,12 @@ def decode_access_token(token: str):
 
 # Creates a JWT refresh token for a user. Used to obtain new access tokens without re-authenticating.
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None):
-    return _create_token(
+    claims = _claims(
         data=data,
         token_use=REFRESH_TOKEN_USE,
-        secret_key=settings.REFRESH_SECRET_KEY,
         expires_delta=expires_delta or timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
     )
+    return jwt.encode(claims, settings.REFRESH_SECRET_KEY, algorithm=ALGORITHM)
 
 # Decodes and verifies a JWT refresh token. Returns the payload if valid, otherwise None.
 def decode_refresh_token(token: str):
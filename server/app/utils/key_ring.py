@@ -0,0 +1,119 @@
+"""
+Access token signing keys.
+
+With JWT_PRIVATE_KEY_PATH set, access tokens are signed with that Ed25519
+(EdDSA) or P-256 (ES256) key and carry its `kid`, the RFC 7638 thumbprint of
+the public key. Every public key in the ring is published at
+/.well-known/jwks.json, so edge proxies and other services can verify
+tokens without holding a secret. Keys listed in JWT_VERIFICATION_KEY_PATHS
+are published and accepted but never sign: retired keys until their tokens
+expire, or the next key, published ahead of a rotation.
+
+PEM files are parsed once when the ring is built; verification reuses the
+loaded key objects. Without a private key, access tokens stay HS256 with
+SECRET_KEY, exactly as before.
+"""
+import base64
+import hashlib
+import json
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+from app.config import settings
+
+LEGACY_ALGORITHM = "HS256"
+
+
+class SigningKey:
+    __slots__ = ("kid", "algorithm", "private_key", "public_key", "public_jwk")
+
+    def __init__(self, private_key, public_key):
+        self.private_key = private_key
+        self.public_key = public_key
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            self.algorithm = "EdDSA"
+            jwk = OKPAlgorithm.to_jwk(public_key, as_dict=True)
+        elif isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(public_key.curve, ec.SECP256R1):
+            self.algorithm = "ES256"
+            jwk = ECAlgorithm.to_jwk(public_key, as_dict=True)
+        else:
+            raise ValueError("JWT keys must be Ed25519 or EC P-256")
+        self.kid = jwk_thumbprint(jwk)
+        self.public_jwk = {**jwk, "kid": self.kid, "alg": self.algorithm, "use": "sig"}
+
+
+def jwk_thumbprint(jwk: dict) -> str:
+    """RFC 7638 thumbprint: SHA-256 of the required members in canonical JSON"""
+    required = ("crv", "kty", "x", "y") if jwk["kty"] == "EC" else ("crv", "kty", "x")
+    canonical = json.dumps({name: jwk[name] for name in required}, separators=(",", ":"), sort_keys=True)
+    digest = hashlib.sha256(canonical.encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def load_key(path: str) -> SigningKey:
+    """Load a PEM private key (can sign) or public key (verify only)"""
+    with open(path, "rb") as handle:
+        pem = handle.read()
+    if b"PRIVATE KEY" in pem:
+        private_key = load_pem_private_key(pem, password=None)
+        return SigningKey(private_key, private_key.public_key())
+    return SigningKey(None, load_pem_public_key(pem))
+
+
+class KeyRing:
+    def __init__(self, active: Optional[SigningKey], keys: Iterable[SigningKey] = (), legacy_secret: Optional[str] = None):
+        if active is not None and active.private_key is None:
+            raise ValueError("The active JWT key must be a private key")
+        self.active = active
+        self.legacy_secret = legacy_secret
+        self._keys: Dict[str, SigningKey] = {key.kid: key for key in keys}
+        if active is not None:
+            self._keys[active.kid] = active
+        self.jwks_json = json.dumps({"keys": [key.public_jwk for key in self._keys.values()]}).encode()
+
+    def sign(self, claims: dict) -> str:
+        if self.active is None:
+            return jwt.encode(claims, self.legacy_secret, algorithm=LEGACY_ALGORITHM)
+        return jwt.encode(claims, self.active.private_key, algorithm=self.active.algorithm, headers={"kid": self.active.kid})
+
+    def verification_key(self, token: str) -> Tuple[object, str]:
+        """The key and sole accepted algorithm for a token, chosen by its `kid` header"""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid is None:
+            if self.legacy_secret is None:
+                raise jwt.InvalidTokenError("Token has no key id")
+            return self.legacy_secret, LEGACY_ALGORITHM
+        key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError("Unknown key id")
+        return key.public_key, key.algorithm
+
+
+def build_key_ring(
+    private_key_path: Optional[str],
+    verification_key_paths: Iterable[str],
+    secret_key: str,
+    accept_hs256: bool = True,
+) -> KeyRing:
+    if not private_key_path:
+        return KeyRing(None, legacy_secret=secret_key)
+    return KeyRing(
+        load_key(private_key_path),
+        [load_key(path) for path in verification_key_paths],
+        legacy_secret=secret_key if accept_hs256 else None,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_key_ring() -> KeyRing:
+    return build_key_ring(
+        settings.JWT_PRIVATE_KEY_PATH,
+        settings.JWT_VERIFICATION_KEY_PATHS,
+        settings.SECRET_KEY,
+        settings.JWT_ACCEPT_HS256,
+    )
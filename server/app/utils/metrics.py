@@ -0,0 +1,141 @@
+"""
+Prometheus metrics.
+
+Metrics are module-level so every part of the app records into the same
+registry. When PROMETHEUS_MULTIPROC_DIR is set (one directory shared by all
+uvicorn/gunicorn workers, emptied before startup), samples are written to
+files there and `/metrics` aggregates them across processes.
+"""
+import os
+from functools import wraps
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Tuned for API latencies: most handlers are single-digit milliseconds,
+# exports and imports can take seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template, method and status code",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and method",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served (the route is unknown until routing)",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request by route template",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in SQL statements per request by route template",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+EMAIL_SENDS = Counter(
+    "email_sends_total",
+    "Transactional emails by kind and outcome",
+    ["kind", "outcome"],
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Auth requests rejected by a rate limit bucket, by scope and key type",
+    ["scope", "key"],
+)
+
+
+class DatabasePoolCollector:
+    """Reports SQLAlchemy connection pool usage at scrape time"""
+
+    def collect(self):
+        from app.db.session import engine
+
+        pool = engine.pool
+        pid = str(os.getpid())
+        for name, documentation, value in (
+            ("db_pool_size", "Configured pool size", pool.size()),
+            ("db_pool_checked_out", "Connections currently checked out", pool.checkedout()),
+            ("db_pool_checked_in", "Idle connections in the pool", pool.checkedin()),
+            ("db_pool_overflow", "Connections open beyond the pool size", pool.overflow()),
+        ):
+            family = GaugeMetricFamily(name, documentation, labels=["pid"])
+            family.add_metric([pid], value)
+            yield family
+
+
+class NormalizationCacheCollector:
+    """Reports the memoized URL/domain normalizers' cache effectiveness at scrape time"""
+
+    def collect(self):
+        from app.utils.normalization import normalization_cache_stats
+
+        pid = str(os.getpid())
+        hits = CounterMetricFamily("normalization_cache_hits", "Normalization cache hits", labels=["function", "pid"])
+        misses = CounterMetricFamily("normalization_cache_misses", "Normalization cache misses", labels=["function", "pid"])
+        size = GaugeMetricFamily("normalization_cache_size", "Entries in the normalization cache", labels=["function", "pid"])
+        for function, stats in normalization_cache_stats().items():
+            hits.add_metric([function, pid], stats["hits"])
+            misses.add_metric([function, pid], stats["misses"])
+            size.add_metric([function, pid], stats["size"])
+        yield hits
+        yield misses
+        yield size
+
+
+# Per-process state read at scrape time rather than recorded as samples
+_process_collectors = (DatabasePoolCollector(), NormalizationCacheCollector())
+for _collector in _process_collectors:
+    REGISTRY.register(_collector)
+
+
+def track_email(kind: str):
+    """Count sent/failed outcomes of a send_*_email function returning a bool"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            sent = func(*args, **kwargs)
+            EMAIL_SENDS.labels(kind=kind, outcome="sent" if sent else "failed").inc()
+            return sent
+        return wrapper
+    return decorator
+
+
+def render_metrics():
+    """Return the Prometheus text exposition body and content type"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        # Pool and cache stats are per process; only the scraped worker's are reported
+        for collector in _process_collectors:
+            registry.register(collector)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int):
+    """Clean up a dead worker's live gauges (call from gunicorn's child_exit hook)"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
@@ -1,6 +1,25 @@
+"""
+Input normalization for websites, problem URLs and activity statuses.
+
+The URL helpers are pure and called several times per request with the
+same input (the handler normalizes, then the CRUD layer normalizes again),
+so they are memoized in bounded LRU caches. Canonical LeetCode problem
+URLs, by far the most common input, skip `urlparse` entirely.
+"""
+import re
+from functools import lru_cache
 from urllib.parse import urlparse, urlunparse
 
 
+LEETCODE_PROBLEM_PREFIX = "https://leetcode.com/problems/"
+NORMALIZATION_CACHE_SIZE = 4096
+
+# https://leetcode.com/problems/<slug>[/...]; anything unusual (ports,
+# credentials, odd characters) falls through to the urlparse path
+_LEETCODE_PROBLEM_URL = re.compile(
+    r"(?i:https?://)?(?i:www\.)?(?i:leetcode\.com)/problems/([A-Za-z0-9_-]+)(?:[/?#]|$)"
+)
+
 CANONICAL_ACTIVITY_STATUSES = {"solved", "attempted", "bookmarked"}
 LEGACY_ACTIVITY_STATUS_MAP = {
     "completed": "solved",
@@ -17,6 +36,7 @@ def normalize_activity_status(status: str) -> str:
     return value
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def normalize_website(website: str) -> str:
     value = (website or "").strip().lower()
     if not value:
@@ -33,11 +53,19 @@ def normalize_website(website: str) -> str:
     return host
 
 
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
 def normalize_problem_url(problem_url: str) -> str:
     value = (problem_url or "").strip()
     if not value:
         raise ValueError("Problem URL is required")
 
+    match = _LEETCODE_PROBLEM_URL.match(value)
+    if match:
+        return f"{LEETCODE_PROBLEM_PREFIX}{match.group(1)}/"
+    return _parse_problem_url(value)
+
+
+def _parse_problem_url(value: str) -> str:
     parsed = urlparse(value)
     if not parsed.netloc:
         parsed = urlparse(f"https://{value.lstrip('/')}")
@@ -48,9 +76,42 @@ def normalize_problem_url(problem_url: str) -> str:
 
     parts = [part for part in path.split("/") if part]
     if host.endswith("leetcode.com") and len(parts) >= 2 and parts[0] == "problems":
-        return f"https://leetcode.com/problems/{parts[1]}/"
+        return f"{LEETCODE_PROBLEM_PREFIX}{parts[1]}/"
 
     netloc = host
     if parsed.port:
         netloc = f"{netloc}:{parsed.port}"
     return urlunparse((scheme, netloc, path, "", "", ""))
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def problem_slug(problem_url: str) -> str:
+    """Catalog key for a problem: the LeetCode slug, or the canonical URL for other sites."""
+    normalized = normalize_problem_url(problem_url)
+    if normalized.startswith(LEETCODE_PROBLEM_PREFIX):
+        return normalized[len(LEETCODE_PROBLEM_PREFIX):].rstrip("/")
+    return normalized
+
+
+_CACHED_FUNCTIONS = (normalize_website, normalize_problem_url, problem_slug)
+
+
+def normalization_cache_stats() -> dict:
+    """Hits, misses, size and hit rate of each memoized normalizer"""
+    stats = {}
+    for function in _CACHED_FUNCTIONS:
+        info = function.cache_info()
+        lookups = info.hits + info.misses
+        stats[function.__name__] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        }
+    return stats
+
+
+def clear_normalization_caches():
+    for function in _CACHED_FUNCTIONS:
+        function.cache_clear()
@@ -2,10 +2,26 @@ import httpx
 import json
 from typing import Optional, Dict, Any
 from app.config import settings
+from app.utils.tracing import client_span
+
+class TracedAsyncTransport(httpx.AsyncHTTPTransport):
+    """httpx transport that wraps each outgoing request in a client span"""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with client_span(
+            f"HTTP {request.method}",
+            **{"http.request.method": request.method, "server.address": request.url.host, "url.path": request.url.path},
+        ) as span:
+            response = await super().handle_async_request(request)
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=TracedAsyncTransport())
 
 async def get_google_user_info(access_token: str) -> Optional[Dict[str, Any]]:
     """Get user info from Google using access token"""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         response = await client.get(
             "https://www.googleapis.com/oauth2/v2/userinfo",
             headers={"Authorization": f"Bearer {access_token}"}
@@ -16,7 +32,7 @@ async def get_google_user_info(access_token: str) -> Optional[Dict[str, Any]]:
 
 async def get_github_user_info(access_token: str) -> Optional[Dict[str, Any]]:
     """Get user info from GitHub using access token"""
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         response = await client.get(
             "https://api.github.com/user",
             headers={
@@ -47,7 +63,7 @@ async def exchange_google_code(code: str, redirect_uri: str) -> Optional[str]:
     if not settings.GOOGLE_CLIENT_ID or not settings.GOOGLE_CLIENT_SECRET:
         raise ValueError("Google OAuth credentials not configured")
     
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         response = await client.post(
             "https://oauth2.googleapis.com/token",
             data={
@@ -68,7 +84,7 @@ async def exchange_github_code(code: str, redirect_uri: str) -> Optional[str]:
     if not settings.GITHUB_CLIENT_ID or not settings.GITHUB_CLIENT_SECRET:
         raise ValueError("GitHub OAuth credentials not configured")
     
-    async with httpx.AsyncClient() as client:
+    async with _client() as client:
         response = await client.post(
             "https://github.com/login/oauth/access_token",
             data={
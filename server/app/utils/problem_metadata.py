@@ -0,0 +1,127 @@
+"""
+Offline LeetCode problem metadata, used to fill in fields the extension
+couldn't scrape. The snapshot is loaded once into a slug -> metadata dict,
+so enrichment on the request path is a dictionary lookup with no network I/O.
+
+The committed snapshot is a small seed for tests and offline development;
+deploys regenerate the full one with `python -m app.jobs.refresh_problem_metadata`.
+Running workers notice the rewritten file by its mtime, checked at most every
+RELOAD_CHECK_SECONDS, and reload it without a restart.
+"""
+import csv
+import json
+import logging
+import os
+import tempfile
+import time
+from threading import Lock
+from typing import Dict, Iterable, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Placeholder difficulty sent by the extension when it couldn't scrape one
+UNKNOWN_DIFFICULTY = "Unknown"
+
+# How often lookups stat the snapshot to see whether the refresh job replaced it
+RELOAD_CHECK_SECONDS = 30
+
+_index: Optional[Dict[str, dict]] = None
+_index_mtime: Optional[int] = None
+_next_check = 0.0
+_index_lock = Lock()
+
+
+def _parse_tags(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(tag) for tag in value if tag]
+    # CSV snapshots store tags as "Array|Hash Table"
+    return [tag.strip() for tag in str(value).split("|") if tag.strip()]
+
+
+def _clean_record(record: dict) -> Optional[dict]:
+    slug = (record.get("slug") or "").strip()
+    if not slug:
+        return None
+    return {
+        "slug": slug,
+        "name": (record.get("name") or "").strip(),
+        "difficulty": (record.get("difficulty") or "").strip().title(),
+        "topic_tags": _parse_tags(record.get("topic_tags")),
+    }
+
+
+def read_snapshot(path: str) -> List[dict]:
+    """Read a JSON array or CSV (slug,name,difficulty,topic_tags) snapshot"""
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.lower().endswith(".csv"):
+            records: Iterable[dict] = csv.DictReader(handle)
+        else:
+            records = json.load(handle)
+        return [cleaned for cleaned in map(_clean_record, records) if cleaned]
+
+
+def write_snapshot(path: str, records: Iterable[dict]):
+    """Write records as a JSON array, one problem per line, sorted by slug.
+
+    The file is replaced atomically so workers reloading it never read a
+    partial snapshot.
+    """
+    rows = sorted(
+        (cleaned for cleaned in map(_clean_record, records) if cleaned),
+        key=lambda row: row["slug"],
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as handle:
+        handle.write("[\n")
+        handle.write(",\n".join(f"  {json.dumps(row, ensure_ascii=False)}" for row in rows))
+        handle.write("\n]\n")
+    # NamedTemporaryFile creates the file owner-only; keep the snapshot world-readable
+    os.chmod(handle.name, 0o644)
+    os.replace(handle.name, path)
+
+
+def _load_index(now: float) -> Dict[str, dict]:
+    """(Re)read the snapshot if it changed on disk; a broken file keeps the previous index"""
+    global _index, _index_mtime, _next_check
+    with _index_lock:
+        if _index is not None and now < _next_check:
+            return _index
+        _next_check = now + RELOAD_CHECK_SECONDS
+        path = settings.PROBLEM_METADATA_PATH
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            if _index is None or mtime != _index_mtime:
+                _index = {row["slug"]: row for row in read_snapshot(path)}
+                _index_mtime = mtime
+        except (OSError, ValueError) as exc:
+            logger.warning("Problem metadata snapshot unavailable at %s: %s", path, exc)
+            if _index is None:
+                _index = {}
+        return _index
+
+
+def get_problem_metadata(slug: str) -> Optional[dict]:
+    index = _index
+    now = time.monotonic()
+    if index is None or now >= _next_check:
+        index = _load_index(now)
+    return index.get(slug)
+
+
+def enrich_problem_fields(slug: str, name: Optional[str], difficulty: Optional[str], topic_tags: Optional[List[str]]):
+    """Fill blank/"Unknown" fields from the snapshot; scraped values always win"""
+    metadata = get_problem_metadata(slug)
+    if metadata is None:
+        return name, difficulty, topic_tags
+
+    if not name and metadata["name"]:
+        name = metadata["name"]
+    if (not difficulty or difficulty == UNKNOWN_DIFFICULTY) and metadata["difficulty"]:
+        difficulty = metadata["difficulty"]
+    if not topic_tags and metadata["topic_tags"]:
+        topic_tags = list(metadata["topic_tags"])
+    return name, difficulty, topic_tags
@@ -0,0 +1,200 @@
+"""
+Token bucket rate limits for the unauthenticated auth endpoints.
+
+Each scope (login, signup, verify, resend) has one bucket per client IP and
+one per email. A request takes a token from both; if either is empty it is
+rejected with 429 and Retry-After before the handler loads a user or runs
+bcrypt, so a flood of password or verification code guesses cannot burn
+CPU. Limits are "<requests>/<seconds>": a bucket holds that many tokens and
+refills continuously, allowing short bursts but not a sustained rate.
+
+The memory backend keeps buckets per worker process, so with N workers a
+client gets up to N times the limit. RATE_LIMIT_BACKEND=postgres shares
+buckets across workers and hosts through an UNLOGGED table, at the cost of
+one upsert per bucket.
+"""
+import math
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.auth.models.user import RateLimitBucket
+from app.config import settings
+from app.utils.metrics import RATE_LIMIT_REJECTIONS
+
+MEMORY_BUCKET_LIMIT = 100000
+PURGE_EVERY_HITS = 1000
+MAX_KEY_VALUE_LENGTH = 320
+
+
+class Rate(NamedTuple):
+    limit: int
+    period: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.limit / self.period
+
+
+def parse_rate(value: Optional[str]) -> Optional[Rate]:
+    """Parse "<requests>/<seconds>"; an empty value means no limit"""
+    if not value or not value.strip():
+        return None
+    try:
+        limit, period = value.split("/")
+        rate = Rate(int(limit), float(period))
+    except ValueError:
+        raise ValueError(f"Invalid rate limit {value!r}, expected '<requests>/<seconds>'") from None
+    if rate.limit < 1 or rate.period <= 0:
+        raise ValueError(f"Invalid rate limit {value!r}, requests and seconds must be positive")
+    return rate
+
+
+class MemoryBackend:
+    """Buckets in this process, dropping the least recently used past `max_buckets`"""
+
+    def __init__(self, max_buckets: int = MEMORY_BUCKET_LIMIT, clock=time.monotonic):
+        self.max_buckets = max_buckets
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def hit(self, key: str, rate: Rate) -> float:
+        """Take a token; 0 if one was available, otherwise seconds until there is one"""
+        now = self._clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (rate.limit, now))
+            tokens = min(rate.limit, tokens + (now - updated_at) * rate.refill_per_second)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate.refill_per_second
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class PostgresBackend:
+    """Buckets in rate_limit_buckets; refill and take happen in one atomic upsert"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._hits = 0
+        self._longest_period = 0.0
+
+    def hit(self, key: str, rate: Rate) -> float:
+        table = RateLimitBucket.__table__
+        refill = rate.refill_per_second
+        available = func.least(
+            rate.limit,
+            table.c.tokens + func.extract("epoch", func.now() - table.c.updated_at) * refill,
+        )
+        take = (
+            insert(table)
+            .values(key=key, tokens=rate.limit - 1, updated_at=func.now())
+            .on_conflict_do_update(
+                index_elements=[table.c.key],
+                set_={"tokens": available - 1, "updated_at": func.now()},
+                where=available >= 1,
+            )
+            .returning(table.c.tokens)
+        )
+        with self.engine.begin() as connection:
+            if connection.execute(take).first() is not None:
+                wait = 0.0
+            else:
+                wait = connection.execute(select((1 - available) / refill).where(table.c.key == key)).scalar() or 0.0
+
+        # Approximate across threads, which is fine for deciding when to sweep
+        self._longest_period = max(self._longest_period, rate.period)
+        self._hits += 1
+        if self._hits % PURGE_EVERY_HITS == 0:
+            self.purge_idle(self._longest_period)
+        return max(float(wait), 0.0)
+
+    def purge_idle(self, idle_seconds: float) -> int:
+        """Delete buckets idle long enough to have refilled; a missing bucket counts as full"""
+        table = RateLimitBucket.__table__
+        with self.engine.begin() as connection:
+            return connection.execute(
+                delete(table).where(table.c.updated_at < func.now() - timedelta(seconds=idle_seconds))
+            ).rowcount
+
+    def reset(self):
+        with self.engine.begin() as connection:
+            connection.execute(delete(RateLimitBucket.__table__))
+
+
+class RateLimiter:
+    def __init__(self, backend, rules: Dict[str, Tuple[Optional[Rate], Optional[Rate]]]):
+        self.backend = backend
+        self.rules = rules
+
+    def check(self, scope: str, ip: str, email: Optional[str] = None) -> float:
+        """Take a token from the scope's IP and email buckets; the longest wait, 0 if allowed"""
+        ip_rate, email_rate = self.rules.get(scope, (None, None))
+        if email is not None:
+            email = email.strip().lower()
+        wait = 0.0
+        for kind, value, rate in (("ip", ip, ip_rate), ("email", email, email_rate)):
+            if rate is None or not value:
+                continue
+            key_wait = self.backend.hit(f"{scope}:{kind}:{value[:MAX_KEY_VALUE_LENGTH]}", rate)
+            if key_wait:
+                RATE_LIMIT_REJECTIONS.labels(scope=scope, key=kind).inc()
+                wait = max(wait, key_wait)
+        return wait
+
+    def reset(self):
+        if self.backend is not None:
+            self.backend.reset()
+
+
+def build_rate_limiter(backend_name: str) -> RateLimiter:
+    if backend_name == "none":
+        return RateLimiter(None, {})
+    if backend_name == "memory":
+        backend = MemoryBackend()
+    elif backend_name == "postgres":
+        from app.db.session import engine
+
+        backend = PostgresBackend(engine)
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND {backend_name!r}, expected memory, postgres or none")
+    return RateLimiter(backend, {
+        "login": (parse_rate(settings.RATE_LIMIT_LOGIN_IP), parse_rate(settings.RATE_LIMIT_LOGIN_EMAIL)),
+        "signup": (parse_rate(settings.RATE_LIMIT_SIGNUP_IP), parse_rate(settings.RATE_LIMIT_SIGNUP_EMAIL)),
+        "verify": (parse_rate(settings.RATE_LIMIT_VERIFY_IP), parse_rate(settings.RATE_LIMIT_VERIFY_EMAIL)),
+        "resend": (parse_rate(settings.RATE_LIMIT_RESEND_IP), parse_rate(settings.RATE_LIMIT_RESEND_EMAIL)),
+    })
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter() -> RateLimiter:
+    return build_rate_limiter(settings.RATE_LIMIT_BACKEND)
+
+
+def enforce_rate_limit(request: Request, scope: str, email: Optional[str] = None):
+    """Raise 429 with Retry-After when the client IP or email is over the scope's limit"""
+    ip = request.client.host if request.client else "unknown"
+    wait = get_rate_limiter().check(scope, ip, email)
+    if wait:
+        retry_after = max(1, math.ceil(wait))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many attempts. Try again in {retry_after} seconds.",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,36 @@
+"""
+JSON response helpers.
+
+`ORJSONResponse` is the app's default response class, so dict-returning
+handlers are encoded with orjson instead of the stdlib `json` module.
+
+`model_response` is the fast path for trusted ORM output: the data is
+validated once against the response schema straight from attributes and
+dumped by pydantic-core, and returning a `Response` means FastAPI skips its
+own `response_model` validation and encoding for that request. Keep the
+`response_model` on the route so the OpenAPI schema stays accurate.
+"""
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema) -> TypeAdapter:
+    # Building a TypeAdapter compiles a validator, so do it once per schema
+    return TypeAdapter(schema)
+
+
+def model_response(schema, data, status_code: int = 200) -> Response:
+    """Serialize ORM objects (or dicts of them) as `schema` in a single pass"""
+    adapter = _adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+    return Response(content=body, status_code=status_code, media_type="application/json")
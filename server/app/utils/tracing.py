@@ -0,0 +1,96 @@
+"""
+OpenTelemetry tracing.
+
+FastAPI's native telemetry creates the request, dependency and endpoint
+spans and continues the W3C `traceparent` sent by the extension's
+apiRequest. This module adds child spans for SQL statements, Resend and
+OAuth provider calls. Everything goes through the global tracer provider,
+which is a no-op until `configure_tracing()` installs the SDK
+(OTEL_TRACES_EXPORTER set to "console" or "otlp").
+"""
+import importlib.util
+import logging
+from contextlib import contextmanager
+from typing import Optional
+
+from opentelemetry import trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("leetguard")
+
+_MAX_STATEMENT_LENGTH = 2000
+
+
+def configure_tracing(exporter: str, service_name: str) -> bool:
+    """Install the SDK tracer provider; returns False when tracing stays disabled"""
+    exporter = (exporter or "none").lower()
+    if exporter == "none":
+        return False
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+    span_exporter = None
+    if exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+            span_exporter = OTLPSpanExporter()
+        except ImportError:
+            logger.warning("opentelemetry-exporter-otlp-proto-http is not installed; tracing to console")
+    if span_exporter is None:
+        span_exporter = ConsoleSpanExporter()
+
+    if importlib.util.find_spec("fastapi.telemetry") is None:
+        logger.warning("This FastAPI has no native telemetry (needs >= 0.142.0); no request spans will be emitted")
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    return True
+
+
+@contextmanager
+def client_span(name: str, **attributes):
+    """Span for an outgoing call (Resend, OAuth providers); exceptions mark it failed"""
+    with tracer.start_as_current_span(name, kind=SpanKind.CLIENT, attributes=attributes) as span:
+        yield span
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_span(conn, cursor, statement, parameters, context, executemany):
+    if context is None or not trace.get_current_span().is_recording():
+        return
+    context._otel_span = tracer.start_span(
+        statement.split(None, 1)[0].upper() if statement else "SQL",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": "postgresql",
+            # Parameterized SQL only; bound values never leave the process
+            "db.statement": statement[:_MAX_STATEMENT_LENGTH],
+        },
+    )
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement_span(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_otel_span", None)
+    if span is not None:
+        span.end()
+        context._otel_span = None
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_statement_span(exception_context):
+    context = exception_context.execution_context
+    span: Optional[trace.Span] = getattr(context, "_otel_span", None)
+    if span is not None:
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+        context._otel_span = None
@@ -0,0 +1,133 @@
+"""
+Import-time benchmark for API worker boot.
+
+Imports the app in fresh interpreters under `python -X importtime` and
+reports the median cumulative import time, where it goes by top-level
+package, and whether the lazily loaded feature modules (email and OAuth
+provider clients) were imported anyway. Worker boot, autoscaling cold
+starts and every `--reload` restart pay this cost.
+
+    python -m benchmarks.import_time --runs 9 --output benchmarks/baselines/import_time.json
+    python -m benchmarks.import_time --baseline benchmarks/baselines/import_time.json
+
+No database is needed: importing the app does not connect.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from benchmarks.environment import apply_benchmark_environment
+
+# Loaded on first use by app.utils.email / app.utils.oauth; importing them at boot is a regression
+LAZY_MODULES = ("resend", "requests", "httpx")
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ImportRow = Tuple[str, int, int, int]  # module, self us, cumulative us, nesting depth
+
+
+def parse_importtime(stderr: str) -> List[ImportRow]:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Names are indented two spaces per nesting level after the separator's space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure_once(module: str) -> List[ImportRow]:
+    env = os.environ.copy()
+    env.setdefault("DATABASE_URL", "postgresql+psycopg2://benchmark@localhost/benchmark")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+def summarize(rows: List[ImportRow], module: str, top: int) -> dict:
+    total = next(cumulative for name, _, cumulative, depth in reversed(rows) if name == module and depth == 0)
+    by_package: Dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".", 1)[0]] += self_us
+    imported = {name for name, _, _, _ in rows}
+    return {
+        "total_ms": total / 1000,
+        "modules": len(rows),
+        "packages_ms": {
+            package: us / 1000 for package, us in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        },
+        "lazy_modules_imported": [name for name in LAZY_MODULES if name in imported],
+    }
+
+
+def compare(result: dict, baseline: dict, max_regression: float) -> bool:
+    before, after = baseline["total_ms"], result["total_ms"]
+    change = (after - before) / before * 100
+    print(f"\nvs baseline: {before:.1f} ms -> {after:.1f} ms ({change:+.1f}%)")
+    if change > max_regression:
+        print(f"REGRESSION: import time grew more than {max_regression:g}%")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure how long importing the API takes")
+    parser.add_argument("--module", default="app.main", help="Module a worker imports at boot")
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters to measure; the median is reported")
+    parser.add_argument("--top", type=int, default=15, help="Packages to list in the breakdown")
+    parser.add_argument("--output", help="Write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--baseline", help="Compare against a previous JSON result")
+    parser.add_argument("--max-regression", type=float, default=15, help="Allowed import time growth in percent")
+    args = parser.parse_args()
+
+    apply_benchmark_environment()
+    runs = sorted(
+        (summarize(measure_once(args.module), args.module, args.top) for _ in range(args.runs)),
+        key=lambda run: run["total_ms"],
+    )
+    result = runs[len(runs) // 2]
+    result["runs_ms"] = [run["total_ms"] for run in runs]
+    result["meta"] = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "module": args.module,
+        "runs": args.runs,
+    }
+
+    print(f"import {args.module}: median {result['total_ms']:.1f} ms over {args.runs} runs "
+          f"(min {runs[0]['total_ms']:.1f}, max {runs[-1]['total_ms']:.1f}), {result['modules']} modules")
+    print(f"\n{'package':<28}{'self ms':>10}")
+    for package, ms in result["packages_ms"].items():
+        print(f"{package:<28}{ms:>10.1f}")
+    lazy = result["lazy_modules_imported"]
+    print(f"\nLazy feature modules imported at boot: {', '.join(lazy) if lazy else 'none'}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as handle:
+            json.dump(result, handle, indent=2)
+        print(f"Wrote {args.output}")
+
+    passed = not lazy
+    if args.baseline:
+        with open(args.baseline) as handle:
+            passed = compare(result, json.load(handle), args.max_regression) and passed
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+HTTP load benchmark for the API.
+
+Seeds a private schema with users, blocklists and activities, starts the app
+under uvicorn in a subprocess, and drives a weighted mix of scenarios that
+mirror extension traffic. Reports requests/s and p50/p95/p99 per route and
+can compare against a stored JSON baseline.
+
+    TEST_DATABASE_URL=postgresql+psycopg2://... \\
+        python -m benchmarks.load --duration 30 --output benchmarks/baselines/load.json
+    python -m benchmarks.load --baseline benchmarks/baselines/load.json
+
+Without TEST_DATABASE_URL a PostgreSQL container is started via testcontainers.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.environment import benchmark_database
+
+PASSWORD = "benchmark-password"
+EXTRA_SITES = (
+    "twitch.tv", "netflix.com", "tiktok.com", "news.ycombinator.com", "discord.com",
+    "twitter.com", "linkedin.com", "pinterest.com", "tumblr.com", "hulu.com",
+)
+CHECKED_SITES = EXTRA_SITES + ("youtube.com", "reddit.com", "github.com", "docs.python.org")
+SYNTHETIC_PROBLEMS = 500
+
+# Relative weights of each scenario in the traffic mix
+SCENARIOS = {
+    "sync": 50,             # extension start-up / periodic sync reads
+    "blocklist_check": 25,  # tab navigation checks
+    "solve": 15,            # accepted submission logged
+    "dashboard": 7,         # webapp dashboard
+    "login": 3,             # login bursts (bcrypt-bound)
+}
+
+
+def _problem_urls() -> List[str]:
+    from app.config import settings
+    from app.utils.problem_metadata import read_snapshot
+
+    slugs = [row["slug"] for row in read_snapshot(settings.PROBLEM_METADATA_PATH)]
+    slugs += [f"bench-problem-{number}" for number in range(SYNTHETIC_PROBLEMS)]
+    return [f"https://leetcode.com/problems/{slug}/" for slug in slugs]
+
+
+def seed(users: int, activities_per_user: int, rng: random.Random) -> List[dict]:
+    """Create verified users with blocklists and skewed activity histories"""
+    from sqlalchemy import insert
+
+    from app.auth.models.user import Activity, Base, BlocklistItem, Problem, User
+    from app.crud.data import rebuild_activity_days
+    from app.crud.user import pwd_context
+    from app.db.session import SessionLocal, engine
+    from app.defaults import DEFAULT_BLOCKLIST
+    from app.utils.jwt import create_access_token
+    from app.utils.normalization import problem_slug
+
+    Base.metadata.create_all(engine)
+    password_hash = pwd_context.hash(PASSWORD)
+    problem_urls = _problem_urls()
+    # Popular problems are solved far more often than the long tail
+    popularity = [1 / (rank + 1) for rank in range(len(problem_urls))]
+    now = datetime.now(timezone.utc)
+
+    with engine.begin() as connection:
+        user_ids = connection.execute(insert(User).returning(User.id), [
+            {
+                "email": f"bench{number}@example.com",
+                "hashed_password": password_hash,
+                "is_verified": True,
+                "default_blocklist_seeded": True,
+            }
+            for number in range(users)
+        ]).scalars().all()
+
+        connection.execute(insert(BlocklistItem), [
+            {"user_id": user_id, "website": website}
+            for user_id in user_ids
+            for website in DEFAULT_BLOCKLIST + tuple(rng.sample(EXTRA_SITES, rng.randint(0, 6)))
+        ])
+
+        problem_ids = connection.execute(insert(Problem).returning(Problem.id), [
+            {"slug": problem_slug(url), "url": url, "name": problem_slug(url), "difficulty": "Medium"}
+            for url in problem_urls
+        ]).scalars().all()
+
+        activity_rows = []
+        for user_id in user_ids:
+            count = min(len(problem_ids), int(rng.expovariate(1 / activities_per_user)))
+            chosen = set()
+            while len(chosen) < count:
+                chosen.add(rng.choices(problem_ids, weights=popularity)[0])
+            activity_rows.extend(
+                {
+                    "user_id": user_id,
+                    "problem_id": problem_id,
+                    "status": "solved" if rng.random() < 0.7 else "attempted",
+                    "completed_at": now - timedelta(minutes=rng.randint(0, 90 * 24 * 60)),
+                }
+                for problem_id in chosen
+            )
+        if activity_rows:
+            connection.execute(insert(Activity), activity_rows)
+
+    db = SessionLocal()
+    try:
+        rebuild_activity_days(db)
+    finally:
+        db.close()
+
+    return [
+        {
+            "email": f"bench{number}@example.com",
+            "headers": {"Authorization": f"Bearer {create_access_token(data={'sub': str(user_id)}, expires_delta=timedelta(hours=6))}"},
+        }
+        for number, user_id in enumerate(user_ids)
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=server_dir,
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during start-up")
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        if self.recording:
+            self.latencies[label].append(time.perf_counter() - started)
+            if failed:
+                self.errors[label] += 1
+
+
+async def run_scenario(name: str, client: httpx.AsyncClient, recorder: Recorder, user: dict, rng: random.Random, problem_urls: List[str]):
+    headers = user["headers"]
+    if name == "sync":
+        await recorder.call(client, "GET /api/blocklist", "GET", "/api/blocklist", headers=headers)
+        await recorder.call(client, "GET /api/me/goal", "GET", "/api/me/goal", headers=headers)
+        await recorder.call(client, "GET /api/activity", "GET", "/api/activity?limit=50", headers=headers)
+    elif name == "blocklist_check":
+        website = rng.choice(CHECKED_SITES)
+        await recorder.call(client, "GET /api/blocklist/check", "GET", f"/api/blocklist/check?website={website}", headers=headers)
+    elif name == "solve":
+        url = rng.choice(problem_urls)
+        payload = {"problem_name": "Benchmark", "problem_url": url, "difficulty": "Unknown", "status": "solved"}
+        await recorder.call(client, "POST /api/activity", "POST", "/api/activity", headers=headers, json=payload)
+        await recorder.call(client, "POST /api/me/goal/progress", "POST", "/api/me/goal/progress", headers=headers, json={"delta": 1})
+    elif name == "dashboard":
+        await recorder.call(client, "GET /api/activity/stats", "GET", "/api/activity/stats", headers=headers)
+        await recorder.call(client, "GET /api/activity/timeseries", "GET", "/api/activity/timeseries?bucket=week", headers=headers)
+        await recorder.call(client, "GET /api/activity/tags", "GET", "/api/activity/tags", headers=headers)
+    elif name == "login":
+        await recorder.call(client, "POST /auth/login", "POST", "/auth/login", data={"username": user["email"], "password": PASSWORD})
+
+
+async def drive(base_url: str, users: List[dict], args, rng: random.Random) -> Tuple[Recorder, float]:
+    recorder = Recorder()
+    problem_urls = _problem_urls()
+    names, weights = zip(*SCENARIOS.items())
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        async def worker(deadline: float):
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights=weights)[0]
+                await run_scenario(name, client, recorder, rng.choice(users), rng, problem_urls)
+
+        warmup_deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*(worker(warmup_deadline) for _ in range(args.concurrency)))
+
+        recorder.recording = True
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(worker(deadline) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    return recorder, elapsed
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    index = max(0, min(len(sorted_values) - 1, round(percentile / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    routes = {}
+    for label, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        routes[label] = {
+            "requests": len(values),
+            "errors": recorder.errors[label],
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(_percentile(values, 50) * 1000, 2),
+            "p95_ms": round(_percentile(values, 95) * 1000, 2),
+            "p99_ms": round(_percentile(values, 99) * 1000, 2),
+        }
+    total = sum(route["requests"] for route in routes.values())
+    return {
+        "routes": routes,
+        "total": {
+            "requests": total,
+            "errors": sum(route["errors"] for route in routes.values()),
+            "rps": round(total / elapsed, 2),
+        },
+    }
+
+
+def compare(result: dict, baseline: dict, max_regression: float) -> List[str]:
+    """Describe routes whose p95 grew or throughput fell by more than max_regression percent"""
+    regressions = []
+    for label, current in result["routes"].items():
+        previous = baseline.get("routes", {}).get(label)
+        if not previous:
+            continue
+        p95_change = (current["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100 if previous["p95_ms"] else 0
+        rps_change = (current["rps"] - previous["rps"]) / previous["rps"] * 100 if previous["rps"] else 0
+        print(f"  {label:32} p95 {previous['p95_ms']:>8.2f} -> {current['p95_ms']:>8.2f} ms ({p95_change:+.1f}%)"
+              f"  rps {previous['rps']:>8.2f} -> {current['rps']:>8.2f} ({rps_change:+.1f}%)")
+        if p95_change > max_regression or -rps_change > max_regression:
+            regressions.append(label)
+    return regressions
+
+
+def print_report(result: dict):
+    print(f"{'route':32} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, route in result["routes"].items():
+        print(f"{label:32} {route['requests']:>7} {route['errors']:>5} {route['rps']:>8.2f} "
+              f"{route['p50_ms']:>8.2f} {route['p95_ms']:>8.2f} {route['p99_ms']:>8.2f}")
+    total = result["total"]
+    print(f"{'total':32} {total['requests']:>7} {total['errors']:>5} {total['rps']:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the HTTP load benchmark")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--activities-per-user", type=int, default=40, help="Mean of the per-user activity count")
+    parser.add_argument("--duration", type=float, default=20, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="Unmeasured seconds before measuring")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent virtual clients")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--baseline", help="Compare against a previous JSON result")
+    parser.add_argument("--max-regression", type=float, default=20, help="Allowed p95/rps regression in percent")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with benchmark_database():
+        print(f"Seeding {args.users} users...")
+        users = seed(args.users, args.activities_per_user, rng)
+        port = _free_port()
+        server = start_server(port, args.workers)
+        try:
+            print(f"Driving {args.concurrency} clients for {args.duration:g}s...")
+            recorder, elapsed = asyncio.run(drive(f"http://127.0.0.1:{port}", users, args, rng))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    result = summarize(recorder, elapsed)
+    result["meta"] = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        **{key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+    }
+    print_report(result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(result, handle, indent=2)
+            handle.write("\n")
+        print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        print(f"Compared with {args.baseline}:")
+        regressions = compare(result, baseline, args.max_regression)
+        if regressions:
+            print(f"Regressed beyond {args.max_regression:g}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
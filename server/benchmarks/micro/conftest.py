@@ -0,0 +1,30 @@
+"""
+Microbenchmarks for per-request hot paths (pytest-benchmark).
+
+None of these touch the database; DATABASE_URL only has to be set because
+app.config requires it at import time.
+
+    cd server
+    pytest benchmarks/micro --benchmark-autosave
+    pytest benchmarks/micro --benchmark-compare --benchmark-compare-fail=median:25%
+
+Saved runs live in benchmarks/baselines/micro unless --benchmark-storage is
+given; `--benchmark-compare` without a value compares with the latest one.
+"""
+import os
+
+import pytest
+
+from benchmarks.environment import apply_benchmark_environment
+
+_DEFAULT_STORAGE = "file://./.benchmarks"
+_BASELINE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "baselines", "micro")
+
+apply_benchmark_environment()
+os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://benchmark@localhost/benchmark")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    if config.getoption("benchmark_storage") == _DEFAULT_STORAGE:
+        config.option.benchmark_storage = f"file://{_BASELINE_DIR}"
@@ -0,0 +1,47 @@
+"""
+Benchmarks for input normalization run on every blocklist and activity write.
+"""
+import pytest
+
+from app.utils.normalization import normalize_problem_url, normalize_website, problem_slug
+
+WEBSITES = [
+    "youtube.com",
+    "https://www.YouTube.com/watch?v=dQw4w9WgXcQ",
+    "  reddit.com/r/programming  ",
+    "http://news.ycombinator.com:443/item?id=1",
+]
+
+PROBLEM_URLS = [
+    "https://leetcode.com/problems/two-sum/",
+    "https://leetcode.com/problems/two-sum/description/?envType=study-plan",
+    "leetcode.com/problems/longest-substring-without-repeating-characters/submissions/123",
+    "https://www.hackerrank.com/challenges/ctci-array-left-rotation/problem",
+]
+
+
+class TestNormalizationBenchmarks:
+    """Per-call cost of the normalization helpers on representative inputs.
+
+    The public helpers are memoized, so these measure repeat (cache hit)
+    calls; the `uncached` variants measure the first call for an input.
+    """
+
+    @pytest.mark.parametrize("website", WEBSITES)
+    def test_normalize_website(self, benchmark, website):
+        assert benchmark(normalize_website, website)
+
+    @pytest.mark.parametrize("problem_url", PROBLEM_URLS)
+    def test_normalize_problem_url(self, benchmark, problem_url):
+        assert benchmark(normalize_problem_url, problem_url)
+
+    @pytest.mark.parametrize("website", WEBSITES)
+    def test_normalize_website_uncached(self, benchmark, website):
+        assert benchmark(normalize_website.__wrapped__, website)
+
+    @pytest.mark.parametrize("problem_url", PROBLEM_URLS)
+    def test_normalize_problem_url_uncached(self, benchmark, problem_url):
+        assert benchmark(normalize_problem_url.__wrapped__, problem_url)
+
+    def test_problem_slug(self, benchmark):
+        assert benchmark(problem_slug, PROBLEM_URLS[1]) == "two-sum"
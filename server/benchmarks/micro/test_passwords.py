@@ -0,0 +1,23 @@
+"""
+Benchmarks for password verification on login.
+
+bcrypt is deliberately slow, so these run a handful of pedantic rounds
+rather than letting pytest-benchmark calibrate for a second per test.
+"""
+from app.crud.user import pwd_context, verify_password
+
+PASSWORD = "correct horse battery staple"
+
+
+class TestPasswordBenchmarks:
+    """Per-call cost of bcrypt verification."""
+
+    def test_verify_correct_password(self, benchmark):
+        hashed = pwd_context.hash(PASSWORD)
+
+        assert benchmark.pedantic(verify_password, args=(PASSWORD, hashed), rounds=5, warmup_rounds=1)
+
+    def test_verify_wrong_password(self, benchmark):
+        hashed = pwd_context.hash(PASSWORD)
+
+        assert not benchmark.pedantic(verify_password, args=("wrong password", hashed), rounds=5, warmup_rounds=1)
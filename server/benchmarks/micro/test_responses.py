@@ -0,0 +1,59 @@
+"""
+Benchmarks for response model validation and serialization.
+"""
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.auth.schemas.data import ActivitiesResponse, BlocklistResponse
+from app.auth.schemas.user import GoalResponse
+from app.utils.responses import ORJSONResponse, model_response
+
+
+def _activities(count):
+    completed_at = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=number,
+            problem_name=f"Problem {number}",
+            problem_url=f"https://leetcode.com/problems/problem-{number}/",
+            difficulty=("Easy", "Medium", "Hard")[number % 3],
+            topic_tags=["Array", "Hash Table"] if number % 2 else None,
+            status="solved",
+            completed_at=completed_at,
+        )
+        for number in range(count)
+    ]
+
+
+class TestResponseBenchmarks:
+    """Per-call cost of building the hottest responses."""
+
+    @pytest.mark.parametrize("count", [10, 100])
+    def test_activity_list_model_response(self, benchmark, count):
+        data = {"activities": _activities(count)}
+
+        response = benchmark(model_response, ActivitiesResponse, data)
+
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize("count", [10, 100])
+    def test_activity_list_validate_and_dump(self, benchmark, count):
+        """The default FastAPI path: model validation, then JSON encoding."""
+        data = {"activities": _activities(count)}
+
+        def build():
+            return ActivitiesResponse.model_validate(data, from_attributes=True).model_dump_json()
+
+        assert benchmark(build)
+
+    def test_blocklist_response(self, benchmark):
+        websites = [f"site{number}.example.com" for number in range(25)]
+
+        assert benchmark(lambda: ORJSONResponse(BlocklistResponse(websites=websites).model_dump()).body)
+
+    def test_goal_response(self, benchmark):
+        goal = {"target_daily": 5, "progress_today": 3, "progress_date": date(2026, 3, 1), "is_goal_completed": False}
+
+        assert benchmark(lambda: GoalResponse.model_validate(goal).model_dump_json())
@@ -0,0 +1,23 @@
+"""
+Benchmarks for access token issue and verification (every authenticated request decodes one).
+"""
+from app.utils.jwt import create_access_token, decode_access_token
+
+
+class TestTokenBenchmarks:
+    """Per-call cost of JWT encode and decode."""
+
+    def test_create_access_token(self, benchmark):
+        assert benchmark(create_access_token, {"sub": "42"})
+
+    def test_decode_access_token(self, benchmark):
+        token = create_access_token({"sub": "42"})
+
+        payload = benchmark(decode_access_token, token)
+
+        assert payload["sub"] == "42"
+
+    def test_decode_invalid_token(self, benchmark):
+        token = create_access_token({"sub": "42"})[:-4] + "AAAA"
+
+        assert benchmark(decode_access_token, token) is None
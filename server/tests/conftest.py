@@ -2,6 +2,7 @@
 Pytest configuration and common fixtures for LeetGuard tests.
 """
 import os
+import re
 import sys
 import uuid
 
@@ -17,6 +18,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 os.environ.setdefault("SECRET_KEY", "test-secret-key")
 os.environ.setdefault("REFRESH_SECRET_KEY", "test-refresh-secret-key")
+os.environ.setdefault("QUERY_DEBUG_ENABLED", "true")
 os.environ.setdefault("RESEND_API_KEY", "test-resend-api-key")
 os.environ.setdefault("FROM_EMAIL", "test@example.com")
 os.environ.setdefault("FRONTEND_URL", "https://test.com")
@@ -76,8 +78,13 @@ TEST_DATABASE_URL = _with_schema_search_path(_BASE_DATABASE_URL, _TEST_SCHEMA)
 os.environ["DATABASE_URL"] = TEST_DATABASE_URL
 
 from app.auth.models.user import Base
+from app.auth.schemas.user import UserCreate
+from app.crud.problems import clear_problem_cache
+from app.crud.user import create_user
 from app.db.session import get_db
 from app.main import app
+from app.utils.jwt import create_access_token
+from app.utils.rate_limit import get_rate_limiter
 
 
 def _truncate_tables(session):
@@ -85,6 +92,10 @@ def _truncate_tables(session):
     if table_names:
         session.execute(text(f"TRUNCATE TABLE {', '.join(table_names)} RESTART IDENTITY CASCADE"))
         session.commit()
+    # Cached catalog ids would point at truncated rows
+    clear_problem_cache()
+    # Every test client shares one IP; start each test with full buckets
+    get_rate_limiter().reset()
 
 
 @pytest.fixture(scope="session")
@@ -139,6 +150,44 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def assert_query_budget():
+    """Fail when a response's Server-Timing header reports more SQL statements than allowed"""
+    def check(response, max_queries: int):
+        match = re.search(r'desc="(\d+) queries"', response.headers.get("server-timing", ""))
+        assert match, "response has no Server-Timing query count (is QUERY_DEBUG_ENABLED set?)"
+        used = int(match.group(1))
+        assert used <= max_queries, f"{response.request.url.path} ran {used} queries, budget is {max_queries}"
+        return used
+    return check
+
+
+@pytest.fixture
+def verified_user_headers(db_session):
+    """Create a verified user and return it with bearer token headers"""
+    def create(email="verified@example.com"):
+        user = create_user(db_session, UserCreate(email=email, password="password123"))
+        user.is_verified = True
+        db_session.commit()
+        access_token = create_access_token(data={"sub": str(user.id)})
+        return user, {"Authorization": f"Bearer {access_token}"}
+    return create
+
+
+@pytest.fixture
+def activity_payload():
+    """Build a POST /api/activity body for a LeetCode problem slug"""
+    def build(slug, status_value="solved", tags=None):
+        return {
+            "problem_name": slug.replace("-", " ").title(),
+            "problem_url": f"https://leetcode.com/problems/{slug}/",
+            "difficulty": "Easy",
+            "topic_tags": tags if tags is not None else ["Array"],
+            "status": status_value,
+        }
+    return build
+
+
 @pytest.fixture
 def test_user_data():
     return {
@@ -0,0 +1,317 @@
+"""
+Integration tests for activity analytics endpoints.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from fastapi import status
+from app.auth.models.user import Activity, ActivityDay, Problem
+from app.config import settings
+from app.crud.data import rebuild_activity_days
+from app.crud.problems import get_or_create_problem
+
+
+class TestActivityTimeseries:
+    """Test the rollup-backed activity timeseries endpoint."""
+
+    def test_timeseries_tracks_creates_updates_and_deletes(self, client, verified_user_headers, activity_payload):
+        """Test rollup rows follow activity writes."""
+        user, headers = verified_user_headers()
+        today = datetime.now(timezone.utc).date().isoformat()
+
+        first = client.post("/api/activity", headers=headers, json=activity_payload("two-sum"))
+        client.post("/api/activity", headers=headers, json=activity_payload("add-two-numbers", "attempted"))
+        client.post("/api/activity", headers=headers, json=activity_payload("valid-anagram"))
+
+        response = client.get("/api/activity/timeseries", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["bucket"] == "day"
+        assert response.json()["points"] == [{"day": today, "total": 3, "solved": 2}]
+
+        activity_id = first.json()["activity_id"]
+        client.put(f"/api/activity/{activity_id}", headers=headers, json={"status": "attempted"})
+        client.delete(f"/api/activity/{activity_id}", headers=headers)
+
+        response = client.get("/api/activity/timeseries", headers=headers)
+        assert response.json()["points"] == [{"day": today, "total": 2, "solved": 1}]
+
+    def test_timeseries_weekly_buckets_and_range(self, client, db_session, verified_user_headers):
+        """Test weekly buckets and from/to bounds over backfilled rows."""
+        user, headers = verified_user_headers()
+        # 2026-03-02 is a Monday
+        for index, day in enumerate([2, 3, 8, 9, 20]):
+            problem = Problem(
+                slug=f"problem-{index}",
+                url=f"https://leetcode.com/problems/problem-{index}/",
+                name=f"Problem {index}",
+                difficulty="Easy",
+            )
+            db_session.add(Activity(
+                user_id=user.id,
+                problem=problem,
+                status="solved",
+                completed_at=datetime(2026, 3, day, 12, tzinfo=timezone.utc),
+            ))
+        db_session.commit()
+        rebuild_activity_days(db_session, user.id)
+
+        response = client.get(
+            "/api/activity/timeseries?bucket=week&from=2026-03-01&to=2026-03-15",
+            headers=headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["points"] == [
+            {"day": "2026-03-02", "total": 3, "solved": 3},
+            {"day": "2026-03-09", "total": 1, "solved": 1},
+        ]
+
+    def test_timeseries_rejects_inverted_range(self, client, verified_user_headers):
+        """Test from > to is rejected."""
+        user, headers = verified_user_headers()
+        start = datetime.now(timezone.utc).date()
+        end = start - timedelta(days=1)
+
+        response = client.get(f"/api/activity/timeseries?from={start}&to={end}", headers=headers)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_rebuild_matches_incremental_rollup(self, client, db_session, verified_user_headers, activity_payload):
+        """Test the backfill job reproduces the incrementally maintained rows."""
+        user, headers = verified_user_headers()
+        client.post("/api/activity", headers=headers, json=activity_payload("two-sum"))
+        client.post("/api/activity", headers=headers, json=activity_payload("three-sum", "bookmarked"))
+
+        def snapshot():
+            return [
+                (row.day, row.total, row.solved)
+                for row in db_session.query(ActivityDay).filter(ActivityDay.user_id == user.id).all()
+            ]
+
+        incremental = snapshot()
+        rebuild_activity_days(db_session, user.id)
+        db_session.expire_all()
+
+        assert snapshot() == incremental
+
+class TestActivityEdits:
+    """Test edits stay within the editing user's data."""
+
+    def test_edit_cannot_rewrite_another_users_problem(self, client, verified_user_headers, activity_payload):
+        """Test one user's PUT doesn't change the shared problem another user sees."""
+        _, attacker_headers = verified_user_headers("a@example.com")
+        _, victim_headers = verified_user_headers("b@example.com")
+        payload = activity_payload("two-sum")
+        attacker_id = client.post("/api/activity", headers=attacker_headers, json=payload).json()["activity_id"]
+        victim_id = client.post("/api/activity", headers=victim_headers, json=payload).json()["activity_id"]
+
+        response = client.put(
+            f"/api/activity/{attacker_id}",
+            headers=attacker_headers,
+            json={"problem_name": "PWNED", "difficulty": "Hard", "topic_tags": ["spam"]},
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert "problem_name, difficulty, topic_tags can't be edited" in response.json()["detail"][0]["msg"]
+
+        victim = client.get(f"/api/activity/{victim_id}", headers=victim_headers).json()
+        assert (victim["problem_name"], victim["difficulty"], victim["topic_tags"]) == ("Two Sum", "Easy", ["Array"])
+
+class TestActivityTags:
+    """Test JSONB topic tag filtering and facets."""
+
+    def test_activity_list_filters_by_tag(self, client, verified_user_headers, activity_payload):
+        """Test ?tag= returns only activities carrying that tag."""
+        user, headers = verified_user_headers()
+        client.post("/api/activity", headers=headers, json=activity_payload("two-sum", tags=["Array", "Hash Table"]))
+        client.post("/api/activity", headers=headers, json=activity_payload("merge-two-sorted-lists", tags=["Linked List"]))
+        client.post("/api/activity", headers=headers, json=activity_payload("climbing-stairs", tags=[]))
+
+        response = client.get("/api/activity?tag=Hash%20Table", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        activities = response.json()["activities"]
+        assert [activity["problem_url"] for activity in activities] == [
+            "https://leetcode.com/problems/two-sum/"
+        ]
+        assert activities[0]["topic_tags"] == ["Array", "Hash Table"]
+
+    def test_tag_facet_counts_solved_activities(self, client, db_session, verified_user_headers, activity_payload):
+        """Test /api/activity/tags aggregates solved counts per tag."""
+        user, headers = verified_user_headers()
+        client.post("/api/activity", headers=headers, json=activity_payload("two-sum", tags=["Array", "Hash Table"]))
+        client.post("/api/activity", headers=headers, json=activity_payload("contains-duplicate", tags=["Array"]))
+        client.post("/api/activity", headers=headers, json=activity_payload("three-sum", "attempted", tags=["Array"]))
+        client.post("/api/activity", headers=headers, json=activity_payload("untagged-custom-problem", tags=[]))
+
+        response = client.get("/api/activity/tags", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "tags": [
+                {"tag": "Array", "count": 2},
+                {"tag": "Hash Table", "count": 1},
+            ]
+        }
+        untagged = db_session.query(Problem).filter(Problem.topic_tags.is_(None)).count()
+        assert untagged == 1
+
+class TestActivityExport:
+    """Test streaming NDJSON/CSV export."""
+
+    def test_ndjson_export_streams_every_row(self, client, monkeypatch, verified_user_headers, activity_payload):
+        """Test NDJSON export returns one object per activity across chunks."""
+        monkeypatch.setattr("app.utils.export.ROWS_PER_CHUNK", 2)
+        user, headers = verified_user_headers()
+        slugs = ["two-sum", "three-sum", "four-sum", "valid-anagram", "group-anagrams"]
+        for slug in slugs:
+            client.post("/api/activity", headers=headers, json=activity_payload(slug))
+
+        response = client.get("/api/activity/export", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == len(slugs)
+        assert {line["problem_url"] for line in lines} == {
+            f"https://leetcode.com/problems/{slug}/" for slug in slugs
+        }
+        assert set(lines[0]) == {
+            "id", "problem_name", "problem_url", "difficulty", "topic_tags", "status", "completed_at"
+        }
+
+    def test_csv_export_has_header_and_joined_tags(self, client, verified_user_headers, activity_payload):
+        """Test CSV export writes a header row and pipe-joined tags."""
+        user, headers = verified_user_headers()
+        client.post("/api/activity", headers=headers, json=activity_payload("two-sum", tags=["Array", "Hash Table"]))
+
+        response = client.get("/api/activity/export?format=csv", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="leetguard-activities.csv"' in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["problem_url"] == "https://leetcode.com/problems/two-sum/"
+        assert rows[0]["topic_tags"] == "Array|Hash Table"
+
+class TestActivityImport:
+    """Test bulk import through COPY."""
+
+    def test_csv_import_inserts_updates_and_skips(self, client, db_session, verified_user_headers, activity_payload):
+        """Test CSV import merges into existing rows and reports bad lines."""
+        user, headers = verified_user_headers()
+        client.post("/api/activity", headers=headers, json=activity_payload("two-sum", "attempted"))
+        upload = (
+            "problem_name,problem_url,difficulty,topic_tags,status,completed_at\n"
+            "Two Sum,https://leetcode.com/problems/two-sum/description/,Easy,Array,solved,2026-03-02T10:00:00Z\n"
+            "Climbing Stairs,leetcode.com/problems/climbing-stairs,Unknown,,completed,2026-03-03T10:00:00+00:00\n"
+            "Broken,,Easy,,solved,\n"
+            "Bad Status,https://leetcode.com/problems/3sum/,Medium,,finished,\n"
+        )
+
+        response = client.post(
+            "/api/activity/import",
+            headers=headers,
+            files={"file": ("history.csv", upload, "text/csv")},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert (body["imported"], body["updated"], body["skipped"]) == (1, 1, 2)
+        assert body["errors"][0].startswith("line 4:")
+        activities = {
+            activity.problem_url: activity
+            for activity in db_session.query(Activity).filter(Activity.user_id == user.id).all()
+        }
+        assert activities["https://leetcode.com/problems/two-sum/"].status == "solved"
+        climbing = activities["https://leetcode.com/problems/climbing-stairs/"]
+        assert climbing.status == "solved"
+        assert climbing.difficulty == "Easy"
+        assert climbing.completed_at == datetime(2026, 3, 3, 10, tzinfo=timezone.utc)
+        rollup = db_session.query(ActivityDay).filter(
+            ActivityDay.user_id == user.id,
+            ActivityDay.day == datetime(2026, 3, 3).date(),
+        ).one()
+        assert (rollup.total, rollup.solved) == (1, 1)
+
+    def test_import_fills_catalog_gaps_like_single_submissions(self, client, db_session, verified_user_headers):
+        """Test an import fills a slug-only name but never renames a known problem."""
+        _, headers = verified_user_headers()
+        get_or_create_problem(db_session, "https://leetcode.com/problems/unlisted-problem/")
+        get_or_create_problem(db_session, "https://leetcode.com/problems/two-sum/", "Two Sum", "Easy")
+        db_session.commit()
+        upload = "\n".join(json.dumps(record) for record in [
+            {"problem_name": "Unlisted Problem", "problem_url": "https://leetcode.com/problems/unlisted-problem/", "difficulty": "Hard", "status": "solved"},
+            {"problem_name": "PWNED", "problem_url": "https://leetcode.com/problems/two-sum/", "difficulty": "Hard", "status": "solved"},
+        ])
+
+        response = client.post(
+            "/api/activity/import",
+            headers=headers,
+            files={"file": ("history.ndjson", upload, "application/x-ndjson")},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        problems = {problem.slug: (problem.name, problem.difficulty) for problem in db_session.query(Problem)}
+        assert problems == {"unlisted-problem": ("Unlisted Problem", "Hard"), "two-sum": ("Two Sum", "Easy")}
+
+    def test_overlong_rows_are_skipped_not_fatal(self, client, db_session, verified_user_headers):
+        """Test rows that would not fit the problems columns are reported instead of failing the upload."""
+        user, headers = verified_user_headers()
+        upload = "\n".join(json.dumps(record) for record in [
+            {"problem_name": "Two Sum", "problem_url": "https://leetcode.com/problems/two-sum/", "difficulty": "Easy", "status": "solved"},
+            {"problem_name": "x" * 300, "problem_url": "https://leetcode.com/problems/3sum/", "difficulty": "Medium", "status": "solved"},
+            {"problem_name": "Long", "problem_url": "https://leetcode.com/problems/valid-anagram/", "difficulty": "Extremely Hard", "status": "solved"},
+        ])
+
+        response = client.post(
+            "/api/activity/import",
+            headers=headers,
+            files={"file": ("history.ndjson", upload, "application/x-ndjson")},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert (body["imported"], body["skipped"]) == (1, 2)
+        assert body["errors"] == [
+            "line 2: name is longer than 255 characters",
+            "line 3: difficulty is longer than 10 characters",
+        ]
+        assert [activity.problem_url for activity in db_session.query(Activity).filter(Activity.user_id == user.id)] == [
+            "https://leetcode.com/problems/two-sum/"
+        ]
+
+    def test_oversized_upload_is_rejected(self, client, db_session, monkeypatch, verified_user_headers):
+        """Test uploads over ACTIVITY_IMPORT_MAX_BYTES are refused before parsing."""
+        monkeypatch.setattr(settings, "ACTIVITY_IMPORT_MAX_BYTES", 64)
+        user, headers = verified_user_headers()
+
+        response = client.post(
+            "/api/activity/import",
+            headers=headers,
+            files={"file": ("history.ndjson", "x" * 65, "application/x-ndjson")},
+        )
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert db_session.query(Activity).filter(Activity.user_id == user.id).count() == 0
+
+    def test_export_round_trips_through_ndjson_import(self, client, db_session, verified_user_headers, activity_payload):
+        """Test an NDJSON export can be imported into another account."""
+        source, source_headers = verified_user_headers("source@example.com")
+        target, target_headers = verified_user_headers("target@example.com")
+        for slug in ["two-sum", "valid-anagram", "group-anagrams"]:
+            client.post("/api/activity", headers=source_headers, json=activity_payload(slug))
+        exported = client.get("/api/activity/export", headers=source_headers).text
+
+        response = client.post(
+            "/api/activity/import",
+            headers=target_headers,
+            files={"file": ("export.ndjson", exported + "not json\n", "application/x-ndjson")},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["imported"] == 3
+        assert response.json()["skipped"] == 1
+        assert db_session.query(Activity).filter(Activity.user_id == target.id).count() == 3
+        assert db_session.query(Problem).count() == 3
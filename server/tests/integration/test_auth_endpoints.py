@@ -20,6 +20,13 @@ class TestAuthEndpoints:
         assert response.status_code == status.HTTP_200_OK
         assert response.json() == {"status": "ok"}
 
+    def test_jwks_is_published(self, client):
+        """Test the JWKS endpoint is public and cacheable (empty while tokens are HS256)."""
+        response = client.get("/.well-known/jwks.json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"keys": []}
+        assert response.headers["cache-control"] == "public, max-age=300"
+
     @patch('app.main.send_verification_email')
     def test_user_signup_success(self, mock_send_email, client, test_user_data):
         """Test successful user signup."""
@@ -187,6 +194,79 @@ class TestAuthEndpoints:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert "Invalid refresh token" in response.json()["detail"]
 
+    def test_refresh_rotates_tokens(self, client, db_session):
+        """Test each refresh returns a new refresh token and retires the presented one."""
+        user = create_user(db_session, UserCreate(email="verified@example.com", password="password123"))
+        user.is_verified = True
+        db_session.commit()
+        login = client.post("/auth/login", data={"username": "verified@example.com", "password": "password123"})
+        first = login.json()["refresh_token"]
+
+        response = client.post("/auth/refresh", json={"refresh_token": first})
+
+        assert response.status_code == status.HTTP_200_OK
+        second = response.json()["refresh_token"]
+        assert second != first
+        assert client.post("/auth/refresh", json={"refresh_token": second}).status_code == status.HTTP_200_OK
+
+    def test_refresh_token_reuse_revokes_the_family(self, client, db_session):
+        """Test replaying a rotated refresh token also invalidates its successor."""
+        user = create_user(db_session, UserCreate(email="verified@example.com", password="password123"))
+        user.is_verified = True
+        db_session.commit()
+        login = client.post("/auth/login", data={"username": "verified@example.com", "password": "password123"})
+        stolen = login.json()["refresh_token"]
+        successor = client.post("/auth/refresh", json={"refresh_token": stolen}).json()["refresh_token"]
+
+        replay = client.post("/auth/refresh", json={"refresh_token": stolen})
+
+        assert replay.status_code == status.HTTP_401_UNAUTHORIZED
+        response = client.post("/auth/refresh", json={"refresh_token": successor})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_all_revokes_access_and_refresh_tokens(self, client, db_session):
+        """Test outstanding tokens stop working after logging out everywhere."""
+        user = create_user(db_session, UserCreate(email="verified@example.com", password="password123"))
+        user.is_verified = True
+        db_session.commit()
+        tokens = client.post("/auth/login", data={"username": "verified@example.com", "password": "password123"}).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        assert client.get("/me", headers=headers).status_code == status.HTTP_200_OK
+
+        assert client.post("/auth/logout-all", headers=headers).status_code == status.HTTP_200_OK
+
+        response = client.get("/me", headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.json()["detail"] == "Token revoked"
+        refresh = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert refresh.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_login_right_after_logout_all_is_accepted(self, client, db_session):
+        """Test a new login in the same second as logging out everywhere still works."""
+        user = create_user(db_session, UserCreate(email="verified@example.com", password="password123"))
+        user.is_verified = True
+        db_session.commit()
+        credentials = {"username": "verified@example.com", "password": "password123"}
+        token = client.post("/auth/login", data=credentials).json()["access_token"]
+        assert client.post("/auth/logout-all", headers={"Authorization": f"Bearer {token}"}).status_code == status.HTTP_200_OK
+
+        fresh = client.post("/auth/login", data=credentials).json()["access_token"]
+        response = client.get("/me", headers={"Authorization": f"Bearer {fresh}"})
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_tokens_issued_after_revocation_are_accepted(self, client, db_session):
+        """Test the watermark only rejects tokens issued before it."""
+        user = create_user(db_session, UserCreate(email="verified@example.com", password="password123"))
+        user.is_verified = True
+        user.tokens_valid_after = datetime.now(timezone.utc) - timedelta(minutes=5)
+        db_session.commit()
+
+        token = create_access_token(data={"sub": str(user.id)})
+        response = client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == status.HTTP_200_OK
+
     def test_blocklist_check_query_and_path_routes_match(self, client, db_session):
         """Test canonical query route and legacy path route behave identically."""
         user = create_user(db_session, UserCreate(email="verified@example.com", password="password123"))
@@ -428,7 +508,7 @@ class TestAuthEndpoints:
         # Verify email
         verification_data = {
             "email": test_user_data["email"],
-            "code": user.verification_code
+            "code": user.email_verification.code
         }
         response = client.post("/auth/verify-email-code", json=verification_data)
 
@@ -457,6 +537,38 @@ class TestAuthEndpoints:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "Invalid or expired verification code" in response.json()["detail"]
 
+    @patch('app.main.verify_password')
+    def test_login_is_rate_limited_before_bcrypt(self, mock_verify_password, client, db_session):
+        """Test repeated logins for one email are rejected without checking the password."""
+        create_user(db_session, UserCreate(email="target@example.com", password="password123"))
+        mock_verify_password.return_value = False
+        credentials = {"username": "target@example.com", "password": "guess"}
+
+        for _ in range(10):
+            assert client.post("/auth/login", data=credentials).status_code == status.HTTP_401_UNAUTHORIZED
+        response = client.post("/auth/login", data={**credentials, "username": "TARGET@example.com"})
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["retry-after"]) > 0
+        assert mock_verify_password.call_count == 10
+
+        # Other accounts are still reachable from the same client
+        other = client.post("/auth/login", data={"username": "other@example.com", "password": "guess"})
+        assert other.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @patch('app.main.send_verification_email')
+    def test_verification_code_guessing_is_rate_limited(self, mock_send_email, client, test_user_data):
+        """Test a 6-digit code cannot be brute-forced against one email."""
+        mock_send_email.return_value = True
+        client.post("/auth/signup", json=test_user_data)
+
+        statuses = [
+            client.post("/auth/verify-email-code", json={"email": test_user_data["email"], "code": f"{guess:06d}"}).status_code
+            for guess in range(6)
+        ]
+
+        assert statuses == [status.HTTP_400_BAD_REQUEST] * 5 + [status.HTTP_429_TOO_MANY_REQUESTS]
+
     @patch('app.main.send_verification_email')
     def test_resend_verification_code(self, mock_send_email, client, db_session, test_user_data):
         """Test resending verification code."""
@@ -466,7 +578,7 @@ class TestAuthEndpoints:
         response = client.post("/auth/signup", json=test_user_data)
         assert response.status_code == status.HTTP_200_OK
         user = get_user_by_email(db_session, test_user_data["email"])
-        user.last_code_sent_at = datetime.now(timezone.utc) - timedelta(seconds=31)
+        user.email_verification.sent_at = datetime.now(timezone.utc) - timedelta(seconds=31)
         db_session.commit()
 
         # Resend verification code
@@ -492,7 +604,7 @@ class TestAuthEndpoints:
         response = client.post("/auth/signup", json=test_user_data)
         assert response.status_code == status.HTTP_200_OK
         user = get_user_by_email(db_session, test_user_data["email"])
-        user.last_code_sent_at = datetime.now(timezone.utc) - timedelta(seconds=31)
+        user.email_verification.sent_at = datetime.now(timezone.utc) - timedelta(seconds=31)
         db_session.commit()
 
         # Try to resend verification code
@@ -522,7 +634,7 @@ class TestAuthEndpoints:
         # 3. Verify email
         verification_data = {
             "email": test_user_data["email"],
-            "code": user.verification_code
+            "code": user.email_verification.code
         }
         response = client.post("/auth/verify-email-code", json=verification_data)
         assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,116 @@
+"""
+Integration tests for daily goal history and streak endpoints.
+"""
+from datetime import date, timedelta
+from fastapi import status
+from sqlalchemy.orm import sessionmaker
+from app.auth.models.user import GoalDay, User
+from app.auth.schemas.user import UserCreate
+from app.crud.user import create_user, get_user_streak, increment_progress
+
+class TestGoalEndpoints:
+    """Test goal rollover history and streak tracking."""
+
+    def test_rollover_archives_previous_day(self, client, db_session, verified_user_headers):
+        """Test the lazy reset writes yesterday's progress to goal_days."""
+        user, headers = verified_user_headers()
+        yesterday = date.today() - timedelta(days=1)
+        user.progress_date = yesterday
+        user.progress_today = 3
+        user.target_daily = 4
+        db_session.commit()
+
+        response = client.post("/api/me/goal/progress", headers=headers, json={"delta": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["progress_today"] == 1
+        history = db_session.query(GoalDay).filter(GoalDay.user_id == user.id).all()
+        assert len(history) == 1
+        assert history[0].day == yesterday
+        assert history[0].progress == 3
+        assert history[0].target == 4
+
+    def test_streak_extends_when_goal_met_on_consecutive_days(self, client, db_session, verified_user_headers):
+        """Test reaching the goal the day after a met goal extends the streak."""
+        user, headers = verified_user_headers()
+        user.target_daily = 2
+        user.current_streak = 4
+        user.longest_streak = 4
+        user.last_goal_met_date = date.today() - timedelta(days=1)
+        db_session.commit()
+
+        client.post("/api/me/goal/progress", headers=headers, json={"delta": 1})
+        client.post("/api/me/goal/progress", headers=headers, json={"delta": 1})
+        # Further progress on the same day must not count twice
+        client.post("/api/me/goal/progress", headers=headers, json={"delta": 1})
+        response = client.get("/api/me/streak", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            "current_streak": 5,
+            "longest_streak": 5,
+            "last_goal_met_date": date.today().isoformat(),
+        }
+
+    def test_streak_resets_after_missed_day(self, client, db_session, verified_user_headers):
+        """Test a gap of more than one day breaks the current streak."""
+        user, headers = verified_user_headers()
+        user.target_daily = 1
+        user.current_streak = 7
+        user.longest_streak = 7
+        user.last_goal_met_date = date.today() - timedelta(days=3)
+        db_session.commit()
+
+        before = client.get("/api/me/streak", headers=headers)
+        client.post("/api/me/goal/progress", headers=headers, json={"delta": 1})
+        after = client.get("/api/me/streak", headers=headers)
+
+        assert before.json()["current_streak"] == 0
+        assert before.json()["longest_streak"] == 7
+        assert after.json()["current_streak"] == 1
+        assert after.json()["longest_streak"] == 7
+
+    def test_goal_target_must_be_positive(self, client, verified_user_headers):
+        """Test a zero or negative target is rejected instead of meeting the goal every day."""
+        user, headers = verified_user_headers()
+
+        for target in (0, -1):
+            response = client.patch("/api/me/goal", headers=headers, json={"target_daily": target})
+            assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        assert client.get("/api/me/streak", headers=headers).json()["current_streak"] == 0
+
+    def test_lowering_target_to_progress_meets_the_goal_once(self, client, db_session, verified_user_headers):
+        """Test lowering the target to today's progress counts as meeting today's goal."""
+        user, headers = verified_user_headers()
+        user.target_daily = 3
+        db_session.commit()
+        client.post("/api/me/goal/progress", headers=headers, json={"delta": 2})
+
+        first = client.patch("/api/me/goal", headers=headers, json={"target_daily": 2})
+        client.patch("/api/me/goal", headers=headers, json={"target_daily": 1})
+
+        assert first.json()["is_goal_completed"] is True
+        assert client.get("/api/me/streak", headers=headers).json()["current_streak"] == 1
+
+class TestConcurrentProgress:
+    """Test progress increments from overlapping requests."""
+
+    def test_increment_sees_progress_committed_by_another_request(self, db_session):
+        """Test an increment never works from a stale copy of the user row."""
+        user = create_user(db_session, UserCreate(email="racer@example.com", password="password123"))
+        user.target_daily = 2
+        db_session.commit()
+        # This request loaded the user (as get_current_user does) before the other one committed
+        assert db_session.get(User, user.id).progress_today == 0
+        other = sessionmaker(bind=db_session.get_bind())()
+        try:
+            increment_progress(other, user.id)
+        finally:
+            other.close()
+
+        goal = increment_progress(db_session, user.id)
+
+        assert goal["progress_today"] == 2
+        assert goal["is_goal_completed"] is True
+        assert get_user_streak(db_session, user.id)["current_streak"] == 1
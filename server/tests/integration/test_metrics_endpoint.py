@@ -0,0 +1,55 @@
+"""
+Integration tests for the Prometheus metrics endpoint.
+"""
+from unittest.mock import patch
+
+from fastapi import status
+from prometheus_client import REGISTRY
+
+from app.utils.email import send_verification_email
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsEndpoint:
+    """Test request, pool and email metrics exposition."""
+
+    def test_requests_are_labelled_with_route_templates(self, client):
+        """Test path parameters don't leak into route labels."""
+        route = "/api/activity/{activity_id}"
+        before = _sample("http_requests_total", method="GET", route=route, status="401")
+
+        client.get("/api/activity/123")
+        client.get("/api/activity/456")
+        response = client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert _sample("http_requests_total", method="GET", route=route, status="401") == before + 2
+        assert 'route="/api/activity/123"' not in response.text
+        assert "http_request_duration_seconds_bucket" in response.text
+        assert "db_pool_checked_out" in response.text
+        assert 'normalization_cache_hits_total{function="normalize_website"' in response.text
+
+    def test_unknown_paths_share_one_label(self, client):
+        """Test 404s for arbitrary paths are bucketed together."""
+        before = _sample("http_requests_total", method="GET", route="unmatched", status="404")
+
+        client.get("/no/such/path")
+
+        assert _sample("http_requests_total", method="GET", route="unmatched", status="404") == before + 1
+
+    @patch("app.utils.email.resend")
+    def test_email_outcomes_are_counted(self, mock_resend):
+        """Test sent and failed verification emails are counted separately."""
+        sent_before = _sample("email_sends_total", kind="verification", outcome="sent")
+        failed_before = _sample("email_sends_total", kind="verification", outcome="failed")
+
+        send_verification_email("user@example.com", "123456")
+        mock_resend.Emails.send.side_effect = Exception("provider down")
+        send_verification_email("user@example.com", "123456")
+
+        assert _sample("email_sends_total", kind="verification", outcome="sent") == sent_before + 1
+        assert _sample("email_sends_total", kind="verification", outcome="failed") == failed_before + 1
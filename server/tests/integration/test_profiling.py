@@ -0,0 +1,101 @@
+"""
+Integration tests for the admin sampling profiler.
+"""
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.middleware.profiling import ProfilingMiddleware
+from app.utils.profiler import SamplingProfiler
+
+
+def _spin_for_profiler(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", frozenset({"admin@example.com"}))
+
+class TestSamplingProfiler:
+    """Test stack sampling and output formats."""
+
+    def test_busy_thread_shows_up_in_both_formats(self):
+        worker = threading.Thread(target=_spin_for_profiler, args=(0.3,), name="busy-worker")
+        with SamplingProfiler(interval=0.002) as profiler:
+            worker.start()
+            worker.join()
+
+        assert "busy-worker;" in profiler.collapsed()
+        assert "_spin_for_profiler" in profiler.collapsed()
+        speedscope = profiler.speedscope()
+        frames = [frame["name"] for frame in speedscope["shared"]["frames"]]
+        assert any(name.startswith("_spin_for_profiler") for name in frames)
+        assert len(speedscope["profiles"][0]["samples"]) == len(speedscope["profiles"][0]["weights"])
+
+class TestProfileEndpoint:
+    """Test the on-demand worker profile endpoint."""
+
+    def test_disabled_by_default(self, client, monkeypatch, verified_user_headers):
+        monkeypatch.setattr(settings, "ADMIN_EMAILS", frozenset({"admin@example.com"}))
+        user, headers = verified_user_headers("admin@example.com")
+
+        response = client.post("/admin/profile?seconds=0.1", headers=headers)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_requires_admin(self, client, profiling_enabled, verified_user_headers):
+        user, headers = verified_user_headers("someone@example.com")
+
+        response = client.post("/admin/profile?seconds=0.1", headers=headers)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_admin_gets_collapsed_stacks(self, client, profiling_enabled, verified_user_headers):
+        user, headers = verified_user_headers("admin@example.com")
+        worker = threading.Thread(target=_spin_for_profiler, args=(0.5,))
+        worker.start()
+
+        response = client.post("/admin/profile?seconds=0.3&interval_ms=2&format=collapsed", headers=headers)
+        worker.join()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "_spin_for_profiler" in response.text
+
+class TestProfilingMiddleware:
+    """Test profiling a single flagged request."""
+
+    def _client(self):
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware)
+
+        @app.get("/slow")
+        def slow():
+            _spin_for_profiler(0.2)
+            return {"done": True}
+
+        return TestClient(app)
+
+    def test_admin_request_returns_profile(self, profiling_enabled, verified_user_headers):
+        user, headers = verified_user_headers("admin@example.com")
+
+        response = self._client().get("/slow", headers={**headers, "X-Profile": "speedscope"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["x-profiled-status"] == "200"
+        frames = [frame["name"] for frame in response.json()["shared"]["frames"]]
+        assert any(name.startswith("slow ") for name in frames)
+
+    def test_header_ignored_for_non_admins(self, profiling_enabled, verified_user_headers):
+        user, headers = verified_user_headers("someone@example.com")
+
+        response = self._client().get("/slow", headers={**headers, "X-Profile": "speedscope"})
+
+        assert response.json() == {"done": True}
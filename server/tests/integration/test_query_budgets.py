@@ -0,0 +1,63 @@
+"""
+Integration tests pinning SQL statement budgets for hot routes.
+
+Budgets include the user lookup done by get_current_user. Raise one only
+together with the change that needs the extra statement.
+"""
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.auth.models.user import User
+from app.config import settings
+from app.db.query_stats import track_queries
+from app.db.session import get_db
+from app.main import create_app
+
+class TestQueryBudgets:
+    """Test hot routes stay within their statement budgets."""
+
+    def test_read_routes(self, client, assert_query_budget, verified_user_headers, activity_payload):
+        """Test list endpoints don't grow queries with row count."""
+        user, headers = verified_user_headers()
+        for slug in ["two-sum", "3sum", "valid-anagram", "group-anagrams"]:
+            client.post("/api/activity", headers=headers, json=activity_payload(slug))
+
+        assert_query_budget(client.get("/api/activity", headers=headers), 2)
+        assert_query_budget(client.get("/api/activity/tags", headers=headers), 2)
+        assert_query_budget(client.get("/api/blocklist", headers=headers), 3)
+
+    def test_add_activity(self, client, assert_query_budget, verified_user_headers, activity_payload):
+        """Test creating and re-submitting an activity."""
+        user, headers = verified_user_headers()
+
+        assert_query_budget(client.post("/api/activity", headers=headers, json=activity_payload("two-sum")), 6)
+        assert_query_budget(client.post("/api/activity", headers=headers, json=activity_payload("two-sum")), 4)
+
+class TestTrackQueries:
+    """Test statement accounting outside of requests."""
+
+    def test_counts_repeated_statements(self, db_session):
+        with track_queries() as stats:
+            for _ in range(3):
+                db_session.query(User).filter(User.id == 1).first()
+
+        assert stats.count == 3
+        assert stats.most_repeated()[1] == 3
+        assert stats.server_timing().endswith('desc="3 queries"')
+
+
+class TestQueryDebugOptIn:
+    """Test query details are only exposed when explicitly enabled."""
+
+    def test_disabled_hides_server_timing_and_slow_query_report(self, db_session, monkeypatch):
+        monkeypatch.setattr(settings, "QUERY_DEBUG_ENABLED", False)
+        monkeypatch.setattr(settings, "DEBUG", True)
+        app = create_app()
+        app.dependency_overrides[get_db] = lambda: db_session
+
+        with TestClient(app) as client:
+            health = client.get("/health")
+            report = client.get("/debug/slow-queries")
+
+        assert "server-timing" not in health.headers
+        assert report.status_code == status.HTTP_404_NOT_FOUND
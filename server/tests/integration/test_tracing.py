@@ -0,0 +1,82 @@
+"""
+Integration tests for OpenTelemetry request, SQL and outgoing call spans.
+"""
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import status
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind
+
+from app.utils.email import send_verification_email
+from app.utils.oauth import get_github_user_info
+from app.utils.tracing import tracer
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_SPAN_ID = "00f067aa0ba902b7"
+
+_exporter = InMemorySpanExporter()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tracer_provider():
+    # The global provider can only be set once per process
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(_exporter))
+        trace.set_tracer_provider(provider)
+    yield
+
+
+@pytest.fixture
+def spans():
+    _exporter.clear()
+    yield _exporter
+    _exporter.clear()
+
+class TestRequestTracing:
+    """Test server spans and their SQL children."""
+
+    def test_request_continues_incoming_trace(self, client, spans, verified_user_headers):
+        """Test a traceparent header from the extension parents the request and SQL spans."""
+        user, headers = verified_user_headers()
+        headers["traceparent"] = f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01"
+
+        response = client.get("/api/blocklist", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        finished = spans.get_finished_spans()
+        server = next(span for span in finished if span.kind == SpanKind.SERVER)
+        assert server.name == "GET /api/blocklist"
+        assert format(server.context.trace_id, "032x") == TRACE_ID
+        assert format(server.parent.span_id, "016x") == PARENT_SPAN_ID
+        sql = [span for span in finished if span.attributes.get("db.system") == "postgresql"]
+        assert sql and all(format(span.context.trace_id, "032x") == TRACE_ID for span in sql)
+        assert all(span.name == "SELECT" for span in sql)
+
+class TestOutgoingCallSpans:
+    """Test spans around Resend and OAuth provider calls."""
+
+    @patch("app.utils.email.resend")
+    def test_resend_call_is_spanned(self, mock_resend, spans):
+        with tracer.start_as_current_span("request"):
+            send_verification_email("user@example.com", "123456")
+
+        names = [span.name for span in spans.get_finished_spans()]
+        assert "resend.emails.send" in names
+
+    def test_oauth_http_calls_are_spanned(self, spans):
+        async def fake_transport(self, request):
+            return httpx.Response(404, request=request)
+
+        with patch.object(httpx.AsyncHTTPTransport, "handle_async_request", fake_transport):
+            assert asyncio.run(get_github_user_info("token")) is None
+
+        http_spans = [span for span in spans.get_finished_spans() if span.name == "HTTP GET"]
+        assert http_spans[0].attributes["server.address"] == "api.github.com"
+        assert http_spans[0].attributes["http.response.status_code"] == 404
@@ -0,0 +1,38 @@
+"""
+Unit tests for the application factory and lazy feature imports.
+"""
+import os
+import subprocess
+import sys
+
+from app.main import create_app
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestCreateApp:
+    """Test building the API and what importing it loads."""
+
+    def test_each_call_builds_a_complete_app(self):
+        first, second = create_app(), create_app()
+
+        assert first is not second
+        paths = set(first.openapi()["paths"])
+        assert {"/health", "/auth/login", "/auth/oauth/google", "/api/blocklist"} <= paths
+        assert paths == set(second.openapi()["paths"])
+
+    def test_import_skips_email_and_oauth_clients_and_resend_key(self):
+        env = {key: value for key, value in os.environ.items() if key != "RESEND_API_KEY"}
+        completed = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, app.main; print(sorted(m for m in ('resend', 'requests', 'httpx') if m in sys.modules))",
+            ],
+            cwd=SERVER_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+
+        assert completed.returncode == 0, completed.stderr
+        assert completed.stdout.strip() == "[]"
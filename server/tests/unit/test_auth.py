@@ -1,22 +1,27 @@
 """
 Unit tests for authentication functionality.
 """
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 
-from app.auth.models.user import BlocklistItem
+from app.auth.models.user import BlocklistItem, RefreshToken
 from app.auth.schemas.user import UserCreate
 from app.crud.user import (
     create_oauth_user,
     create_user,
     get_user_by_email,
+    update_user_password,
     verify_password,
 )
+from app.crud.refresh_tokens import issue_refresh_token
 from app.defaults import DEFAULT_BLOCKLIST
+from app.dependencies import is_token_revoked
 from app.utils.jwt import (
     create_access_token,
     create_refresh_token,
     decode_access_token,
     decode_refresh_token,
+    timestamp_ms,
 )
 
 class TestPasswordHashing:
@@ -121,6 +126,18 @@ class TestJWTTokens:
         # For now, we'll just test that the token structure is correct
         assert "exp" in payload
 
+    def test_revocation_is_compared_below_the_second(self):
+        """Test a token from earlier in the revocation's second is revoked and a later one is not."""
+        revoked_at = datetime(2026, 10, 19, 12, 0, 0, 500000, tzinfo=timezone.utc)
+        user = SimpleNamespace(tokens_valid_after=revoked_at)
+        second = int(revoked_at.timestamp())
+
+        assert is_token_revoked(user, {"iat": second, "iat_ms": timestamp_ms(revoked_at) - 400})
+        assert not is_token_revoked(user, {"iat": second, "iat_ms": timestamp_ms(revoked_at) + 1})
+        # Tokens without iat_ms count from the start of their second
+        assert is_token_revoked(user, {"iat": second})
+        assert not is_token_revoked(user, {"iat": second + 1})
+
 class TestUserCRUD:
     """Test user CRUD operations."""
 
@@ -132,9 +149,8 @@ class TestUserCRUD:
         assert user.email == "newuser@example.com"
         assert user.hashed_password != "password123"  # Should be hashed
         assert user.is_verified is False
-        assert user.verification_code is not None
-        assert len(user.verification_code) == 6
-        assert user.verification_code_expires is not None
+        assert len(user.email_verification.code) == 6
+        assert user.email_verification.expires_at > datetime.now(timezone.utc)
         assert user.default_blocklist_seeded is True
 
         seeded_websites = [
@@ -177,3 +193,14 @@ class TestUserCRUD:
         """Test retrieving non-existent user."""
         user = get_user_by_email(db_session, "nonexistent@example.com")
         assert user is None
+
+    def test_password_change_revokes_tokens(self, db_session):
+        """Test setting a password moves the token watermark and drops refresh tokens."""
+        user = create_oauth_user(db_session, "oauth@example.com", "OAuth User")
+        issue_refresh_token(db_session, user.id)
+        issued_before = decode_access_token(create_access_token(data={"sub": str(user.id)}))
+
+        update_user_password(db_session, user.id, "newpassword123")
+
+        assert is_token_revoked(user, issued_before)
+        assert db_session.query(RefreshToken).filter(RefreshToken.user_id == user.id).count() == 0
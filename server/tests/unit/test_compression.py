@@ -0,0 +1,90 @@
+"""
+Unit tests for the response compression middleware.
+"""
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import compression
+from app.middleware.compression import CompressionMiddleware, _accepted_encodings
+
+PAYLOAD = "https://leetcode.com/problems/two-sum/\n" * 100
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(PAYLOAD)
+
+    @app.get("/small")
+    def small():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([PAYLOAD, PAYLOAD]), media_type="application/x-ndjson")
+
+    @app.get("/png")
+    def png():
+        return PlainTextResponse(PAYLOAD, media_type="image/png")
+
+    return TestClient(app)
+
+
+class TestNegotiation:
+    """Test Accept-Encoding parsing."""
+
+    def test_parses_quality_values(self):
+        assert _accepted_encodings("gzip;q=0.5, BR, identity;q=0") == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+        assert _accepted_encodings("") == {}
+
+    def test_client_weights_win_over_server_preference(self):
+        middleware = CompressionMiddleware(app=None)
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"br;q=0.1, gzip")]}
+
+        assert middleware._choose_encoding(scope) == "gzip"
+
+
+class TestCompressionMiddleware:
+    """Test which responses get compressed and how."""
+
+    def test_large_body_is_gzipped(self):
+        response = _client().get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(PAYLOAD) / 5
+        assert response.text == PAYLOAD
+
+    def test_brotli_preferred_when_available(self):
+        if compression.brotli is None:
+            pytest.skip("brotli is not installed")
+        response = _client().get("/large", headers={"Accept-Encoding": "gzip, br"})
+
+        assert response.headers["content-encoding"] == "br"
+        assert response.text == PAYLOAD
+
+    def test_small_and_binary_bodies_are_untouched(self):
+        client = _client()
+        for path in ("/small", "/png"):
+            response = client.get(path, headers={"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in response.headers
+
+    def test_no_accept_encoding_is_untouched(self):
+        response = _client().get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_streaming_body_is_compressed_incrementally(self):
+        with _client().stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw).decode() == PAYLOAD * 2
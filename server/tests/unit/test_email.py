@@ -3,6 +3,7 @@ Unit tests for email functionality.
 """
 import pytest
 from unittest.mock import patch, MagicMock
+from app.config import settings
 from app.utils.email import send_verification_email, send_password_reset_email, send_welcome_email
 
 class TestEmailFunctions:
@@ -114,3 +115,11 @@ class TestEmailFunctions:
             assert "https://example.com/reset?token=token123" in html_content
             assert "https://example.com/reset?token=token123" in text_content
             assert "Reset Password" in html_content
+
+    def test_sending_without_api_key_fails_softly(self, monkeypatch):
+        """Test emails report failure, instead of raising, when RESEND_API_KEY is unset."""
+        monkeypatch.setattr(settings, "RESEND_API_KEY", None)
+        monkeypatch.setattr("app.utils.email.resend", None)
+
+        assert send_verification_email("test@example.com", "123456") is False
+        assert send_welcome_email("test@example.com", "Tester") is False
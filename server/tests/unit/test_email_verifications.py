@@ -0,0 +1,77 @@
+"""
+Unit tests for pending email verification codes.
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.auth.models.user import EmailVerification
+from app.auth.schemas.user import UserCreate
+from app.config import settings
+from app.crud.email_verifications import (
+    consume_verification_code,
+    get_email_verification,
+    issue_verification_code,
+    purge_expired_email_verifications,
+)
+from app.crud.user import create_user
+
+
+def _user(db_session, email="verify@example.com"):
+    return create_user(db_session, UserCreate(email=email, password="password123"))
+
+
+def _wrong(code: str) -> str:
+    return f"{(int(code) + 1) % 1000000:06d}"
+
+
+class TestEmailVerifications:
+    """Test issuing, consuming and sweeping verification codes."""
+
+    def test_reissuing_replaces_the_code_and_resets_attempts(self, db_session):
+        user = _user(db_session)
+        first = get_email_verification(db_session, user.id).code
+        consume_verification_code(db_session, user.id, _wrong(first))
+        db_session.commit()
+
+        code = issue_verification_code(db_session, user.id)
+
+        pending = get_email_verification(db_session, user.id)
+        assert pending.code == code
+        assert pending.failed_attempts == 0
+        assert pending.send_count == 2
+
+    def test_matching_code_is_consumed_once(self, db_session):
+        user = _user(db_session)
+        code = get_email_verification(db_session, user.id).code
+
+        assert consume_verification_code(db_session, user.id, code) is True
+        db_session.commit()
+        assert get_email_verification(db_session, user.id) is None
+        assert consume_verification_code(db_session, user.id, code) is False
+
+    def test_code_is_burned_after_too_many_wrong_guesses(self, db_session):
+        user = _user(db_session)
+        code = get_email_verification(db_session, user.id).code
+
+        for _ in range(settings.VERIFICATION_CODE_MAX_ATTEMPTS):
+            assert consume_verification_code(db_session, user.id, _wrong(code)) is False
+        db_session.commit()
+
+        assert consume_verification_code(db_session, user.id, code) is False
+        assert get_email_verification(db_session, user.id).failed_attempts > settings.VERIFICATION_CODE_MAX_ATTEMPTS
+
+    def test_expired_code_is_rejected(self, db_session):
+        user = _user(db_session)
+        pending = get_email_verification(db_session, user.id)
+        pending.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+        db_session.commit()
+
+        assert consume_verification_code(db_session, user.id, pending.code) is False
+
+    def test_purge_deletes_only_expired_rows(self, db_session):
+        expired = _user(db_session, "expired@example.com")
+        live = _user(db_session, "live@example.com")
+        get_email_verification(db_session, expired.id).expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+        db_session.commit()
+
+        assert purge_expired_email_verifications(db_session, batch_size=1) == 1
+        assert [row.user_id for row in db_session.query(EmailVerification)] == [live.id]
@@ -0,0 +1,69 @@
+"""
+Unit tests for the synthetic data generator's row builder.
+"""
+import random
+import time
+
+from app.defaults import DEFAULT_BLOCKLIST
+from benchmarks.generate_data import ACTIVITY_COLUMNS, USER_COLUMNS, _zipf_cum_weights, build_chunk
+
+PROBLEM_IDS = list(range(1, 201))
+
+
+def _build(seed=1, users=300, mean_activities=20.0):
+    return build_chunk(
+        random.Random(seed),
+        first_user_id=1000,
+        user_count=users,
+        problem_ids=PROBLEM_IDS,
+        problem_weights=_zipf_cum_weights(len(PROBLEM_IDS), 0.8),
+        mean_activities=mean_activities,
+        blocklist_mean=3,
+        password_hash="hash",
+        now=time.time(),
+    )
+
+
+class TestBuildChunk:
+    """Test generated rows respect the schema's unique constraints."""
+
+    def test_users_cover_the_requested_id_range(self):
+        users, _, _ = _build()
+
+        rows = [line.split("\t") for line in users]
+        assert [int(row[0]) for row in rows] == list(range(1000, 1300))
+        assert all(len(row) == len(USER_COLUMNS) for row in rows)
+
+    def test_blocklist_sites_are_unique_per_user(self):
+        _, blocklist, _ = _build()
+
+        pairs = [tuple(line.split("\t")[:2]) for line in blocklist]
+        assert len(pairs) == len(set(pairs))
+        assert {website for _, website in pairs} >= set(DEFAULT_BLOCKLIST)
+
+    def test_activities_are_unique_per_user_and_problem(self):
+        _, _, activities = _build(mean_activities=150)
+
+        rows = [line.split("\t") for line in activities]
+        pairs = [(row[0], row[1]) for row in rows]
+        assert len(pairs) == len(set(pairs))
+        assert all(len(row) == len(ACTIVITY_COLUMNS) for row in rows)
+        assert all(1 <= int(problem_id) <= 200 for _, problem_id in pairs)
+
+    def test_activity_counts_are_skewed(self):
+        """Test a minority of heavy users accounts for a large share of activity."""
+        _, _, activities = _build(users=1000)
+
+        per_user = {}
+        for line in activities:
+            user_id = line.split("\t", 1)[0]
+            per_user[user_id] = per_user.get(user_id, 0) + 1
+        counts = sorted(per_user.values(), reverse=True)
+        assert sum(counts[:len(counts) // 10]) > sum(counts) * 0.3
+
+    def test_same_seed_generates_the_same_rows(self):
+        now = time.time()
+        first = build_chunk(random.Random(7), 1, 50, PROBLEM_IDS, _zipf_cum_weights(200, 0.8), 10, 3, "hash", now)
+        second = build_chunk(random.Random(7), 1, 50, PROBLEM_IDS, _zipf_cum_weights(200, 0.8), 10, 3, "hash", now)
+
+        assert first == second
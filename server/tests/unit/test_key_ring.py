@@ -0,0 +1,136 @@
+"""
+Unit tests for the access token signing key ring.
+"""
+import json
+from unittest.mock import patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from app.utils.jwt import create_access_token, decode_access_token
+from app.utils.key_ring import build_key_ring, jwk_thumbprint, load_key
+
+
+def _write_key(path, private_key, public_only=False):
+    if public_only:
+        pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+    else:
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+    path.write_bytes(pem)
+    return str(path)
+
+
+@pytest.fixture
+def ed25519_path(tmp_path):
+    return _write_key(tmp_path / "ed25519.pem", ed25519.Ed25519PrivateKey.generate())
+
+
+@pytest.fixture
+def es256_path(tmp_path):
+    return _write_key(tmp_path / "es256.pem", ec.generate_private_key(ec.SECP256R1()))
+
+
+class TestKeyLoading:
+    """Test PEM loading, algorithms and key ids."""
+
+    def test_algorithms_follow_key_type(self, ed25519_path, es256_path):
+        assert load_key(ed25519_path).algorithm == "EdDSA"
+        assert load_key(es256_path).algorithm == "ES256"
+
+    def test_unsupported_curves_are_rejected(self, tmp_path):
+        path = _write_key(tmp_path / "p384.pem", ec.generate_private_key(ec.SECP384R1()))
+
+        with pytest.raises(ValueError):
+            load_key(path)
+
+    def test_kid_is_the_rfc7638_thumbprint(self):
+        # Example from RFC 8037 appendix A.3
+        jwk = {"crv": "Ed25519", "kty": "OKP", "x": "11qYAYKxCrfVS_7TyWQHOg7hcvPapiMlrwIaaPcHURo"}
+
+        assert jwk_thumbprint(jwk) == "kPrK_qmxVWaYVA9wwBF6Iuo3vVzz7TxHCTwXBygrS4k"
+
+    def test_public_keys_can_only_verify(self, tmp_path):
+        path = _write_key(tmp_path / "public.pem", ed25519.Ed25519PrivateKey.generate(), public_only=True)
+
+        assert load_key(path).private_key is None
+        with pytest.raises(ValueError):
+            build_key_ring(path, [], "secret")
+
+
+class TestKeyRing:
+    """Test signing, verification and JWKS publication."""
+
+    @pytest.mark.parametrize("key_fixture", ["ed25519_path", "es256_path"])
+    def test_tokens_carry_kid_and_verify(self, request, key_fixture):
+        ring = build_key_ring(request.getfixturevalue(key_fixture), [], "secret")
+
+        token = ring.sign({"sub": "1"})
+
+        header = jwt.get_unverified_header(token)
+        assert header["kid"] == ring.active.kid
+        key, algorithm = ring.verification_key(token)
+        assert jwt.decode(token, key, algorithms=[algorithm])["sub"] == "1"
+
+    def test_rotated_out_keys_still_verify(self, ed25519_path, es256_path):
+        old_ring = build_key_ring(ed25519_path, [], "secret")
+        new_ring = build_key_ring(es256_path, [ed25519_path], "secret")
+
+        token = old_ring.sign({"sub": "1"})
+
+        key, algorithm = new_ring.verification_key(token)
+        assert algorithm == "EdDSA"
+        assert jwt.decode(token, key, algorithms=[algorithm])["sub"] == "1"
+
+    def test_unknown_kid_is_rejected(self, ed25519_path, es256_path):
+        token = build_key_ring(ed25519_path, [], "secret").sign({"sub": "1"})
+
+        with pytest.raises(jwt.InvalidTokenError):
+            build_key_ring(es256_path, [], "secret").verification_key(token)
+
+    def test_legacy_hs256_tokens_can_be_refused(self, ed25519_path):
+        token = build_key_ring(None, [], "secret").sign({"sub": "1"})
+
+        assert build_key_ring(ed25519_path, [], "secret").verification_key(token) == ("secret", "HS256")
+        with pytest.raises(jwt.InvalidTokenError):
+            build_key_ring(ed25519_path, [], "secret", accept_hs256=False).verification_key(token)
+
+    def test_jwks_publishes_public_members_only(self, ed25519_path, es256_path):
+        ring = build_key_ring(es256_path, [ed25519_path], "secret")
+
+        keys = json.loads(ring.jwks_json)["keys"]
+
+        assert {key["alg"] for key in keys} == {"ES256", "EdDSA"}
+        assert all("d" not in key and key["use"] == "sig" for key in keys)
+        assert ring.active.kid in {key["kid"] for key in keys}
+
+    def test_hs256_ring_publishes_no_keys(self):
+        assert json.loads(build_key_ring(None, [], "secret").jwks_json) == {"keys": []}
+
+
+class TestAccessTokensWithKeyRing:
+    """Test the access token helpers sign and verify through the ring."""
+
+    def test_asymmetric_access_token_round_trip(self, ed25519_path):
+        ring = build_key_ring(ed25519_path, [], "secret")
+
+        with patch("app.utils.jwt.get_key_ring", return_value=ring):
+            token = create_access_token({"sub": "7"})
+            payload = decode_access_token(token)
+
+        assert jwt.get_unverified_header(token)["alg"] == "EdDSA"
+        assert payload["sub"] == "7"
+
+    def test_token_signed_by_foreign_key_is_invalid(self, ed25519_path, tmp_path):
+        foreign_path = _write_key(tmp_path / "foreign.pem", ed25519.Ed25519PrivateKey.generate())
+        foreign = build_key_ring(foreign_path, [], "secret")
+
+        with patch("app.utils.jwt.get_key_ring", return_value=foreign):
+            token = create_access_token({"sub": "7"})
+        with patch("app.utils.jwt.get_key_ring", return_value=build_key_ring(ed25519_path, [], "secret")):
+            assert decode_access_token(token) is None
@@ -0,0 +1,70 @@
+"""
+Unit tests for memoized URL and domain normalization.
+"""
+import pytest
+
+from app.utils.normalization import (
+    _parse_problem_url,
+    clear_normalization_caches,
+    normalization_cache_stats,
+    normalize_problem_url,
+    normalize_website,
+    problem_slug,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    clear_normalization_caches()
+    yield
+    clear_normalization_caches()
+
+
+class TestProblemUrlFastPath:
+    """Test the regex fast path agrees with the general urlparse path."""
+
+    @pytest.mark.parametrize("problem_url", [
+        "https://leetcode.com/problems/two-sum/",
+        "leetcode.com/problems/two-sum",
+        "  HTTPS://www.LeetCode.com/problems/two-sum/description/?envType=daily  ",
+        "http://leetcode.com/problems/two-sum#editorial",
+        "https://leetcode.com:443/problems/two-sum/",
+        "https://eu.leetcode.com/problems/two-sum/",
+        "https://leetcode.com/problems/two%20sum/",
+        "https://www.hackerrank.com/challenges/two-sum/problem",
+        "https://leetcode.com/Problems/two-sum/",
+    ])
+    def test_matches_general_path(self, problem_url):
+        assert normalize_problem_url(problem_url) == _parse_problem_url(problem_url.strip())
+
+    def test_slug_case_is_preserved(self):
+        assert normalize_problem_url("leetcode.com/problems/Two-Sum") == "https://leetcode.com/problems/Two-Sum/"
+
+    def test_non_problem_leetcode_urls_use_the_general_path(self):
+        assert normalize_problem_url("https://leetcode.com/contest/weekly-1/") == "https://leetcode.com/contest/weekly-1/"
+
+
+class TestNormalizationCache:
+    """Test memoization and its hit-rate stats."""
+
+    def test_repeat_inputs_hit_the_cache(self):
+        for _ in range(3):
+            normalize_website("https://www.YouTube.com/watch")
+            problem_slug("https://leetcode.com/problems/two-sum/")
+
+        stats = normalization_cache_stats()
+        assert stats["normalize_website"]["misses"] == 1
+        assert stats["normalize_website"]["hits"] == 2
+        assert stats["problem_slug"]["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+
+    def test_invalid_input_still_raises_every_time(self):
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                normalize_website("   ")
+
+        assert normalization_cache_stats()["normalize_website"]["size"] == 0
+
+    def test_stats_without_lookups_report_zero_hit_rate(self):
+        assert normalization_cache_stats()["normalize_problem_url"] == {
+            "hits": 0, "misses": 0, "size": 0, "max_size": 4096, "hit_rate": 0.0,
+        }
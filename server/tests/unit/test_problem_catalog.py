@@ -0,0 +1,95 @@
+"""
+Unit tests for the shared problem catalog.
+"""
+from app.auth.models.user import Activity, Problem
+from app.auth.schemas.data import ActivityCreate
+from app.auth.schemas.user import UserCreate
+from app.crud.data import create_activity
+from app.crud.problems import _cache_get, get_or_create_problem
+from app.crud.user import create_user
+from app.utils.normalization import problem_slug
+
+
+class TestProblemSlug:
+    """Test catalog keys derived from problem URLs."""
+
+    def test_leetcode_urls_use_the_slug(self):
+        assert problem_slug("https://leetcode.com/problems/two-sum/description/") == "two-sum"
+        assert problem_slug("leetcode.com/problems/two-sum") == "two-sum"
+
+    def test_other_sites_use_the_canonical_url(self):
+        assert problem_slug("https://Example.com/kata/1?x=1") == "https://example.com/kata/1"
+
+class TestProblemCatalog:
+    """Test lazy catalog upserts and the in-process cache."""
+
+    def test_activities_share_one_catalog_row(self, db_session):
+        """Test two users solving the same problem reference one problems row."""
+        payload = ActivityCreate(
+            problem_name="Two Sum",
+            problem_url="https://leetcode.com/problems/two-sum/",
+            difficulty="Easy",
+            topic_tags=["Array"],
+            status="solved",
+        )
+        for email in ("first@example.com", "second@example.com"):
+            user = create_user(db_session, UserCreate(email=email, password="password123"))
+            create_activity(db_session, user.id, payload)
+
+        assert db_session.query(Problem).count() == 1
+        problem_ids = {activity.problem_id for activity in db_session.query(Activity).all()}
+        assert len(problem_ids) == 1
+        activity = db_session.query(Activity).first()
+        assert activity.problem_name == "Two Sum"
+        assert activity.topic_tags == ["Array"]
+
+    def test_unknown_metadata_does_not_overwrite_known_values(self, db_session):
+        """Test blank scrapes keep the catalog's existing metadata."""
+        # Not in the offline snapshot, so nothing is enriched
+        url = "https://leetcode.com/problems/custom-two-sum/"
+        problem_id = get_or_create_problem(db_session, url, "Two Sum", "Easy", ["Array"])
+        db_session.commit()
+
+        same_id = get_or_create_problem(db_session, url, "", "Unknown", [])
+        db_session.commit()
+
+        problem = db_session.get(Problem, problem_id)
+        assert same_id == problem_id
+        assert (problem.name, problem.difficulty, problem.topic_tags) == ("Two Sum", "Easy", ["Array"])
+
+    def test_known_metadata_is_never_replaced(self, db_session):
+        """Test another submission can't rewrite a shared row's known metadata."""
+        url = "https://leetcode.com/problems/custom-two-sum/"
+        problem_id = get_or_create_problem(db_session, url, "Two Sum", "Easy", ["Array"])
+        db_session.commit()
+
+        get_or_create_problem(db_session, url, "PWNED", "Hard", ["spam"])
+        db_session.commit()
+
+        problem = db_session.get(Problem, problem_id)
+        assert (problem.name, problem.difficulty, problem.topic_tags) == ("Two Sum", "Easy", ["Array"])
+
+    def test_missing_metadata_is_filled_once(self, db_session):
+        """Test a row created without metadata takes the first values submitted for it."""
+        url = "https://leetcode.com/problems/custom-two-sum/"
+        problem_id = get_or_create_problem(db_session, url)
+        db_session.commit()
+
+        get_or_create_problem(db_session, url, "Two Sum", "Easy", ["Array"])
+        db_session.commit()
+        get_or_create_problem(db_session, url, "Other", "Hard", ["Graph"])
+        db_session.commit()
+
+        problem = db_session.get(Problem, problem_id)
+        assert (problem.name, problem.difficulty, problem.topic_tags) == ("Two Sum", "Easy", ["Array"])
+
+    def test_cache_is_only_published_on_commit(self, db_session):
+        """Test a rolled-back insert never leaves a dangling cached id."""
+        get_or_create_problem(db_session, "https://leetcode.com/problems/two-sum/", "Two Sum", "Easy")
+        db_session.rollback()
+        assert _cache_get("two-sum") is None
+
+        problem_id = get_or_create_problem(db_session, "https://leetcode.com/problems/two-sum/", "Two Sum", "Easy")
+        assert _cache_get("two-sum") is None
+        db_session.commit()
+        assert _cache_get("two-sum").id == problem_id
@@ -0,0 +1,99 @@
+"""
+Unit tests for the offline problem metadata snapshot.
+"""
+import os
+
+from app.auth.models.user import Problem
+from app.auth.schemas.data import ActivityCreate
+from app.auth.schemas.user import UserCreate
+from app.crud.data import create_activity
+from app.crud.user import create_user
+from app.jobs.refresh_problem_metadata import update_catalog
+from app.config import settings
+from app.utils import problem_metadata
+from app.utils.problem_metadata import enrich_problem_fields, get_problem_metadata, read_snapshot, write_snapshot
+
+
+class TestSnapshotFiles:
+    """Test snapshot parsing and serialization."""
+
+    def test_csv_and_json_round_trip(self, tmp_path):
+        csv_path = tmp_path / "problems.csv"
+        csv_path.write_text(
+            "slug,name,difficulty,topic_tags\n"
+            "two-sum,Two Sum,easy,Array|Hash Table\n"
+            ",Missing Slug,Easy,\n"
+        )
+
+        records = read_snapshot(str(csv_path))
+        json_path = tmp_path / "problems.json"
+        write_snapshot(str(json_path), records)
+
+        assert records == [{
+            "slug": "two-sum",
+            "name": "Two Sum",
+            "difficulty": "Easy",
+            "topic_tags": ["Array", "Hash Table"],
+        }]
+        assert read_snapshot(str(json_path)) == records
+
+    def test_rewritten_snapshot_is_picked_up_without_restart(self, tmp_path, monkeypatch):
+        path = tmp_path / "problems.json"
+        write_snapshot(str(path), [{"slug": "two-sum", "name": "Two Sum", "difficulty": "Easy"}])
+        monkeypatch.setattr(settings, "PROBLEM_METADATA_PATH", str(path))
+        monkeypatch.setattr(problem_metadata, "_index", None)
+        monkeypatch.setattr(problem_metadata, "RELOAD_CHECK_SECONDS", 0)
+        assert get_problem_metadata("jump-game") is None
+
+        write_snapshot(str(path), [{"slug": "jump-game", "name": "Jump Game", "difficulty": "Medium"}])
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+
+        assert get_problem_metadata("jump-game")["name"] == "Jump Game"
+        assert get_problem_metadata("two-sum") is None
+        assert [entry.name for entry in tmp_path.iterdir()] == ["problems.json"]
+
+class TestEnrichment:
+    """Test enrichment from the bundled snapshot."""
+
+    def test_blank_fields_are_filled_and_scraped_fields_win(self):
+        assert enrich_problem_fields("two-sum", "", "Unknown", []) == (
+            "Two Sum", "Easy", ["Array", "Hash Table"]
+        )
+        assert enrich_problem_fields("two-sum", "2 Sum", "Hard", ["Custom"]) == ("2 Sum", "Hard", ["Custom"])
+        assert enrich_problem_fields("not-in-snapshot", "", "Unknown", []) == ("", "Unknown", [])
+
+    def test_create_activity_enriches_unknown_metadata(self, db_session):
+        user = create_user(db_session, UserCreate(email="test@example.com", password="password123"))
+        activity = create_activity(db_session, user.id, ActivityCreate(
+            problem_name="Climbing Stairs",
+            problem_url="https://leetcode.com/problems/climbing-stairs/",
+            difficulty="Unknown",
+            topic_tags=[],
+            status="solved",
+        ))
+
+        assert activity.difficulty == "Easy"
+        assert activity.topic_tags == ["Math", "Dynamic Programming", "Memoization"]
+
+    def test_update_catalog_backfills_only_missing_metadata(self, db_session):
+        db_session.add_all([
+            Problem(slug="two-sum", url="https://leetcode.com/problems/two-sum/", name="Two Sum", difficulty="Unknown"),
+            Problem(slug="3sum", url="https://leetcode.com/problems/3sum/", name="3Sum", difficulty="Hard", topic_tags=["Mine"]),
+            Problem(slug="jump-game", url="https://leetcode.com/problems/jump-game/", name="jump-game", difficulty="Medium", topic_tags=["Greedy"]),
+        ])
+        db_session.commit()
+
+        updated = update_catalog([
+            {"slug": "two-sum", "difficulty": "Easy", "topic_tags": ["Array"]},
+            {"slug": "3sum", "name": "Three Sum", "difficulty": "Medium", "topic_tags": ["Array"]},
+            {"slug": "jump-game", "name": "Jump Game", "difficulty": "Medium", "topic_tags": ["Array"]},
+        ])
+        db_session.expire_all()
+
+        assert updated == 2
+        two_sum = db_session.query(Problem).filter(Problem.slug == "two-sum").one()
+        three_sum = db_session.query(Problem).filter(Problem.slug == "3sum").one()
+        assert (two_sum.difficulty, two_sum.topic_tags) == ("Easy", ["Array"])
+        assert (three_sum.name, three_sum.difficulty, three_sum.topic_tags) == ("3Sum", "Hard", ["Mine"])
+        jump_game = db_session.query(Problem).filter(Problem.slug == "jump-game").one()
+        assert (jump_game.name, jump_game.topic_tags) == ("Jump Game", ["Greedy"])
@@ -0,0 +1,133 @@
+"""
+Unit tests for the auth endpoint rate limiter.
+"""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.auth.models.user import RateLimitBucket
+from app.utils.rate_limit import MemoryBackend, PostgresBackend, Rate, RateLimiter, parse_rate
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseRate:
+    """Test "<requests>/<seconds>" settings."""
+
+    def test_parses_requests_and_seconds(self):
+        rate = parse_rate("10/60")
+        assert rate == Rate(10, 60.0)
+        assert rate.refill_per_second == pytest.approx(10 / 60)
+
+    def test_empty_means_unlimited(self):
+        assert parse_rate("") is None
+        assert parse_rate(None) is None
+
+    @pytest.mark.parametrize("value", ["10", "ten/60", "0/60", "10/0", "1/2/3"])
+    def test_rejects_malformed_values(self, value):
+        with pytest.raises(ValueError):
+            parse_rate(value)
+
+
+class TestMemoryBackend:
+    """Test the in-process token bucket."""
+
+    def test_allows_a_burst_then_waits_for_refill(self):
+        clock = FakeClock()
+        backend = MemoryBackend(clock=clock)
+        rate = Rate(3, 30)
+
+        assert [backend.hit("k", rate) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert backend.hit("k", rate) == pytest.approx(10.0)
+
+        clock.now += 10
+        assert backend.hit("k", rate) == 0.0
+        assert backend.hit("k", rate) == pytest.approx(10.0)
+
+    def test_refill_is_capped_at_the_limit(self):
+        clock = FakeClock()
+        backend = MemoryBackend(clock=clock)
+        rate = Rate(2, 10)
+        backend.hit("k", rate)
+
+        clock.now += 3600
+        assert [backend.hit("k", rate) for _ in range(3)][-1] > 0
+
+    def test_keys_are_independent_and_bounded(self):
+        backend = MemoryBackend(max_buckets=2, clock=FakeClock())
+        rate = Rate(1, 60)
+        backend.hit("a", rate)
+        backend.hit("b", rate)
+        backend.hit("c", rate)
+
+        # "a" was least recently used and was dropped, so it is full again
+        assert backend.hit("a", rate) == 0.0
+        assert backend.hit("c", rate) > 0
+
+
+class TestPostgresBackend:
+    """Test the shared bucket table."""
+
+    def test_allows_a_burst_then_rejects(self, db_session, test_engine):
+        backend = PostgresBackend(test_engine)
+        rate = Rate(2, 60)
+
+        assert backend.hit("login:ip:1.2.3.4", rate) == 0.0
+        assert backend.hit("login:ip:1.2.3.4", rate) == 0.0
+        assert backend.hit("login:ip:1.2.3.4", rate) == pytest.approx(30.0, abs=1)
+        assert backend.hit("login:ip:5.6.7.8", rate) == 0.0
+
+    def test_buckets_refill_from_elapsed_time(self, db_session, test_engine):
+        backend = PostgresBackend(test_engine)
+        rate = Rate(1, 60)
+        backend.hit("k", rate)
+        assert backend.hit("k", rate) > 0
+
+        db_session.execute(
+            update(RateLimitBucket).values(updated_at=RateLimitBucket.updated_at - timedelta(seconds=rate.period))
+        )
+        db_session.commit()
+        assert backend.hit("k", rate) == 0.0
+
+    def test_purge_drops_idle_buckets(self, db_session, test_engine):
+        backend = PostgresBackend(test_engine)
+        backend.hit("old", Rate(1, 60))
+        backend.hit("new", Rate(1, 60))
+        db_session.execute(
+            update(RateLimitBucket)
+            .where(RateLimitBucket.key == "old")
+            .values(updated_at=RateLimitBucket.updated_at - timedelta(minutes=2))
+        )
+        db_session.commit()
+
+        assert backend.purge_idle(60) == 1
+        assert [row.key for row in db_session.query(RateLimitBucket)] == ["new"]
+
+
+class TestRateLimiter:
+    """Test IP and email buckets per scope."""
+
+    def test_email_bucket_is_shared_across_ips(self):
+        limiter = RateLimiter(MemoryBackend(clock=FakeClock()), {"verify": (Rate(100, 60), Rate(2, 60))})
+
+        assert limiter.check("verify", "10.0.0.1", "Victim@Example.com") == 0.0
+        assert limiter.check("verify", "10.0.0.2", "victim@example.com") == 0.0
+        assert limiter.check("verify", "10.0.0.3", "victim@example.com") > 0
+        assert limiter.check("verify", "10.0.0.3", "other@example.com") == 0.0
+
+    def test_ip_bucket_is_shared_across_emails(self):
+        limiter = RateLimiter(MemoryBackend(clock=FakeClock()), {"signup": (Rate(1, 60), None)})
+
+        assert limiter.check("signup", "10.0.0.1", "a@example.com") == 0.0
+        assert limiter.check("signup", "10.0.0.1", "b@example.com") > 0
+
+    def test_unconfigured_scopes_are_unlimited(self):
+        limiter = RateLimiter(None, {})
+        assert all(limiter.check("login", "10.0.0.1", "a@example.com") == 0.0 for _ in range(100))
@@ -0,0 +1,73 @@
+"""
+Unit tests for the column-projected read helpers.
+"""
+from app.auth.models.user import Activity
+from app.auth.schemas.data import ActivityCreate
+from app.auth.schemas.user import UserCreate
+from app.crud.data import (
+    check_website_blocked,
+    create_activity,
+    create_blocklist_item,
+    get_activity_row,
+    get_user_activity_rows,
+    get_user_blocklist_websites,
+)
+from app.crud.user import create_user
+
+
+def _user_with_activities(db_session):
+    user_id = create_user(db_session, UserCreate(email="reader@example.com", password="password123")).id
+    for slug, tags in (("custom-graph", ["Graph"]), ("custom-array", ["Array"])):
+        create_activity(db_session, user_id, ActivityCreate(
+            problem_name=slug.replace("-", " ").title(),
+            problem_url=f"https://leetcode.com/problems/{slug}/",
+            difficulty="Medium",
+            topic_tags=tags,
+            status="solved",
+        ))
+    db_session.expunge_all()
+    return user_id
+
+
+class TestActivityRows:
+    """Test activity projections against the ORM reads they replace."""
+
+    def test_rows_match_orm_entities_without_hydrating(self, db_session):
+        user_id = _user_with_activities(db_session)
+
+        rows = get_user_activity_rows(db_session, user_id)
+
+        assert len(db_session.identity_map) == 0
+        entities = db_session.query(Activity).filter(Activity.user_id == user_id).order_by(Activity.completed_at.desc())
+        assert [
+            (row.id, row.problem_name, row.problem_url, row.difficulty, row.topic_tags, row.status, row.completed_at)
+            for row in rows
+        ] == [
+            (a.id, a.problem_name, a.problem_url, a.difficulty, a.topic_tags, a.status, a.completed_at)
+            for a in entities
+        ]
+
+    def test_tag_filter_and_single_row_lookup(self, db_session):
+        user_id = _user_with_activities(db_session)
+
+        rows = get_user_activity_rows(db_session, user_id, tag="Graph")
+
+        assert [row.problem_name for row in rows] == ["Custom Graph"]
+        assert get_activity_row(db_session, rows[0].id, user_id).topic_tags == ["Graph"]
+        assert get_activity_row(db_session, rows[0].id, user_id + 1) is None
+
+
+class TestBlocklistProjection:
+    """Test blocklist reads that only need website names."""
+
+    def test_websites_and_existence_check(self, db_session):
+        user_id = create_user(db_session, UserCreate(email="blocker@example.com", password="password123")).id
+        create_blocklist_item(db_session, user_id, "https://www.Example-Games.com/play")
+        create_blocklist_item(db_session, user_id, "news.example.org")
+        db_session.expunge_all()
+
+        # create_user seeds the default blocklist first
+        assert get_user_blocklist_websites(db_session, user_id)[-2:] == ["example-games.com", "news.example.org"]
+        assert check_website_blocked(db_session, user_id, "example-games.com") is True
+        assert check_website_blocked(db_session, user_id, "example.net") is False
+        assert len(db_session.identity_map) == 0
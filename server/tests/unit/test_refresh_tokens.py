@@ -0,0 +1,108 @@
+"""
+Unit tests for the refresh token rotation store.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.auth.models.user import RefreshToken
+from app.auth.schemas.user import UserCreate
+from app.crud.refresh_tokens import (
+    issue_refresh_token,
+    purge_expired_refresh_tokens,
+    revoke_user_refresh_tokens,
+    rotate_refresh_token,
+)
+from app.crud.user import create_user
+from app.utils.jwt import create_refresh_token, decode_refresh_token
+
+
+def _user(db_session, email="rotation@example.com"):
+    return create_user(db_session, UserCreate(email=email, password="password123"))
+
+
+class TestRefreshTokenRotation:
+    """Test rotation, reuse detection and legacy token adoption."""
+
+    def test_issue_records_the_token(self, db_session):
+        user = _user(db_session)
+
+        payload = decode_refresh_token(issue_refresh_token(db_session, user.id))
+
+        row = db_session.get(RefreshToken, uuid.UUID(payload["jti"]))
+        assert row.user_id == user.id
+        assert str(row.family_id) == payload["fam"]
+        assert row.replaced_at is None
+
+    def test_rotation_keeps_the_family(self, db_session):
+        user = _user(db_session)
+        first = decode_refresh_token(issue_refresh_token(db_session, user.id))
+
+        second = decode_refresh_token(rotate_refresh_token(db_session, first))
+
+        assert second["fam"] == first["fam"]
+        assert second["jti"] != first["jti"]
+        assert db_session.get(RefreshToken, uuid.UUID(first["jti"])).replaced_at is not None
+
+    def test_reuse_deletes_the_family(self, db_session):
+        user = _user(db_session)
+        first = decode_refresh_token(issue_refresh_token(db_session, user.id))
+        second = decode_refresh_token(rotate_refresh_token(db_session, first))
+        other_login = decode_refresh_token(issue_refresh_token(db_session, user.id))
+
+        assert rotate_refresh_token(db_session, first) is None
+
+        assert rotate_refresh_token(db_session, second) is None
+        families = {str(row.family_id) for row in db_session.query(RefreshToken).all()}
+        assert families == {other_login["fam"]}
+
+    def test_other_users_jti_is_rejected(self, db_session):
+        owner = _user(db_session)
+        attacker = _user(db_session, "attacker@example.com")
+        payload = decode_refresh_token(issue_refresh_token(db_session, owner.id))
+
+        assert rotate_refresh_token(db_session, {**payload, "sub": str(attacker.id)}) is None
+
+    def test_legacy_tokens_can_be_exchanged_once(self, db_session):
+        user = _user(db_session)
+        legacy = decode_refresh_token(create_refresh_token(data={"sub": str(user.id)}))
+
+        assert rotate_refresh_token(db_session, legacy) is not None
+        assert rotate_refresh_token(db_session, legacy) is None
+
+    def test_legacy_token_replay_revokes_its_successor(self, db_session):
+        user = _user(db_session)
+        legacy = decode_refresh_token(create_refresh_token(data={"sub": str(user.id)}))
+        assert "fam" not in legacy
+        successor = decode_refresh_token(rotate_refresh_token(db_session, legacy))
+
+        assert rotate_refresh_token(db_session, legacy) is None
+
+        assert rotate_refresh_token(db_session, successor) is None
+        assert db_session.query(RefreshToken).filter(RefreshToken.family_id == uuid.UUID(successor["fam"])).count() == 0
+
+    def test_revoke_user_tokens(self, db_session):
+        user = _user(db_session)
+        payload = decode_refresh_token(issue_refresh_token(db_session, user.id))
+
+        revoke_user_refresh_tokens(db_session, user.id)
+
+        assert db_session.query(RefreshToken).count() == 0
+        assert rotate_refresh_token(db_session, payload) is None
+
+
+class TestRefreshTokenPurge:
+    """Test expired rows are purged in batches."""
+
+    def test_only_expired_rows_are_deleted(self, db_session):
+        user = _user(db_session)
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            RefreshToken(jti=uuid.uuid4(), family_id=uuid.uuid4(), user_id=user.id, expires_at=now - timedelta(days=1))
+            for _ in range(5)
+        ])
+        db_session.commit()
+        live = decode_refresh_token(issue_refresh_token(db_session, user.id))
+
+        assert purge_expired_refresh_tokens(db_session, batch_size=2) == 5
+
+        assert [str(row.jti) for row in db_session.query(RefreshToken).all()] == [live["jti"]]
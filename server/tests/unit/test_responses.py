@@ -0,0 +1,53 @@
+"""
+Unit tests for the JSON response helpers.
+"""
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.auth.schemas.data import ActivitiesResponse, ActivityResponse
+from app.utils.responses import ORJSONResponse, model_response
+
+
+def _activity(**overrides):
+    fields = {
+        "id": 1,
+        "problem_name": "Two Sum",
+        "problem_url": "https://leetcode.com/problems/two-sum/",
+        "difficulty": "Easy",
+        "topic_tags": ["Array"],
+        "status": "solved",
+        "completed_at": datetime(2026, 3, 1, 12, tzinfo=timezone.utc),
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+class TestModelResponse:
+    """Test the single-pass serialization fast path."""
+
+    def test_matches_pydantic_serialization(self):
+        activities = [_activity(), _activity(id=2, topic_tags=None)]
+
+        response = model_response(ActivitiesResponse, {"activities": activities})
+
+        expected = ActivitiesResponse(
+            activities=[ActivityResponse.model_validate(a, from_attributes=True) for a in activities]
+        )
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == json.loads(expected.model_dump_json())
+
+    def test_extra_attributes_are_not_serialized(self):
+        response = model_response(ActivityResponse, _activity(user_id=42), status_code=201)
+
+        assert response.status_code == 201
+        assert "user_id" not in json.loads(response.body)
+
+
+class TestORJSONResponse:
+    """Test the default response class."""
+
+    def test_renders_compact_json(self):
+        response = ORJSONResponse({"websites": ["youtube.com"], 1: "non-str key"})
+
+        assert response.body == b'{"websites":["youtube.com"],"1":"non-str key"}'
@@ -0,0 +1,99 @@
+"""
+Unit tests for the slow statement log.
+"""
+import pytest
+
+from app.auth.models.user import User
+from app.auth.schemas.user import UserCreate
+from app.config import settings
+from app.crud.data import get_user_blocklist_websites
+from app.crud.user import create_user
+from app.db import slow_queries
+from app.db.slow_queries import (
+    SlowQueryRecord,
+    bind_shape,
+    configure_slow_query_log,
+    is_explainable,
+    normalize_sql,
+    slow_query_report,
+)
+
+
+@pytest.fixture
+def capture_everything():
+    configure_slow_query_log(0, explain=True)
+    slow_queries.reset_slow_query_log()
+    yield
+    configure_slow_query_log(settings.SLOW_QUERY_THRESHOLD_MS, settings.SLOW_QUERY_EXPLAIN)
+    slow_queries.reset_slow_query_log()
+
+
+def _wait_for_plans():
+    # The executor has one worker, so this runs after every queued EXPLAIN
+    slow_queries._explain_executor.submit(lambda: None).result(timeout=10)
+
+
+class TestNormalization:
+    """Test statement grouping keys and parameter shapes."""
+
+    def test_literals_and_placeholders_collapse(self):
+        sql = normalize_sql(
+            "SELECT * FROM problems\n  WHERE slug = 'two-sum' AND id IN (%(id_1)s, %(id_2)s) LIMIT 10"
+        )
+
+        assert sql == "SELECT * FROM problems WHERE slug = ? AND id IN (...) LIMIT ?"
+
+    def test_bind_shape_hides_values(self):
+        assert bind_shape({"user_id": 7, "website": "secret.example"}) == {"user_id": "int", "website": "str"}
+        assert bind_shape([{"a": 1}, {"a": 2}], executemany=True) == {"rows": 2, "each": {"a": "int"}}
+
+    def test_only_plain_selects_are_explainable(self):
+        assert is_explainable("SELECT id FROM users WHERE id = %(id)s")
+        assert not is_explainable("UPDATE users SET is_verified = true")
+        for clause in ("FOR UPDATE", "FOR NO KEY UPDATE", "FOR SHARE", "for key share", "FOR UPDATE SKIP LOCKED"):
+            assert not is_explainable(f"SELECT id FROM users WHERE id = 1 {clause}")
+
+
+class TestSlowQueryLog:
+    """Test capture, attribution and the top-N report."""
+
+    def test_records_caller_and_explain_plan(self, db_session, capture_everything):
+        user_id = create_user(db_session, UserCreate(email="slow@example.com", password="password123")).id
+        slow_queries.reset_slow_query_log()
+
+        get_user_blocklist_websites(db_session, user_id)
+        get_user_blocklist_websites(db_session, user_id)
+        _wait_for_plans()
+
+        report = slow_query_report()
+        entry = next(row for row in report if "FROM blocklist_items" in row["sql"])
+        assert entry["calls"] == 2
+        assert entry["caller"] == "app.crud.data.get_user_blocklist_websites"
+        assert entry["bind_shape"] == {"user_id_1": "int"}
+        assert "actual time" in entry["plan"]
+
+    def test_writes_are_not_explained(self, db_session, capture_everything):
+        create_user(db_session, UserCreate(email="writer@example.com", password="password123"))
+        _wait_for_plans()
+
+        inserts = [row for row in slow_query_report(200) if row["sql"].startswith("INSERT INTO users")]
+        assert inserts and inserts[0]["plan"] is None
+        assert inserts[0]["caller"] == "app.crud.user.create_user"
+
+    def test_locking_reads_are_not_explained(self, db_session, capture_everything):
+        create_user(db_session, UserCreate(email="locker@example.com", password="password123"))
+        slow_queries.reset_slow_query_log()
+
+        db_session.query(User).filter(User.email == "locker@example.com").with_for_update().one()
+        _wait_for_plans()
+
+        locking = [row for row in slow_query_report(200) if "FOR UPDATE" in row["sql"]]
+        assert locking and locking[0]["plan"] is None
+
+    def test_plan_capture_runs_read_only(self, db_session):
+        record = SlowQueryRecord("SELECT nextval(?)", "test", None)
+
+        slow_queries._capture_plan(db_session.get_bind(), "SELECT nextval('users_id_seq')", None, record)
+
+        assert record.plan.startswith("EXPLAIN failed")
+        assert "read-only transaction" in record.plan